@@ -1,19 +1,58 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple, Union
 import time
 import copy
-import subprocess
+import contextlib
+import threading
+import json
 import os
 
 # Update imports to use non-deprecated packages
 from langchain_ollama import OllamaLLM
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.prompt_values import ChatPromptValue, StringPromptValue
 
 from memory import AgentMemory
+from model_registry import ensure_models_available
+from response_cache import ResponseCache
+from tracing import NULL_TRACER
 from config import (
     DEFAULT_MODEL, MODEL_TEMPERATURE, MAX_TOKENS, JUDGING_CRITERIA, 
-    EVALUATION_TEMPLATE, DEFAULT_RESPONSE_STYLE, RESPONSE_STYLES
+    EVALUATION_TEMPLATE, DEFAULT_RESPONSE_STYLE, RESPONSE_STYLES,
+    DEFAULT_PROMPT_LAYOUT, STABLE_HISTORY_TURNS, OLLAMA_KEEP_ALIVE, OLLAMA_BASE_URL,
+    MEMORY_SUMMARY_TOKEN_LIMIT, DEFAULT_JUDGE_OUTPUT, JUDGE_JSON_TOKEN_LIMIT,
+    JUDGE_COMMENT_MAX_CHARS, JUDGE_JSON_RETRIES
 )
 
+# Optional semaphore limiting concurrent LLM requests across every agent
+# (and, when shared through multiprocessing, across processes)
+_llm_request_slots = None
+
+def set_llm_request_limit(semaphore) -> None:
+    """
+    Caps concurrent LLM requests made by agents in this process
+    
+    Args:
+        semaphore: Semaphore-like object (threading or multiprocessing), or None to remove the cap
+    """
+    global _llm_request_slots
+    _llm_request_slots = semaphore
+
+def _seconds(nanoseconds: Any) -> Optional[float]:
+    """Converts one of Ollama's nanosecond durations to seconds"""
+    return round(nanoseconds / 1e9, 4) if isinstance(nanoseconds, (int, float)) else None
+
+class _TokenStreamHandler(BaseCallbackHandler):
+    """Forwards streamed tokens to a callback and notes when the first one arrived"""
+    def __init__(self, on_token: Callable[[str], None]):
+        self.on_token = on_token
+        self.first_token_at = None
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.on_token(token)
+
 class Agent:
     """
     Represents a debate agent with memory and language model integration
@@ -24,7 +63,11 @@ class Agent:
                  model: str = DEFAULT_MODEL, 
                  position: str = "X", 
                  topic: str = "",
-                 response_style: str = None):
+                 response_style: str = None,
+                 prompt_layout: str = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 base_url: Optional[str] = None,
+                 judge_output: str = None):
         self.name = name
         self.role_description = role_description
         self.model = model  # This will be like "llama3:latest"
@@ -32,38 +75,95 @@ class Agent:
         self.topic = topic
         self.memory = AgentMemory()
         self.response_style = response_style or DEFAULT_RESPONSE_STYLE
+        self.prompt_layout = prompt_layout or DEFAULT_PROMPT_LAYOUT
+        # "text" scrapes free-form evaluations; "json" uses schema-constrained output
+        self.judge_output = judge_output or DEFAULT_JUDGE_OUTPUT
+        # First transcript turn included in "stable" layout prompts
+        self._history_start = 0
+        # (topic, judge output, text) of the cached judging rubric
+        self._rubric_cache = None
+        # Optional on-disk cache of LLM responses shared between agents
+        self.response_cache = response_cache
+        # Timing and backend-reported stats of the most recent generation (see _generate)
+        self.last_response_timing = {}
+        self.last_generation_info = {}
+        # Metrics of every LLM call not yet collected by the debate manager
+        self.call_metrics: List[Dict[str, Any]] = []
+        self._call_metrics_lock = threading.Lock()
+        self.base_url = base_url or OLLAMA_BASE_URL
+        # Tracer receiving prompt build, LLM call and parse spans (set by DebateManager)
+        self.tracer = NULL_TRACER
         
         # Check if model exists, pull if it doesn't
         self._ensure_model_available()
         
         # Use updated OllamaLLM class with the exact model name
-        self.llm = OllamaLLM(model=self.model, temperature=MODEL_TEMPERATURE)
+        # keep_alive keeps the model and its prompt cache loaded between turns
+        self.llm = OllamaLLM(
+            model=self.model,
+            temperature=MODEL_TEMPERATURE,
+            keep_alive=OLLAMA_KEEP_ALIVE,
+            base_url=self.base_url
+        )
+
+    def get_state(self) -> Dict[str, Any]:
+        """Returns the agent's conversation state (memory and prompt window) for checkpoints"""
+        return {"memory": self.memory.get_state(), "history_start": self._history_start}
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restores conversation state saved by get_state
+        
+        Args:
+            state: Data from get_state
+        """
+        self.memory.load_state(state["memory"])
+        self._history_start = state.get("history_start", 0)
+
+    def enable_rolling_summary(self) -> None:
+        """Let the agent's memory compress older rounds with this agent's model in the background"""
+        self.memory.enable_rolling_summary(self._summarize_rounds, f"summary-{self.name}")
+
+    def _summarize_rounds(self, previous_summary: str, rounds: List[Dict]) -> str:
+        """
+        Folds older rounds into a rolling summary (runs on the memory's background thread)
+        
+        This uses _call_llm rather than _generate so it doesn't overwrite
+        the timing and stats of the turn in progress.
+        
+        Args:
+            previous_summary: Summary of the rounds before these
+            rounds: Rounds to add to the summary
+            
+        Returns:
+            str: Updated summary
+        """
+        prompt = f"""Summarize the debate on "{self.topic}" so far for your own notes as {self.name}.
+Keep every distinct argument and piece of evidence, drop repetition and rhetoric, and stay under {MEMORY_SUMMARY_TOKEN_LIMIT} words.
+
+Summary so far:
+{previous_summary or "(none)"}
+
+New statements:
+"""
+        for round_data in rounds:
+            if round_data.get('position_x_statement'):
+                prompt += f"Position X: {round_data['position_x_statement']}\n"
+            if round_data.get('position_y_statement'):
+                prompt += f"Position Y: {round_data['position_y_statement']}\n"
+        prompt += "\nUpdated summary:"
+        
+        with self.tracer.span("summary", "memory", agent=self.name, rounds=len(rounds)):
+            text, _, _ = self._call_llm(prompt, {"num_predict": MEMORY_SUMMARY_TOKEN_LIMIT}, kind="summary")
+        return text
 
     def _get_position_desc(self, position: str) -> str:
         """Returns a description based on the agent's position"""
         return "advocating" if position == 'X' else "challenging"
     
     def _ensure_model_available(self):
-        """Check if the model is available and pull it if needed"""
-        try:
-            # Parse model name to handle tags like "llama3:latest"
-            base_model = self.model.split(':')[0] if ':' in self.model else self.model
-            
-            # Check if model exists by listing models
-            result = subprocess.run(['ollama', 'list'], capture_output=True, text=True, check=True)
-            
-            # Check if either the exact model name or base model name is in the list
-            if self.model not in result.stdout and base_model not in result.stdout:
-                print(f"Model {self.model} not found. Pulling model...")
-                # Use the full model name including tag when pulling
-                subprocess.run(['ollama', 'pull', self.model], check=True)
-                print(f"Model {self.model} successfully pulled.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error checking or pulling model: {e}")
-            print(f"Command output: {e.stdout}, {e.stderr}")
-            print("Please ensure Ollama is installed and running.")
-        except FileNotFoundError:
-            print("Ollama command not found. Please ensure Ollama is installed and in your PATH.")
+        """Check if the model is available and pull it if needed (cached per process)"""
+        ensure_models_available([self.model])
 
     def _create_system_prompt(self) -> str:
         """Creates the system prompt for the agent based on role and topic"""
@@ -94,8 +194,23 @@ Stay consistent with your assigned perspective throughout the debate.
         """This method is not used directly - kept for backwards compatibility"""
         return ""
     
+    def _history_messages(self, turns: List[Dict]) -> List[Any]:
+        """Converts transcript turns into chat messages"""
+        messages = []
+        for turn in turns:
+            if 'position_x_statement' in turn:
+                x_speaker = turn.get('position_x_name', 'Opponent')
+                messages.append(HumanMessage(content=f"{x_speaker}: {turn['position_x_statement']}"))
+            if 'position_y_statement' in turn:
+                y_speaker = turn.get('position_y_name', 'You')
+                messages.append(AIMessage(content=f"{y_speaker}: {turn['position_y_statement']}"))
+        return messages
+
     def _create_prompt_messages(self, message: str, conversation: List[Dict]) -> List[Any]:
         """Creates the full prompt with conversation history"""
+        if self.prompt_layout == "stable":
+            return self._create_stable_prompt_messages(message, conversation)
+        
         messages = [SystemMessage(content=self._create_system_prompt())]
         
         # Add brevity instruction as a separate system message for emphasis
@@ -107,41 +222,208 @@ Stay consistent with your assigned perspective throughout the debate.
             messages.append(SystemMessage(content=f"Previous debate context: {memory_context}"))
         
         # Add conversation history
-        for turn in conversation[-5:]:  # Limited context window
-            if 'position_x_statement' in turn:
-                x_speaker = turn.get('position_x_name', 'Opponent')
-                messages.append(HumanMessage(content=f"{x_speaker}: {turn['position_x_statement']}"))
-            if 'position_y_statement' in turn:
-                y_speaker = turn.get('position_y_name', 'You')
-                messages.append(AIMessage(content=f"{y_speaker}: {turn['position_y_statement']}"))
+        messages.extend(self._history_messages(conversation[-5:]))  # Limited context window
         
         # Add current message
         messages.append(HumanMessage(content=message))
         
         return messages
 
-    def send_message(self, message: str, conversation: List[Dict]) -> str:
+    def _create_stable_prompt_messages(self, message: str, conversation: List[Dict]) -> List[Any]:
+        """
+        Creates the prompt with an unchanging prefix followed by new content
+        
+        The system prompt and brevity instruction come first, then history from
+        a start point that only moves forward once the window has doubled, so
+        consecutive turns share everything up to the newest exchange. The
+        memory summary changes every turn, so it goes last with the message.
+        """
+        messages = [
+            SystemMessage(content=self._create_system_prompt()),
+            SystemMessage(content=f"IMPORTANT: {RESPONSE_STYLES[self.response_style]['description']}")
+        ]
+        
+        # Restart the window only when it has grown too large or the transcript was reset
+        if self._history_start > len(conversation) or len(conversation) - self._history_start > 2 * STABLE_HISTORY_TURNS:
+            self._history_start = max(0, len(conversation) - STABLE_HISTORY_TURNS)
+        messages.extend(self._history_messages(conversation[self._history_start:]))
+        
+        memory_context = self.memory.get_context_summary()
+        if memory_context:
+            messages.append(SystemMessage(content=f"Previous debate context: {memory_context}"))
+        
+        messages.append(HumanMessage(content=message))
+        
+        return messages
+
+    def _generate(self, prompt: Union[str, List[Any]], options: Optional[Dict] = None,
+                  on_token: Optional[Callable[[str], None]] = None,
+                  response_format: Optional[Any] = None, kind: str = "statement") -> str:
+        """
+        Runs the LLM, streaming tokens to on_token as they arrive when given
+        
+        Records time-to-first-token and total generation time in
+        self.last_response_timing, and the backend's response stats
+        (token counts, durations) in self.last_generation_info. When a
+        response cache is attached, replayed hits skip the model entirely.
+        
+        Args:
+            prompt: Prompt string or list of prompt messages
+            options: Ollama generation options (None keeps the model defaults)
+            on_token: Optional callback receiving each generated chunk
+            response_format: Ollama output format ("json" or a JSON schema)
+            kind: What the call is for, recorded with its metrics
+            
+        Returns:
+            str: The complete response
+        """
+        text, self.last_generation_info, self.last_response_timing = self._call_llm(
+            prompt, options, on_token, response_format, kind
+        )
+        return text
+
+    def _call_llm(self, prompt: Union[str, List[Any]], options: Optional[Dict] = None,
+                  on_token: Optional[Callable[[str], None]] = None,
+                  response_format: Optional[Any] = None,
+                  kind: str = "statement") -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        Runs one LLM request (or replays it from the response cache) and records its metrics
+        
+        Every call appends a record to self.call_metrics: kind, model, host,
+        wall time, time-to-first-token, whether it was a cache hit, and the
+        backend's prompt/completion token counts and durations. Unlike
+        _generate, this leaves last_response_timing and last_generation_info
+        alone, so it is safe to call from background threads.
+        
+        Args:
+            prompt: Prompt string or list of prompt messages
+            options: Ollama generation options (None keeps the model defaults)
+            on_token: Optional callback receiving each generated chunk
+            response_format: Ollama output format ("json" or a JSON schema)
+            kind: What the call is for ("statement", "vote", "vote_retry", "panel_vote" or "summary")
+            
+        Returns:
+            tuple: (response text, backend generation info, timing)
+        """
+        with self.tracer.span("llm_call", "llm", agent=self.name, model=self.model, kind=kind) as span:
+            text, generation_info, timing = self._request(prompt, options, on_token, response_format)
+            metrics = self._record_call(kind, timing, generation_info)
+            span.update(cached=metrics["cached"], prompt_tokens=metrics["prompt_tokens"],
+                        completion_tokens=metrics["completion_tokens"])
+        return text, generation_info, timing
+
+    def _request(self, prompt: Union[str, List[Any]], options: Optional[Dict],
+                 on_token: Optional[Callable[[str], None]],
+                 response_format: Optional[Any]) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """Sends the request to Ollama, or replays it from the response cache (see _call_llm)"""
+        start = time.perf_counter()
+        
+        cache_key = None
+        if self.response_cache is not None and self.response_cache.enabled:
+            cache_key = ResponseCache.make_key(self.model, prompt, MODEL_TEMPERATURE, options, response_format)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                if on_token is not None:
+                    on_token(cached["text"])
+                elapsed = round(time.perf_counter() - start, 3)
+                timing = {
+                    "streamed": on_token is not None,
+                    "cached": True,
+                    "time_to_first_token": elapsed if on_token is not None else None,
+                    "generation_time": elapsed
+                }
+                return cached["text"], cached.get("generation_info", {}), timing
+        
+        handler = _TokenStreamHandler(on_token) if on_token is not None else None
+        prompt_value = StringPromptValue(text=prompt) if isinstance(prompt, str) else ChatPromptValue(messages=prompt)
+        kwargs = {"options": options} if options is not None else {}
+        if response_format is not None:
+            kwargs["format"] = response_format
+        
+        # generate_prompt (rather than invoke/stream) keeps Ollama's final
+        # response stats, such as eval_count, alongside the text
+        slots = _llm_request_slots or contextlib.nullcontext()
+        with slots:
+            result = self.llm.generate_prompt(
+                [prompt_value],
+                callbacks=[handler] if handler else None,
+                **kwargs
+            )
+        generation = result.generations[0][0]
+        generation_info = generation.generation_info or {}
+        
+        first_token_time = handler.first_token_at - start if handler and handler.first_token_at else None
+        timing = {
+            "streamed": on_token is not None,
+            "time_to_first_token": round(first_token_time, 3) if first_token_time is not None else None,
+            "generation_time": round(time.perf_counter() - start, 3)
+        }
+        
+        if cache_key is not None:
+            self.response_cache.put(cache_key, generation.text, generation_info)
+        return generation.text, generation_info, timing
+
+    def _record_call(self, kind: str, timing: Dict[str, Any], generation_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Appends one call's metrics to self.call_metrics and returns them"""
+        prompt_tokens = generation_info.get("prompt_eval_count")
+        completion_tokens = generation_info.get("eval_count")
+        eval_duration = _seconds(generation_info.get("eval_duration"))
+        metrics = {
+            "kind": kind,
+            "agent": self.name,
+            "model": self.model,
+            "host": self.base_url,
+            "timestamp": round(time.time(), 3),
+            "cached": bool(timing.get("cached")),
+            "wall_time": timing["generation_time"],
+            "time_to_first_token": timing["time_to_first_token"],
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "prompt_eval_duration": _seconds(generation_info.get("prompt_eval_duration")),
+            "eval_duration": eval_duration,
+            "load_duration": _seconds(generation_info.get("load_duration")),
+            "total_duration": _seconds(generation_info.get("total_duration")),
+            "tokens_per_second": round(completion_tokens / eval_duration, 2)
+                if completion_tokens and eval_duration else None
+        }
+        with self._call_metrics_lock:
+            self.call_metrics.append(metrics)
+        return metrics
+
+    def drain_call_metrics(self) -> List[Dict[str, Any]]:
+        """
+        Returns the metrics recorded since the last drain and clears them
+        
+        Returns:
+            list: One record per LLM call, oldest first
+        """
+        with self._call_metrics_lock:
+            calls, self.call_metrics = self.call_metrics, []
+        return calls
+
+    def send_message(self, message: str, conversation: List[Dict], on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Generates a response from the agent based on the message and conversation
         
         Args:
             message: The message/prompt to respond to
             conversation: The debate history
+            on_token: Optional callback to stream tokens as they are generated
             
         Returns:
             str: Agent's response
         """
+        self.last_response_timing = {}
+        self.last_generation_info = {}
         try:
-            messages = self._create_prompt_messages(message, conversation)
+            with self.tracer.span("prompt_build", "prompt", agent=self.name):
+                messages = self._create_prompt_messages(message, conversation)
             
             # Use token limit from the configured response style
             token_limit = RESPONSE_STYLES[self.response_style]['token_limit']
             
             # Use num_predict instead of max_tokens for Ollama
-            response = self.llm.invoke(
-                messages,
-                options={"num_predict": token_limit}
-            )
+            response = self._generate(messages, {"num_predict": token_limit}, on_token)
             
             # Update agent memory with the new information
             latest_round = {}
@@ -176,14 +458,18 @@ Stay consistent with your assigned perspective throughout the debate.
             raise ValueError("Only Position Y agents can vote")
         
         # Create evaluation prompt
-        eval_prompt = self._create_evaluation_prompt(transcript, current_round)
+        with self.tracer.span("prompt_build", "prompt", agent=self.name):
+            eval_prompt = self._create_evaluation_prompt(transcript, current_round)
         
         try:
-            # Direct invocation without trying to access .content
-            response = self.llm.invoke(eval_prompt)
+            if self.judge_output == "json":
+                return self._structured_vote(eval_prompt, current_round)
+            
+            response = self._generate(eval_prompt, kind="vote")
             
             # Parse the response to extract scores
-            evaluation = self._parse_evaluation(response, current_round)
+            with self.tracer.span("parse", "parse", agent=self.name):
+                evaluation = self._parse_evaluation(response, current_round)
             return evaluation
             
         except Exception as e:
@@ -196,8 +482,162 @@ Stay consistent with your assigned perspective throughout the debate.
             # No continue_vote field, this will be determined by the debate manager
             return evaluation
     
+    def _evaluation_schema(self, fields: List[str]) -> Dict:
+        """JSON schema constraining a judge's answer to the given fields"""
+        properties = {}
+        for field in fields:
+            if field == "comments":
+                properties[field] = {"type": "string", "maxLength": JUDGE_COMMENT_MAX_CHARS}
+            else:
+                properties[field] = {"type": "integer", "minimum": 1, "maximum": 5}
+        return {"type": "object", "properties": properties, "required": list(fields)}
+
+    def _structured_vote(self, eval_prompt: str, current_round: int) -> Dict:
+        """
+        Evaluates a round with schema-constrained JSON output
+        
+        Fields that fail validation are requested again (only those fields)
+        up to JUDGE_JSON_RETRIES times before falling back to a middle score.
+        
+        Args:
+            eval_prompt: Evaluation prompt
+            current_round: Round being evaluated
+            
+        Returns:
+            dict: Standardized evaluation with scores
+        """
+        evaluation = copy.deepcopy(EVALUATION_TEMPLATE)
+        evaluation["round_number"] = current_round
+        options = {"num_predict": JUDGE_JSON_TOKEN_LIMIT, "temperature": MODEL_TEMPERATURE}
+        
+        pending = list(JUDGING_CRITERIA.keys()) + ["comments"]
+        prompt = eval_prompt
+        for attempt in range(JUDGE_JSON_RETRIES + 1):
+            response = self._generate(prompt, options, response_format=self._evaluation_schema(pending),
+                                      kind="vote" if attempt == 0 else "vote_retry")
+            with self.tracer.span("parse", "parse", agent=self.name):
+                values = self._parse_structured_evaluation(response, pending)
+            for field, value in values.items():
+                if field == "comments":
+                    evaluation["comments"] = value
+                else:
+                    evaluation["position_y_performance"][field] = value
+            pending = [field for field in pending if field not in values]
+            if not pending:
+                break
+            prompt = (f"{eval_prompt}\nYour previous answer had missing or invalid values for: "
+                      f"{', '.join(pending)}. Respond with a JSON object containing only these fields.\n")
+        
+        # Default to middle score for anything still missing
+        for field in pending:
+            if field != "comments":
+                evaluation["position_y_performance"][field] = 3
+        
+        self._apply_total_score(evaluation)
+        return evaluation
+
+    @staticmethod
+    def _parse_structured_evaluation(response: str, fields: List[str]) -> Dict[str, Any]:
+        """
+        Validates a JSON evaluation
+        
+        Args:
+            response: Raw JSON text from the judge
+            fields: Fields expected in this response
+            
+        Returns:
+            dict: Only the fields that are present and valid
+        """
+        try:
+            data = json.loads(response)
+        except ValueError:
+            return {}
+        return Agent._validate_evaluation_fields(data, fields)
+
+    @staticmethod
+    def _validate_evaluation_fields(data: Any, fields: List[str]) -> Dict[str, Any]:
+        """Returns the fields of a decoded JSON evaluation that are present and valid"""
+        if not isinstance(data, dict):
+            return {}
+        
+        valid = {}
+        for field in fields:
+            value = data.get(field)
+            if field == "comments":
+                if isinstance(value, str) and value.strip():
+                    valid[field] = value.strip()[:JUDGE_COMMENT_MAX_CHARS]
+            elif isinstance(value, (int, float)) and not isinstance(value, bool) and value == int(value) and 1 <= value <= 5:
+                valid[field] = int(value)
+        return valid
+
+    def panel_vote(self, transcript: List[Dict], current_round: int, panel_size: int) -> List[Optional[Dict]]:
+        """
+        Evaluates a round on behalf of a whole judge panel in one request
+        
+        The shared rubric and round text are prefilled once and the model
+        writes panel_size independent evaluations as one JSON array.
+        
+        Args:
+            transcript: Full debate transcript
+            current_round: The round number being evaluated
+            panel_size: Number of evaluations to produce
+            
+        Returns:
+            list: One evaluation per panel seat, or None for seats whose
+                evaluation was missing or invalid (those judges should vote alone)
+        """
+        if self.position != "Y":
+            raise ValueError("Only Position Y agents can vote")
+        
+        fields = list(JUDGING_CRITERIA.keys()) + ["comments"]
+        closing = (f"Write {panel_size} independent evaluations of round {current_round}, as if from "
+                   f"{panel_size} different judges. Respond with a JSON object with an \"evaluations\" "
+                   f"array of {panel_size} objects, each using the evaluation format above.\n")
+        with self.tracer.span("prompt_build", "prompt", agent=self.name):
+            prompt = self._create_stable_evaluation_prompt(transcript, current_round, "json", closing)
+        schema = {
+            "type": "object",
+            "properties": {
+                "evaluations": {
+                    "type": "array",
+                    "minItems": panel_size,
+                    "maxItems": panel_size,
+                    "items": self._evaluation_schema(fields)
+                }
+            },
+            "required": ["evaluations"]
+        }
+        options = {"num_predict": JUDGE_JSON_TOKEN_LIMIT * panel_size, "temperature": MODEL_TEMPERATURE}
+        
+        try:
+            response = self._generate(prompt, options, response_format=schema, kind="panel_vote")
+            with self.tracer.span("parse", "parse", agent=self.name):
+                items = json.loads(response).get("evaluations", [])
+                if not isinstance(items, list):
+                    items = []
+        except Exception as e:
+            print(f"Error during panel evaluation: {e}")
+            return [None] * panel_size
+        
+        evaluations = []
+        for i in range(panel_size):
+            values = self._validate_evaluation_fields(items[i], fields) if i < len(items) else {}
+            if len(values) < len(fields):
+                evaluations.append(None)
+                continue
+            evaluation = copy.deepcopy(EVALUATION_TEMPLATE)
+            evaluation["round_number"] = current_round
+            evaluation["comments"] = values.pop("comments")
+            evaluation["position_y_performance"].update(values)
+            self._apply_total_score(evaluation)
+            evaluations.append(evaluation)
+        return evaluations
+
     def _create_evaluation_prompt(self, transcript: List[Dict], current_round: int) -> str:
         """Creates prompt for evaluation"""
+        if self.prompt_layout == "stable" or self.judge_output == "json":
+            return self._create_stable_evaluation_prompt(transcript, current_round)
+        
         prompt = f"""You are a debate judge evaluating round {current_round} on the topic: {self.topic}
 
 Your task is to assess the performance of the second speaker (Challenging Position) against the first speaker (Advocating Position).
@@ -241,6 +681,95 @@ IMPORTANT INSTRUCTIONS:
         
         return prompt
     
+    def _judging_rubric(self, judge_output: Optional[str] = None) -> str:
+        """
+        Returns the round-independent part of the evaluation prompt
+        
+        The text is cached per topic so every vote starts with an identical
+        prefix that the backend can reuse.
+        
+        Args:
+            judge_output: Answer format to describe (defaults to self.judge_output)
+        """
+        judge_output = judge_output or self.judge_output
+        if self._rubric_cache and self._rubric_cache[:2] == (self.topic, judge_output):
+            return self._rubric_cache[2]
+        
+        rubric = f"""You are a debate judge evaluating rounds of a debate on the topic: {self.topic}
+
+Your task is to assess the performance of the second speaker (Challenging Position) against the first speaker (Advocating Position).
+
+EVALUATION CRITERIA:
+"""
+        for criterion, details in JUDGING_CRITERIA.items():
+            rubric += f"- {criterion.replace('_', ' ').title()} (weight: {details['weight']})\n"
+            for score, description in details['scoring_guide'].items():
+                rubric += f"  Score {score}: {description}\n"
+        
+        if judge_output == "json":
+            fields = ", ".join(f'"{c}"' for c in JUDGING_CRITERIA)
+            rubric += f"""
+REQUIRED EVALUATION FORMAT:
+
+Respond with a single JSON object with integer scores from 1 to 5 for {fields},
+and a "comments" string of at most two sentences justifying your scores.
+
+IMPORTANT INSTRUCTIONS:
+1. All scores MUST be integers between 1-5
+2. DO NOT calculate a total score
+3. Be harsh, critical and objective in your evaluation
+4. The debate continues only if Position Y (challenging side) performs poorly, so evaluate truthfully
+5. Output only the JSON object, nothing else
+"""
+            self._rubric_cache = (self.topic, judge_output, rubric)
+            return rubric
+        
+        rubric += """
+REQUIRED EVALUATION FORMAT:
+
+Argument Strength: [score 1-5]
+Relevance: [score 1-5] 
+Persuasiveness: [score 1-5]
+Clarity: [score 1-5]
+
+Comments: [Provide 2-3 sentences justifying your scores]
+
+IMPORTANT INSTRUCTIONS:
+1. All scores MUST be integers between 1-5
+2. DO NOT calculate a total score
+3. Be harsh, critical and objective in your evaluation
+4. The debate continues only if Position Y (challenging side) performs poorly, so evaluate truthfully
+5. Format your response EXACTLY as shown above
+"""
+        self._rubric_cache = (self.topic, judge_output, rubric)
+        return rubric
+
+    def _create_stable_evaluation_prompt(self, transcript: List[Dict], current_round: int,
+                                         judge_output: Optional[str] = None,
+                                         closing: Optional[str] = None) -> str:
+        """
+        Creates the evaluation prompt as the cached rubric followed by the round to judge
+        
+        Args:
+            transcript: Full debate transcript
+            current_round: Round being evaluated
+            judge_output: Answer format for the rubric (defaults to self.judge_output)
+            closing: Final instruction, replacing the default request for one evaluation
+        """
+        prompt = self._judging_rubric(judge_output)
+        prompt += f"\nDEBATE TRANSCRIPT (ROUND {current_round}):\n"
+        
+        if current_round <= len(transcript):
+            round_data = transcript[current_round - 1]
+            x_name = round_data.get('position_x_name', 'Advocating Speaker')
+            y_name = round_data.get('position_y_name', 'Challenging Speaker')
+            
+            prompt += f"=== {x_name} (Advocating) ===\n{round_data.get('position_x_statement', 'No statement provided')}\n\n"
+            prompt += f"=== {y_name} (Challenging) ===\n{round_data.get('position_y_statement', 'No statement provided')}\n\n"
+        
+        prompt += closing or f"Evaluate round {current_round} now, using the required format above.\n"
+        return prompt
+
     def _parse_evaluation(self, response: str, current_round: int) -> Dict:
         """
         Parses evaluation response to extract structured scores
@@ -282,6 +811,12 @@ IMPORTANT INSTRUCTIONS:
                 except:
                     pass
         
+        self._apply_total_score(evaluation)
+        return evaluation
+
+    @staticmethod
+    def _apply_total_score(evaluation: Dict) -> None:
+        """Calculates the weighted total score of an evaluation in place"""
         # Calculate weighted total score
         total_score = 0.0
         total_weight = 0.0
@@ -296,5 +831,3 @@ IMPORTANT INSTRUCTIONS:
         else:
             # Fallback if no weights are defined
             evaluation["total_score"] = sum(evaluation["position_y_performance"].values()) / len(evaluation["position_y_performance"])
-        
-        return evaluation
@@ -0,0 +1,225 @@
+from typing import Dict, List
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import tempfile
+import time
+
+from agent import Agent
+from debate_manager import DebateManager
+from debate_logger import DebateLogger
+from fake_ollama import FakeOllamaSettings, start_fake_ollama, LATENCY_DISTRIBUTIONS
+from model_registry import model_registry
+
+BENCHMARK_MODEL = "llama3:latest"
+
+class TimedDebateManager(DebateManager):
+    """
+    DebateManager that records how long each phase of the debate takes
+
+    Transcripts are saved to output_dir by a TimedDebateLogger.
+    """
+    def __init__(self, *args, output_dir: str, **kwargs):
+        self.phase_times = {"turns": 0.0, "voting": 0.0, "rotation": 0.0, "save": 0.0}
+        logger = TimedDebateLogger(self.phase_times, output_dir=output_dir, verbose=False)
+        super().__init__(*args, logger=logger, **kwargs)
+
+    @contextlib.contextmanager
+    def _phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] += time.perf_counter() - start
+
+    def debate_round(self, *args, **kwargs) -> Dict:
+        with self._phase("turns"):
+            return super().debate_round(*args, **kwargs)
+
+    def collect_votes(self, *args, **kwargs) -> Dict:
+        with self._phase("voting"):
+            return super().collect_votes(*args, **kwargs)
+
+    def rotate_agents(self) -> None:
+        with self._phase("rotation"):
+            super().rotate_agents()
+
+class TimedDebateLogger(DebateLogger):
+    """
+    DebateLogger that adds the time spent saving to a manager's phase times
+    """
+    def __init__(self, phase_times: Dict[str, float], **kwargs):
+        super().__init__(**kwargs)
+        self.phase_times = phase_times
+
+    def save_debate(self, debate_data: Dict) -> None:
+        start = time.perf_counter()
+        try:
+            super().save_debate(debate_data)
+        finally:
+            self.phase_times["save"] += time.perf_counter() - start
+
+def build_agents(base_url: str, pool_size: int) -> tuple:
+    """Creates one Position X agent and pool_size Position Y agents against the fake server"""
+    topic = "Is this benchmark representative?"
+    position_x = Agent(
+        name="Benchmark Advocate",
+        role_description="You argue that the benchmark is representative.",
+        model=BENCHMARK_MODEL,
+        position="X",
+        topic=topic,
+        base_url=base_url
+    )
+    position_y_agents = [
+        Agent(
+            name=f"Benchmark Challenger {i}",
+            role_description="You argue that the benchmark is not representative.",
+            model=BENCHMARK_MODEL,
+            position="Y",
+            topic=topic,
+            base_url=base_url
+        )
+        for i in range(1, pool_size + 1)
+    ]
+    return topic, position_x, position_y_agents
+
+def run_single_debate(base_url: str, rounds: int, pool_size: int, output_dir: str,
+                      manager_options: Dict) -> Dict:
+    """
+    Runs one debate against the fake server and measures it
+
+    Returns:
+        dict: Wall time and per-phase times in seconds
+    """
+    topic, position_x, position_y_agents = build_agents(base_url, pool_size)
+    manager = TimedDebateManager(
+        position_x=position_x,
+        position_y_agents=position_y_agents,
+        topic=topic,
+        rounds=rounds,
+        verbose=False,
+        output_dir=output_dir,
+        **manager_options
+    )
+
+    # DebateManager prints progress for every turn; keep the benchmark output readable
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.start_debate()
+    wall_time = time.perf_counter() - start
+
+    return {"wall_time": wall_time, "phases": dict(manager.phase_times)}
+
+def run_benchmark(rounds_list: List[int], pool_sizes: List[int], repeats: int,
+                  settings: FakeOllamaSettings, manager_options: Dict) -> List[Dict]:
+    """
+    Runs every (rounds, pool size) combination and aggregates the measurements
+
+    Python-side overhead is wall time minus the latency the fake server
+    simulated. It is exact for sequential runs; with concurrent judges the
+    simulated latencies overlap and the overhead is understated.
+
+    Returns:
+        list: One result row per combination
+    """
+    server = start_fake_ollama(settings)
+    previous_base_url = model_registry.base_url
+    model_registry.base_url = server.base_url
+    model_registry.invalidate()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            for rounds in rounds_list:
+                for pool_size in pool_sizes:
+                    runs = []
+                    for _ in range(repeats):
+                        server.reset_stats()
+                        run = run_single_debate(server.base_url, rounds, pool_size, output_dir, manager_options)
+                        run["llm_calls"] = server.request_count
+                        run["simulated_latency"] = server.total_latency
+                        runs.append(run)
+
+                    wall_times = [r["wall_time"] for r in runs]
+                    mean_wall = statistics.mean(wall_times)
+                    overheads = [r["wall_time"] - r["simulated_latency"] for r in runs]
+                    results.append({
+                        "rounds": rounds,
+                        "pool_size": pool_size,
+                        "repeats": repeats,
+                        "mean_wall_time": mean_wall,
+                        "debates_per_hour": 3600 / mean_wall if mean_wall > 0 else float('inf'),
+                        "llm_calls": statistics.mean(r["llm_calls"] for r in runs),
+                        "python_overhead": statistics.mean(overheads),
+                        "overhead_per_call": statistics.mean(
+                            o / r["llm_calls"] for o, r in zip(overheads, runs) if r["llm_calls"]
+                        ) if any(r["llm_calls"] for r in runs) else 0.0,
+                        "phases": {
+                            phase: statistics.mean(r["phases"][phase] for r in runs)
+                            for phase in runs[0]["phases"]
+                        }
+                    })
+    finally:
+        server.shutdown()
+        model_registry.base_url = previous_base_url
+        model_registry.invalidate()
+    return results
+
+def print_results(results: List[Dict]) -> None:
+    """Prints the benchmark results as a table"""
+    header = (f"{'rounds':>6} {'pool':>4} {'wall(s)':>9} {'debates/h':>10} {'calls':>6} "
+              f"{'overhead(s)':>11} {'ms/call':>8} {'turns':>8} {'voting':>8} {'rotate':>8} {'save':>8}")
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        phases = row["phases"]
+        print(f"{row['rounds']:>6} {row['pool_size']:>4} {row['mean_wall_time']:>9.3f} "
+              f"{row['debates_per_hour']:>10.1f} {row['llm_calls']:>6.0f} "
+              f"{row['python_overhead']:>11.3f} {row['overhead_per_call'] * 1000:>8.2f} "
+              f"{phases['turns']:>8.3f} {phases['voting']:>8.3f} "
+              f"{phases['rotation']:>8.3f} {phases['save']:>8.3f}")
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description='Debate orchestration benchmark against a fake Ollama backend')
+    parser.add_argument('--rounds', type=parse_int_list, default=[2, 4, 6], help='Comma-separated round counts')
+    parser.add_argument('--pool-sizes', type=parse_int_list, default=[4, 6], help='Comma-separated Position Y pool sizes')
+    parser.add_argument('--repeats', type=int, default=3, help='Debates per combination')
+    parser.add_argument('--latency-mean', type=float, default=0.0, help='Mean simulated seconds per LLM call')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='Latency spread (sigma for lognormal)')
+    parser.add_argument('--distribution', choices=LATENCY_DISTRIBUTIONS, default='fixed', help='Latency distribution')
+    parser.add_argument('--judge-concurrency', type=int, default=1, help='Judges evaluating at the same time')
+    parser.add_argument('--pipeline', action='store_true', help='Overlap judge voting with the next round\'s opening')
+    parser.add_argument('--judge-output', choices=["text", "json"], default="text", help='Judge answer format')
+    parser.add_argument('--panel-evaluation', action='store_true', help='Score each round for all judges in one request')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for latencies and scores')
+    parser.add_argument('--json', type=str, help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    if min(args.pool_sizes) < 4:
+        parser.error("pool sizes must be at least 4")
+
+    settings = FakeOllamaSettings(
+        latency_mean=args.latency_mean,
+        latency_jitter=args.latency_jitter,
+        distribution=args.distribution,
+        models=[BENCHMARK_MODEL],
+        seed=args.seed
+    )
+    results = run_benchmark(
+        args.rounds, args.pool_sizes, args.repeats, settings,
+        {"judge_concurrency": args.judge_concurrency, "pipeline_rounds": args.pipeline,
+         "judge_output": args.judge_output, "panel_evaluation": args.panel_evaluation}
+    )
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.json}")
+
+if __name__ == "__main__":
+    main()
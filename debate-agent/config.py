@@ -1,4 +1,5 @@
 from typing import Dict, List, Any
+import os
 
 # Model configuration
 DEFAULT_MODEL = "llama3:latest"
@@ -7,11 +8,54 @@ MODEL_TEMPERATURE = 0.7
 MAX_TOKENS = 1024
 CONTEXT_WINDOW = 8192
 
+# Ollama server (OLLAMA_HOST may be given without a scheme, e.g. "127.0.0.1:11434")
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+if "://" not in OLLAMA_BASE_URL:
+    OLLAMA_BASE_URL = f"http://{OLLAMA_BASE_URL}"
+OLLAMA_REQUEST_TIMEOUT = 5  # seconds, for metadata requests like /api/tags
+
+# Prompt layout: "classic" rebuilds the whole prompt each turn; "stable" keeps
+# an unchanging prefix (persona, rubric) first and appends new content after it,
+# so Ollama can reuse the KV cache from the agent's previous call
+DEFAULT_PROMPT_LAYOUT = "classic"
+PROMPT_LAYOUTS = ["classic", "stable"]
+# Turns of history kept in "stable" layout; the window restarts only after it
+# has doubled, so the prompt prefix stays identical between restarts
+STABLE_HISTORY_TURNS = 5
+# How long Ollama keeps a model (and its cache) loaded between calls
+OLLAMA_KEEP_ALIVE = "30m"
+
 # Debate configuration
 DEFAULT_ROUNDS = 6
 MAX_ROTATION_COUNT = 3
 DEFAULT_STARTING_POSITION = "X"
 
+# Maximum number of judges evaluating a round at the same time (1 = sequential)
+DEFAULT_JUDGE_CONCURRENCY = 1
+
+# Generate Position X's next statement while judges vote on the previous round
+DEFAULT_PIPELINE_ROUNDS = False
+
+# Print debater tokens to the console as they are generated
+DEFAULT_STREAM_RESPONSES = False
+
+# Round log: records (turns, rounds, votes, rotations) written between fsyncs
+# of the append-only .jsonl transcript, which is compacted into the viewer's
+# .json format when the debate ends
+ROUND_LOG_FLUSH_EVERY = 4
+
+# Save a checkpoint after every round and vote so an interrupted debate can be
+# continued with main.py --resume
+DEFAULT_CHECKPOINTS = True
+
+# Record a Chrome trace of each debate (rounds, turns, prompt builds, LLM
+# calls, parsing, votes, rotations and saves) next to its transcript
+DEFAULT_TRACE = False
+
+# SQLite database used by --database when no path is given; debates are also
+# written there (with indexes on topic, timestamp, debater and judge)
+DEFAULT_DATABASE_PATH = os.path.join("output", "debates.db")
+
 # Judging criteria
 JUDGING_CRITERIA = {
     "argument_strength": {
@@ -48,6 +92,16 @@ JUDGING_CRITERIA = {
     }
 }
 
+# Judge output: "text" parses free-form answers, "json" constrains the judge to
+# a JSON schema with a tight token budget and re-asks only for invalid fields
+DEFAULT_JUDGE_OUTPUT = "text"
+JUDGE_OUTPUT_MODES = ["text", "json"]
+JUDGE_JSON_TOKEN_LIMIT = 120
+JUDGE_COMMENT_MAX_CHARS = 300
+JUDGE_JSON_RETRIES = 1
+# Score a round for all judges sharing a model with one batched JSON request
+DEFAULT_PANEL_EVALUATION = False
+
 # Evaluation template
 EVALUATION_TEMPLATE = {
     "round_number": 0,
@@ -62,10 +116,31 @@ EVALUATION_TEMPLATE = {
     "continue_vote": True
 }
 
+# Response cache: directory (relative to the working directory, like output/),
+# size budget before least recently used entries are evicted, and default mode
+# ("off", "record" or "replay")
+RESPONSE_CACHE_DIR = "cache"
+RESPONSE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_RESPONSE_CACHE_MODE = "off"
+
+# Agent memory: rounds kept for the context summary and key points tracked per side
+MEMORY_RECENT_ROUNDS = 3
+MEMORY_KEY_POINTS = 5
+# Compress rounds older than MEMORY_RECENT_ROUNDS into a rolling LLM summary
+# in the background, and the token budget for each summary update
+DEFAULT_ROLLING_SUMMARY = False
+MEMORY_SUMMARY_TOKEN_LIMIT = 250
+
 # Timer configuration
 DEFAULT_TIME_LIMIT_SECONDS = 300  # 5 minutes
 TOKENS_PER_SECOND = 3.75  # Based on ~150 words per minute
 
+# Token counting: starting tokens-per-piece ratio (a piece is a word or
+# punctuation mark) until a model is calibrated from Ollama's eval_count,
+# and how strongly each new observation moves the calibrated ratio
+APPROX_TOKENS_PER_PIECE = 1.2
+TOKEN_CALIBRATION_SMOOTHING = 0.2
+
 # Response length configuration
 RESPONSE_STYLES = {
     "concise": {
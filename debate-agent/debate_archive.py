@@ -0,0 +1,226 @@
+import os
+import sys
+import json
+import time
+import zlib
+import struct
+import argparse
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Archive layout (ui-interface/archive_reader.py imports the readers below):
+#   ARCHIVE_MAGIC
+#   summary block    zlib-compressed JSON: the debate without its transcript
+#   round blocks     zlib-compressed JSON, one per transcript round
+#   index            zlib-compressed JSON: offset and length of every block
+#   trailer          index offset (8 bytes, big-endian) + ARCHIVE_MAGIC
+ARCHIVE_EXTENSION = ".jsonz"
+ARCHIVE_MAGIC = b"DEBATEZ1"
+ARCHIVE_TRAILER = struct.Struct(">Q8s")
+ARCHIVE_VERSION = 1
+
+# Archives are written once and read many times, so compress hard
+ARCHIVE_COMPRESSION_LEVEL = 9
+
+def final_scores(transcript: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Judge scores from the last round that was voted on"""
+    for round_data in reversed(transcript):
+        evaluations = (round_data.get("voting_results") or {}).get("evaluations", [])
+        if evaluations:
+            return {e["judge_name"]: e["total_score"] for e in evaluations}
+    return {}
+
+def debate_filenames(names: Iterable[str]) -> List[str]:
+    """
+    Picks one file per saved debate from a directory listing
+
+    A debate archived with --keep-json exists both as .json and as .jsonz;
+    the .json (the name it was saved and stored in the database under) is
+    used, so the debate is counted once.
+
+    Args:
+        names: Filenames in a debate output directory
+
+    Returns:
+        list: The transcript and archive filenames to read, sorted
+    """
+    names = set(names)
+    return sorted(
+        name for name in names
+        if name.endswith((".json", ARCHIVE_EXTENSION)) and not name.startswith(".")
+        and not (name.endswith(ARCHIVE_EXTENSION) and name[:-len(ARCHIVE_EXTENSION)] + ".json" in names)
+    )
+
+def write_archive(debate_data: Dict[str, Any], archive_path: str) -> int:
+    """
+    Writes a debate as a compressed archive with a round-level offset index
+
+    The summary keeps every top-level field except the transcript, plus the
+    last round's scores, so listing a debate never touches its rounds.
+
+    Args:
+        debate_data: Debate data in the format written by DebateLogger.save_debate
+        archive_path: Path of the archive to write (replaced atomically)
+
+    Returns:
+        int: Size of the archive in bytes
+    """
+    transcript = debate_data.get("transcript", [])
+    summary = {key: value for key, value in debate_data.items() if key != "transcript"}
+    summary["final_scores"] = final_scores(transcript)
+    summary["round_count"] = len(transcript)
+
+    def encode(value: Any) -> bytes:
+        return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), ARCHIVE_COMPRESSION_LEVEL)
+
+    tmp_path = f"{archive_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(ARCHIVE_MAGIC)
+        block = encode(summary)
+        index = {"version": ARCHIVE_VERSION, "summary": [f.tell(), len(block)], "rounds": []}
+        f.write(block)
+        for round_data in transcript:
+            block = encode(round_data)
+            index["rounds"].append([round_data.get("round"), f.tell(), len(block)])
+            f.write(block)
+        index_offset = f.tell()
+        f.write(encode(index))
+        f.write(ARCHIVE_TRAILER.pack(index_offset, ARCHIVE_MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, archive_path)
+    return size
+
+def read_archive_index(f) -> Dict[str, Any]:
+    """
+    Reads the block index of an open archive
+
+    Args:
+        f: Archive opened in binary mode
+
+    Returns:
+        dict: Offsets and lengths of the summary and round blocks
+    """
+    if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+        raise ValueError("Not a debate archive")
+    end = f.seek(0, os.SEEK_END)
+    f.seek(end - ARCHIVE_TRAILER.size)
+    index_offset, magic = ARCHIVE_TRAILER.unpack(f.read(ARCHIVE_TRAILER.size))
+    if magic != ARCHIVE_MAGIC:
+        raise ValueError("Debate archive is truncated (missing trailer)")
+    index = read_block(f, (index_offset, end - ARCHIVE_TRAILER.size - index_offset))
+    if index.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported debate archive version: {index.get('version')}")
+    return index
+
+def read_block(f, location: Tuple[int, int]) -> Any:
+    """Reads and decompresses one block given its (offset, length)"""
+    offset, length = location
+    f.seek(offset)
+    try:
+        return json.loads(zlib.decompress(f.read(length)))
+    except zlib.error as e:
+        raise ValueError(f"Corrupt debate archive block at offset {offset}: {e}")
+
+def read_archive(archive_path: str) -> Dict[str, Any]:
+    """
+    Reads a whole archive back into the debate JSON format
+
+    Args:
+        archive_path: Path to a .jsonz archive
+
+    Returns:
+        dict: Debate data as written by DebateLogger.save_debate
+    """
+    with open(archive_path, "rb") as f:
+        index = read_archive_index(f)
+        debate_data = read_block(f, index["summary"])
+        debate_data["transcript"] = [read_block(f, (offset, length)) for _, offset, length in index["rounds"]]
+    debate_data.pop("final_scores", None)
+    debate_data.pop("round_count", None)
+    return debate_data
+
+def archive_debate(json_path: str, keep_json: bool = False) -> Tuple[int, int]:
+    """
+    Converts one JSON transcript into an archive next to it
+
+    The archive is verified against the original before the JSON is removed.
+
+    Args:
+        json_path: Path to a debate .json file
+        keep_json: Keep the original file
+
+    Returns:
+        tuple: (original size, archive size) in bytes
+    """
+    with open(json_path, "r") as f:
+        debate_data = json.load(f)
+    archive_path = os.path.splitext(json_path)[0] + ARCHIVE_EXTENSION
+    archive_size = write_archive(debate_data, archive_path)
+    if read_archive(archive_path) != debate_data:
+        os.remove(archive_path)
+        raise ValueError(f"Archive of {json_path} does not match the original")
+    original_size = os.path.getsize(json_path)
+    if not keep_json:
+        os.remove(json_path)
+    return original_size, archive_size
+
+def archive_directory(output_dir: str, older_than_days: float = 0,
+                      keep_json: bool = False) -> List[Tuple[str, int, int]]:
+    """
+    Archives the finished debates in an output directory
+
+    Debates that still have a round log or checkpoint (running or
+    interrupted) are skipped.
+
+    Args:
+        output_dir: Debate output directory
+        older_than_days: Only archive files not modified for this many days
+        keep_json: Keep the original JSON files
+
+    Returns:
+        list: (filename, original size, archive size) for every archived debate
+    """
+    cutoff = time.time() - older_than_days * 86400
+    names = set(os.listdir(output_dir))
+    archived = []
+    for filename in sorted(names):
+        stem, extension = os.path.splitext(filename)
+        if extension != ".json" or f"{stem}.jsonl" in names or f"{stem}.checkpoint" in names:
+            continue
+        path = os.path.join(output_dir, filename)
+        if os.path.getmtime(path) > cutoff:
+            continue
+        try:
+            original_size, archive_size = archive_debate(path, keep_json)
+            archived.append((filename, original_size, archive_size))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Skipping {filename}: {e}")
+    return archived
+
+def main():
+    parser = argparse.ArgumentParser(description='Compress finished debates into indexed archives')
+    parser.add_argument('output_dir', nargs='?', default='output', help='Debate output directory')
+    parser.add_argument('--older-than-days', type=float, default=0, help='Only archive debates older than this')
+    parser.add_argument('--keep-json', action='store_true', help='Keep the original JSON files')
+    parser.add_argument('--extract', type=str, metavar='ARCHIVE', help='Write an archive back out as JSON and exit')
+    args = parser.parse_args()
+
+    if args.extract:
+        json_path = os.path.splitext(args.extract)[0] + ".json"
+        with open(json_path, "w") as f:
+            json.dump(read_archive(args.extract), f, indent=2)
+        print(f"Extracted to: {json_path}")
+        return
+
+    if not os.path.isdir(args.output_dir):
+        print(f"No such directory: {args.output_dir}")
+        sys.exit(1)
+    archived = archive_directory(args.output_dir, args.older_than_days, args.keep_json)
+    before = sum(a[1] for a in archived)
+    after = sum(a[2] for a in archived)
+    print(f"Archived {len(archived)} debates: {before / 1024:.0f} KB -> {after / 1024:.0f} KB"
+          + (f" ({after / before:.0%})" if before else ""))
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,52 @@
 import os
+import sys
 import datetime
 import json
+import threading
 from typing import Dict, List, Any, Optional
 
+from config import ROUND_LOG_FLUSH_EVERY
+from debate_store import DebateStore
+from debate_archive import ARCHIVE_EXTENSION
+
+ROUND_LOG_EXTENSION = ".jsonl"
+
+# Files a saved debate may exist as (transcript, compressed archive)
+SAVED_EXTENSIONS = (".json", ARCHIVE_EXTENSION)
+
 class DebateLogger:
     """
     Handles logging and saving debate transcripts with timestamps
+    
+    While a debate runs, every round, vote and rotation is appended to a
+    JSONL round log next to the transcript file, so a crash loses at most the
+    last unflushed batch and no write re-serializes earlier rounds. At the end
+    the round log is compacted into the JSON transcript the viewer reads.
+    With a database, saved debates are also written to SQLite.
     """
-    def __init__(self, output_dir: str = 'output', verbose: bool = True):
+    def __init__(self, output_dir: str = 'output', verbose: bool = True,
+                 flush_every: int = ROUND_LOG_FLUSH_EVERY, database: Optional[str] = None):
         """
         Initialize the debate logger
         
         Args:
             output_dir: Directory to store debate logs
             verbose: Whether to print full responses to console
+            flush_every: Round log records written between fsyncs
+            database: SQLite database that saved debates are also written to
         """
         self.verbose = verbose
         self.output_dir = output_dir
         self.timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_filename = None
+        self.flush_every = max(1, flush_every)
+        self.round_log_filename = None
+        self._round_log = None
+        self._unsynced_records = 0
+        self._round_log_lock = threading.Lock()
         self.ensure_output_dir()
+        self.database = database
+        self.store = DebateStore(database) if database else None
         
     def ensure_output_dir(self) -> None:
         """Create output directory if it doesn't exist"""
@@ -28,17 +55,159 @@ class DebateLogger:
             print(f"Created output directory: {self.output_dir}")
     
     def get_log_path(self, topic: str = "") -> str:
-        """Generate a log filename with timestamp and sanitized topic"""
+        """
+        Generate a log filename with timestamp and sanitized topic
+        
+        The name is reserved by creating the debate's round log right away,
+        so that concurrent debates started in the same second (e.g. from a
+        tournament) get distinct names; later ones receive a numeric suffix.
+        The JSON transcript itself is only written when the debate is saved.
+        """
+        if self.log_filename:
+            return self.log_filename
+        
         # Sanitize topic for filename
         sanitized_topic = "".join(c if c.isalnum() else "_" for c in topic)[:30]
         if sanitized_topic:
-            filename = f"debate_{sanitized_topic}_{self.timestamp}.json"
+            stem = f"debate_{sanitized_topic}_{self.timestamp}"
         else:
-            filename = f"debate_{self.timestamp}.json"
+            stem = f"debate_{self.timestamp}"
+        
+        suffix = 0
+        while True:
+            base = os.path.join(self.output_dir, stem if suffix == 0 else f"{stem}_{suffix}")
+            round_log_path = base + ROUND_LOG_EXTENSION
+            try:
+                # O_EXCL makes the existence check and creation atomic across processes
+                os.close(os.open(round_log_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+            except FileExistsError:
+                suffix += 1
+                continue
+            # A finished debate of the same name has already removed its round log
+            if any(os.path.exists(base + extension) for extension in SAVED_EXTENSIONS):
+                os.remove(round_log_path)
+                suffix += 1
+                continue
+            break
             
-        self.log_filename = os.path.join(self.output_dir, filename)
+        self.round_log_filename = round_log_path
+        self.log_filename = base + ".json"
         return self.log_filename
     
+    def start_round_log(self, topic: str, position_x: str, position_y: str, judges: List[str]) -> str:
+        """
+        Opens the append-only round log for a new debate
+        
+        Args:
+            topic: Debate topic
+            position_x: Name of the Position X agent
+            position_y: Name of the opening Position Y debater
+            judges: Names of the opening judges
+            
+        Returns:
+            str: Path of the round log
+        """
+        self.get_log_path(topic)
+        self._round_log = open(self.round_log_filename, 'a')
+        self._append_record({
+            "type": "start",
+            "topic": topic,
+            "position_x": position_x,
+            "position_y": position_y,
+            "judges": judges,
+            "timestamp": self.timestamp
+        }, sync=True)
+        return self.round_log_filename
+    
+    def resume_round_log(self, round_log_filename: str, size: int) -> None:
+        """
+        Reopens an interrupted debate's round log to continue appending
+        
+        Records written after the checkpoint (steps that will run again) are
+        cut off so they aren't duplicated.
+        
+        Args:
+            round_log_filename: Path of the round log
+            size: Length of the log when the checkpoint was taken
+        """
+        self.round_log_filename = round_log_filename
+        self._round_log = open(round_log_filename, 'a')
+        self._round_log.truncate(size)
+        self._unsynced_records = 0
+    
+    def round_log_size(self) -> int:
+        """Returns the number of bytes written to the round log so far"""
+        if self._round_log is None:
+            return 0
+        return os.fstat(self._round_log.fileno()).st_size
+    
+    def append_turn(self, round_num: int, position: str, name: str, statement: str) -> None:
+        """Appends one debater's statement as soon as it is made (for live viewers)"""
+        self._append_record({
+            "type": "turn",
+            "round": round_num,
+            "position": position,
+            "name": name,
+            "statement": statement
+        })
+    
+    def append_round(self, round_num: int, round_data: Dict) -> None:
+        """Appends a finished round (statements and timings) to the round log"""
+        data = {key: value for key, value in round_data.items() if key != "voting_results"}
+        self._append_record({"type": "round", "round": round_num, "data": data})
+    
+    def append_votes(self, round_num: int, voting_results: Dict) -> None:
+        """Appends a round's voting results to the round log"""
+        self._append_record({
+            "type": "votes",
+            "round": round_num,
+            "voting_results": self.format_voting_results(voting_results)
+        })
+    
+    def append_rotation(self, round_num: int, position_y: str, judges: List[str]) -> None:
+        """Appends a rotation (the new debater and judges) to the round log"""
+        self._append_record({"type": "rotation", "round": round_num, "position_y": position_y, "judges": judges})
+    
+    def _append_record(self, record: Dict, sync: bool = False) -> None:
+        """
+        Appends a record to the round log
+        
+        Each record is handed to the OS right away, so readers tailing the log
+        (the viewer's live stream) see it immediately; the fsync that makes
+        it durable is batched over flush_every records.
+        """
+        if self._round_log is None:
+            return
+        with self._round_log_lock:
+            try:
+                self._round_log.write(json.dumps(record) + "\n")
+                self._round_log.flush()
+                self._unsynced_records += 1
+            except OSError as e:
+                print(f"Error writing round log: {e}")
+                return
+        if sync or self._unsynced_records >= self.flush_every:
+            self.flush_round_log()
+    
+    def flush_round_log(self) -> None:
+        """Syncs the records written to the round log to disk"""
+        with self._round_log_lock:
+            if self._round_log is None or not self._unsynced_records:
+                return
+            try:
+                os.fsync(self._round_log.fileno())
+                self._unsynced_records = 0
+            except OSError as e:
+                print(f"Error writing round log: {e}")
+    
+    def close_round_log(self) -> None:
+        """Flushes and closes the round log"""
+        if self._round_log is None:
+            return
+        self.flush_round_log()
+        self._round_log.close()
+        self._round_log = None
+    
     def log_round(self, round_data: Dict, round_num: int, position_x_name: str, position_y_name: str) -> None:
         """
         Log a debate round to console
@@ -71,6 +240,27 @@ class DebateLogger:
             statement = round_data.get("position_y_statement", "No statement")
             print(f"{statement[:100]}..." if len(statement) > 100 else statement)
     
+    def log_token(self, token: str) -> None:
+        """
+        Print a streamed token to the console as soon as it arrives
+        
+        Args:
+            token: Chunk of generated text
+        """
+        sys.stdout.write(token)
+        sys.stdout.flush()
+    
+    def end_stream(self, timing: Dict) -> None:
+        """
+        Finish a streamed turn on the console with its timing
+        
+        Args:
+            timing: Timing recorded by the agent for the turn
+        """
+        ttft = timing.get("time_to_first_token")
+        ttft_text = f"{ttft:.2f}s" if ttft is not None else "n/a"
+        print(f"\n[first token: {ttft_text}, total: {timing.get('generation_time', 0):.2f}s]\n")
+    
     def log_votes(self, voting_results: Dict, current_position_y: str) -> None:
         """
         Log voting results to console
@@ -97,10 +287,47 @@ class DebateLogger:
                 print(f"  Vote: {'CONTINUE' if eval_data['continue_vote'] else 'REPLACE'}")
                 print(f"  Comments: {eval_data['comments']}")
     
+    @staticmethod
+    def format_voting_results(voting: Dict) -> Dict:
+        """
+        Converts voting results to the format stored in transcripts
+        
+        Args:
+            voting: Voting results from DebateManager.collect_votes
+            
+        Returns:
+            dict: Vote counts, one summary per judge evaluation and the judges' LLM call metrics
+        """
+        if "evaluations" in voting and voting["evaluations"] and "vote" in voting["evaluations"][0]:
+            return voting  # Already formatted
+        
+        formatted = {
+            "continue": voting["continue"],
+            "continue_votes": voting["continue_votes"],
+            "replace_votes": voting["replace_votes"],
+            "evaluations": []
+        }
+        
+        # Format each judge's evaluation
+        for eval_data in voting["evaluations"]:
+            formatted["evaluations"].append({
+                "judge_name": eval_data["judge_name"], 
+                "total_score": eval_data["total_score"],
+                "vote": "CONTINUE" if eval_data["continue_vote"] else "REPLACE",
+                "comments": eval_data["comments"],
+                "criteria_scores": eval_data.get("position_y_performance", {})
+            })
+        if "llm_calls" in voting:
+            formatted["llm_calls"] = voting["llm_calls"]
+        return formatted
+    
     def save_debate(self, debate_data: Dict) -> None:
         """
         Save debate transcript and results to a JSON file
         
+        If a round log is open, the end of the debate is appended to it and
+        the JSON transcript is produced by compacting the log.
+        
         Args:
             debate_data: Complete debate data including transcript and results
         """
@@ -112,25 +339,25 @@ class DebateLogger:
         # Format the transcript to ensure voting results are properly included
         for round_data in debate_data["transcript"]:
             if "voting_results" in round_data:
-                # Ensure voting results are properly formatted
-                voting = round_data["voting_results"]
-                round_data["voting_results"] = {
-                    "continue": voting["continue"],
-                    "continue_votes": voting["continue_votes"],
-                    "replace_votes": voting["replace_votes"],
-                    "evaluations": []
-                }
-                
-                # Format each judge's evaluation
-                for eval_data in voting["evaluations"]:
-                    judge_evaluation = {
-                        "judge_name": eval_data["judge_name"], 
-                        "total_score": eval_data["total_score"],
-                        "vote": "CONTINUE" if eval_data["continue_vote"] else "REPLACE",
-                        "comments": eval_data["comments"],
-                        "criteria_scores": eval_data.get("position_y_performance", {})
-                    }
-                    round_data["voting_results"]["evaluations"].append(judge_evaluation)
+                round_data["voting_results"] = self.format_voting_results(round_data["voting_results"])
+        
+        if self._round_log is not None:
+            self._append_record({
+                "type": "end",
+                "position_y_debaters": debate_data["position_y_debaters"],
+                "rounds": debate_data["rounds"],
+                "rotations": debate_data["rotations"],
+                "llm_calls": debate_data.get("llm_calls", [])
+            })
+            self.close_round_log()
+            try:
+                compacted = compact_round_log(self.round_log_filename, log_path)
+                os.remove(self.round_log_filename)
+                print(f"\nDebate saved to: {log_path}")
+                self.save_to_database(log_path, compacted)
+                return
+            except Exception as e:
+                print(f"Error compacting round log, saving transcript directly: {e}")
         
         try:
             with open(log_path, 'w') as f:
@@ -138,6 +365,35 @@ class DebateLogger:
             print(f"\nDebate saved to: {log_path}")
         except Exception as e:
             print(f"Error saving debate: {e}")
+            return
+        # The transcript is complete, so the round log (or the empty file that
+        # reserved the name) would only shadow it
+        self._remove_round_log()
+        self.save_to_database(log_path, debate_data)
+    
+    def _remove_round_log(self) -> None:
+        """Deletes the round log once the JSON transcript has been written"""
+        if self.round_log_filename and os.path.exists(self.round_log_filename):
+            try:
+                os.remove(self.round_log_filename)
+            except OSError as e:
+                print(f"Error removing round log: {e}")
+    
+    def save_to_database(self, log_path: str, debate_data: Dict) -> None:
+        """
+        Writes a saved debate to the database, if one is configured
+        
+        Args:
+            log_path: Path of the debate's JSON transcript
+            debate_data: The saved debate data
+        """
+        if not self.store:
+            return
+        try:
+            self.store.save_debate(os.path.basename(log_path), debate_data)
+            print(f"Debate stored in database: {self.database}")
+        except Exception as e:
+            print(f"Error writing debate to database: {e}")
     
     def print_debate_summary(self, results: Dict) -> None:
         """
@@ -155,3 +411,82 @@ class DebateLogger:
         
         if self.log_filename:
             print(f"\nFull transcript saved to: {self.log_filename}")
+
+def read_round_log(round_log_path: str) -> List[Dict]:
+    """
+    Reads the records of a round log
+    
+    A partially written last line (from a crash mid-write) is ignored.
+    
+    Args:
+        round_log_path: Path to a .jsonl round log
+        
+    Returns:
+        list: Records in the order they were written
+    """
+    records = []
+    with open(round_log_path, 'r') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return records
+
+def compact_round_log(round_log_path: str, output_path: Optional[str] = None) -> Dict:
+    """
+    Rebuilds the viewer's JSON transcript from a round log
+    
+    Works on logs from debates that did not finish: the transcript then
+    holds every round and vote that was flushed before the crash.
+    
+    Args:
+        round_log_path: Path to a .jsonl round log
+        output_path: Where to write the JSON transcript (default: same name with .json)
+        
+    Returns:
+        dict: Debate data in the format written by DebateLogger.save_debate
+    """
+    records = read_round_log(round_log_path)
+    if not records or records[0].get("type") != "start":
+        raise ValueError(f"{round_log_path} is not a debate round log")
+    start = records[0]
+    
+    transcript: List[Dict] = []
+    rounds_by_number: Dict[int, Dict] = {}
+    debaters = [start["position_y"]]
+    rotations = 0
+    end = None
+    for record in records[1:]:
+        kind = record.get("type")
+        if kind == "round":
+            round_data = dict(record["data"])
+            rounds_by_number[record["round"]] = round_data
+            transcript.append(round_data)
+        elif kind == "votes" and record["round"] in rounds_by_number:
+            rounds_by_number[record["round"]]["voting_results"] = record["voting_results"]
+        elif kind == "rotation":
+            rotations += 1
+            if record["position_y"] not in debaters:
+                debaters.append(record["position_y"])
+        elif kind == "end":
+            end = record
+    
+    debate_data = {
+        "topic": start["topic"],
+        "position_x": start["position_x"],
+        "position_y_debaters": end["position_y_debaters"] if end else debaters,
+        "rounds": end["rounds"] if end else len(transcript),
+        "rotations": end["rotations"] if end else rotations,
+        "transcript": transcript,
+        "timestamp": start["timestamp"]
+    }
+    if end and end.get("llm_calls"):
+        debate_data["llm_calls"] = end["llm_calls"]
+    
+    output_path = output_path or os.path.splitext(round_log_path)[0] + ".json"
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(debate_data, f, indent=2)
+    os.replace(tmp_path, output_path)
+    return debate_data
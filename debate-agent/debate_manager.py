@@ -1,9 +1,21 @@
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Optional
+import json
+import os
 import random
+from concurrent.futures import ThreadPoolExecutor
 from agent import Agent
 from timer import TimerSystem
 from debate_logger import DebateLogger
-from config import DEFAULT_ROUNDS, DEFAULT_STARTING_POSITION, MAX_ROTATION_COUNT
+from response_cache import ResponseCache
+from tracing import Tracer, NULL_TRACER, TRACE_EXTENSION
+from config import (
+    DEFAULT_ROUNDS, DEFAULT_STARTING_POSITION, MAX_ROTATION_COUNT,
+    DEFAULT_JUDGE_CONCURRENCY, DEFAULT_STREAM_RESPONSES, DEFAULT_ROLLING_SUMMARY,
+    DEFAULT_PIPELINE_ROUNDS, DEFAULT_PANEL_EVALUATION, DEFAULT_CHECKPOINTS, DEFAULT_TRACE
+)
+
+CHECKPOINT_EXTENSION = ".checkpoint"
+CHECKPOINT_VERSION = 1
 
 class DebateRound:
     """Represents a single round of debate"""
@@ -25,7 +37,19 @@ class DebateManager:
                  rounds: int = DEFAULT_ROUNDS, 
                  starting_position: str = DEFAULT_STARTING_POSITION,
                  verbose: bool = True,
-                 response_style: str = None):
+                 response_style: str = None,
+                 judge_concurrency: int = DEFAULT_JUDGE_CONCURRENCY,
+                 stream: bool = DEFAULT_STREAM_RESPONSES,
+                 prompt_layout: str = None,
+                 response_cache: ResponseCache = None,
+                 rolling_summary: bool = DEFAULT_ROLLING_SUMMARY,
+                 pipeline_rounds: bool = DEFAULT_PIPELINE_ROUNDS,
+                 judge_output: str = None,
+                 panel_evaluation: bool = DEFAULT_PANEL_EVALUATION,
+                 checkpoints: bool = DEFAULT_CHECKPOINTS,
+                 database: Optional[str] = None,
+                 trace: bool = DEFAULT_TRACE,
+                 logger: Optional[DebateLogger] = None):
         if len(position_y_agents) < 4:
             raise ValueError("Need at least 4 Position Y agents")
             
@@ -39,18 +63,56 @@ class DebateManager:
         self.current_position_y = position_y_agents[0]
         self.rotation_tracking[self.current_position_y.name] = True
         self.judges = position_y_agents[1:]
+        self.judge_concurrency = max(1, judge_concurrency or 1)
+        self.stream = stream
+        self.pipeline_rounds = pipeline_rounds
+        self.panel_evaluation = panel_evaluation
+        self.rolling_summary = rolling_summary
+        self.checkpoints = checkpoints
+        self.checkpoint_filename = None
+        self.tracer = Tracer() if trace else NULL_TRACER
+        self._resume: Optional[Dict] = None  # Checkpoint state to continue from
 
         
         self.timer = TimerSystem()
         self.speaking_order = [starting_position, "Y" if starting_position == "X" else "X"]
         self.debate_transcript = []
-        self.logger = DebateLogger(verbose=verbose)
+        self.logger = logger or DebateLogger(verbose=verbose, database=database)
         
         # Set response style for all agents if provided
         if response_style:
             position_x.response_style = response_style
             for agent in position_y_agents:
                 agent.response_style = response_style
+        
+        # Set prompt layout for all agents if provided
+        if prompt_layout:
+            position_x.prompt_layout = prompt_layout
+            for agent in position_y_agents:
+                agent.prompt_layout = prompt_layout
+        
+        # Share one response cache between all agents if provided
+        if response_cache:
+            position_x.response_cache = response_cache
+            for agent in position_y_agents:
+                agent.response_cache = response_cache
+        
+        # Set judge output mode for all judges if provided
+        if judge_output:
+            for agent in position_y_agents:
+                agent.judge_output = judge_output
+        
+        # Agents add their prompt build, LLM call and parse spans to the debate's trace
+        if trace:
+            position_x.tracer = self.tracer
+            for agent in position_y_agents:
+                agent.tracer = self.tracer
+        
+        # Summarize older rounds in the background while other agents speak
+        if rolling_summary:
+            position_x.enable_rolling_summary()
+            for agent in position_y_agents:
+                agent.enable_rolling_summary()
 
     def start_debate(self) -> Dict:
         """
@@ -59,48 +121,110 @@ class DebateManager:
         Returns:
             dict: Debate results and statistics
         """
-        print(f"=== Starting Debate: {self.topic} ===")
+        resume = self._resume
+        self._resume = None
+        if resume:
+            print(f"=== Resuming Debate: {self.topic} (after round {resume['round']}) ===")
+        else:
+            print(f"=== Starting Debate: {self.topic} ===")
         print(f"Position X: {self.position_x.name}")
         print(f"Position Y: {self.current_position_y.name}")
         print("Judges:", ", ".join([j.name for j in self.judges]))
         print("=" * 50)
         
+        if resume:
+            self.logger.resume_round_log(resume["round_log_filename"], resume["round_log_size"])
+        else:
+            self.logger.start_round_log(
+                self.topic, self.position_x.name, self.current_position_y.name, [j.name for j in self.judges]
+            )
+        if self.checkpoints:
+            self.checkpoint_filename = os.path.splitext(self.logger.log_filename)[0] + CHECKPOINT_EXTENSION
+        
         # Initialize debate with introduction
         intro_prompt = f"We are beginning a debate on the topic: {self.topic}. Please make your opening statement."
         
+        # Position X's next statement doesn't depend on the vote, so when X
+        # opens each round it can be generated while the judges evaluate
+        pipelined = self.pipeline_rounds and self.speaking_order[0] == "X"
+        next_x_turn = resume.get("next_x_turn") if resume else None
+        
+        # A checkpoint taken after a round's votes resumes with the next round;
+        # one taken before them resumes with that round's votes
+        if resume and resume["stage"] == "votes":
+            start_round = resume["round"] + 1
+        else:
+            start_round = resume["round"] if resume else 1
+        
         # Debate rounds
-        for round_num in range(1, self.rounds + 1):
-            print(f"\n--- Round {round_num} ---")
-            
-            # Run the debate round
-            round_result = self.debate_round(round_num, self.position_x, self.current_position_y)
-            self.debate_transcript.append(round_result)
-            
-            # Log the round using our logger
-            self.logger.log_round(
-                round_result, 
-                round_num, 
-                self.position_x.name, 
-                self.current_position_y.name
-            )
-            
-            # Collect votes from judges (except in the final round)
-            if round_num < self.rounds:
-                print("\n--- Judge Voting ---")
-                voting_results = self.collect_votes(round_num)
+        debate_span = self.tracer.span("debate", "debate", topic=self.topic, resumed=bool(resume))
+        with debate_span, ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline") as pipeline:
+            for round_num in range(start_round, self.rounds + 1):
+                with self.tracer.span("round", "debate", round=round_num):
+                    if resume and resume["stage"] == "round" and round_num == start_round:
+                        # Statements are already in the transcript; only the votes are missing
+                        round_result = self.debate_transcript[-1]
+                    else:
+                        print(f"\n--- Round {round_num} ---")
+                    
+                        # Run the debate round
+                        round_result = self.debate_round(
+                            round_num, self.position_x, self.current_position_y, x_turn=next_x_turn
+                        )
+                        next_x_turn = None
+                        self.debate_transcript.append(round_result)
+                        with self.tracer.span("save_round_log", "save", round=round_num):
+                            self.logger.append_round(round_num, round_result)
+                    
+                        # Log the round using our logger
+                        self.logger.log_round(
+                            round_result, 
+                            round_num, 
+                            self.position_x.name, 
+                            self.current_position_y.name
+                        )
+                        self.save_checkpoint(round_num, "round")
                 
-                # Store voting results in the round data
-                round_result["voting_results"] = voting_results
-                
-                # Log voting results
-                self.logger.log_votes(voting_results, self.current_position_y.name)
-                
-                # Handle rotation if needed
-                if not voting_results["continue"] and self.rotation_count < self.rotation_limit:
-                    print("\n--- Rotation ---")
-                    self.rotate_agents()
-                    print(f"New Position Y debater: {self.current_position_y.name}")
-                    print("New Judges:", ", ".join([j.name for j in self.judges]))
+                    # Collect votes from judges (except in the final round)
+                    if round_num < self.rounds:
+                        x_turn_future = None
+                        if pipelined:
+                            self.timer.reset()
+                            x_turn_future = pipeline.submit(self._position_x_turn, round_num + 1, self.position_x)
+                    
+                        print("\n--- Judge Voting ---")
+                        with self.tracer.span("votes", "vote", round=round_num):
+                            voting_results = self.collect_votes(round_num)
+                    
+                        # Store voting results in the round data
+                        round_result["voting_results"] = voting_results
+                    
+                        # Log voting results
+                        self.logger.log_votes(voting_results, self.current_position_y.name)
+                        with self.tracer.span("save_round_log", "save", round=round_num):
+                            self.logger.append_votes(round_num, voting_results)
+                    
+                        # Handle rotation if needed
+                        if not voting_results["continue"] and self.rotation_count < self.rotation_limit:
+                            print("\n--- Rotation ---")
+                            with self.tracer.span("rotation", "debate", round=round_num):
+                                self.rotate_agents()
+                            print(f"New Position Y debater: {self.current_position_y.name}")
+                            print("New Judges:", ", ".join([j.name for j in self.judges]))
+                            self.logger.append_rotation(
+                                round_num, self.current_position_y.name, [j.name for j in self.judges]
+                            )
+                    
+                        # Position X's memory already includes a pipelined turn, so it
+                        # must finish and be saved together with the votes
+                        if x_turn_future:
+                            with self.tracer.span("pipeline_wait", "debate", round=round_num + 1):
+                                next_x_turn = x_turn_future.result()
+                        self.save_checkpoint(round_num, "votes", next_x_turn)
+        
+        # Let background summaries finish so their calls are in llm_calls below
+        for agent in [self.position_x] + self.position_y_agents:
+            agent.memory.close()
         
         # Present final results
         print("\n=== Debate Concluded ===")
@@ -110,18 +234,232 @@ class DebateManager:
             "position_y_debaters": [name for name, debated in self.rotation_tracking.items() if debated],
             "rounds": self.rounds,
             "rotations": self.rotation_count,
-            "transcript": self.debate_transcript
+            "transcript": self.debate_transcript,
+            # Calls not attributed to a round (e.g. summaries that finished late)
+            "llm_calls": [
+                call for agent in [self.position_x] + self.position_y_agents
+                for call in agent.drain_call_metrics()
+            ]
         }
         
         # Save the debate results
-        self.logger.save_debate(debate_results)
+        with self.tracer.span("save_transcript", "save"):
+            self.logger.save_debate(debate_results)
+        self.remove_checkpoint()
         
         # Print summary
         self.logger.print_debate_summary(debate_results)
+        self.save_trace()
         
         return debate_results
 
-    def debate_round(self, round_num: int, position_x: Agent, debating_position_y: Agent) -> Dict:
+    def save_checkpoint(self, round_num: int, stage: str, next_x_turn: Optional[Dict] = None) -> None:
+        """
+        Persists everything needed to continue the debate after a crash
+        
+        Args:
+            round_num: Last round whose statements are complete
+            stage: "round" before that round's votes, "votes" after them
+            next_x_turn: Position X's already generated turn for the next round (pipelined)
+        """
+        if not self.checkpoints or not self.checkpoint_filename:
+            return
+        with self.tracer.span("save_checkpoint", "save", round=round_num, stage=stage):
+            self._write_checkpoint(round_num, stage, next_x_turn)
+
+    def _write_checkpoint(self, round_num: int, stage: str, next_x_turn: Optional[Dict]) -> None:
+        """Writes the checkpoint file atomically (see save_checkpoint)"""
+        # The round log must hold every step the checkpoint covers
+        self.logger.flush_round_log()
+        agents = [self.position_x] + self.position_y_agents
+        cache = self.position_x.response_cache
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "topic": self.topic,
+            "round": round_num,
+            "stage": stage,
+            "next_x_turn": next_x_turn,
+            "settings": {
+                "rounds": self.rounds,
+                "starting_position": self.speaking_order[0],
+                "verbose": self.logger.verbose,
+                "judge_concurrency": self.judge_concurrency,
+                "stream": self.stream,
+                "rolling_summary": self.rolling_summary,
+                "pipeline_rounds": self.pipeline_rounds,
+                "panel_evaluation": self.panel_evaluation,
+                "database": self.logger.database,
+                "trace": self.tracer.enabled,
+                "rotation_limit": self.rotation_limit,
+                "cache": cache.mode if cache else "off"
+            },
+            "agents": [
+                {
+                    "name": agent.name,
+                    "role_description": agent.role_description,
+                    "model": agent.model,
+                    "position": agent.position,
+                    "response_style": agent.response_style,
+                    "prompt_layout": agent.prompt_layout,
+                    "judge_output": agent.judge_output,
+                    "base_url": agent.llm.base_url,
+                    "state": agent.get_state()
+                }
+                for agent in agents
+            ],
+            "transcript": self.debate_transcript,
+            "rotation_tracking": self.rotation_tracking,
+            "rotation_count": self.rotation_count,
+            "current_position_y": self.current_position_y.name,
+            "judges": [judge.name for judge in self.judges],
+            "log_filename": self.logger.log_filename,
+            "timestamp": self.logger.timestamp,
+            "round_log_filename": self.logger.round_log_filename,
+            "round_log_size": self.logger.round_log_size()
+        }
+        
+        tmp_path = f"{self.checkpoint_filename}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.checkpoint_filename)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error saving checkpoint: {e}")
+
+    def save_trace(self) -> None:
+        """Writes the Chrome trace next to the transcript and prints where the time went (when tracing)"""
+        if not self.tracer.enabled or not self.logger.log_filename:
+            return
+        trace_path = os.path.splitext(self.logger.log_filename)[0] + TRACE_EXTENSION
+        try:
+            self.tracer.save(trace_path, {"topic": self.topic, "transcript": os.path.basename(self.logger.log_filename)})
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error saving trace: {e}")
+            return
+        self.tracer.print_summary()
+        print(f"\nTrace saved to: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    def remove_checkpoint(self) -> None:
+        """Deletes the checkpoint once the debate has been saved"""
+        if self.checkpoint_filename and os.path.exists(self.checkpoint_filename):
+            os.remove(self.checkpoint_filename)
+
+    def load_checkpoint(self, state: Dict) -> None:
+        """
+        Restores debate and agent state so start_debate continues from it
+        
+        Args:
+            state: Checkpoint data written by save_checkpoint
+        """
+        agents = {agent.name: agent for agent in [self.position_x] + self.position_y_agents}
+        for agent_data in state["agents"]:
+            agents[agent_data["name"]].load_state(agent_data["state"])
+        
+        self.debate_transcript = state["transcript"]
+        self.rotation_tracking = state["rotation_tracking"]
+        self.rotation_count = state["rotation_count"]
+        self.current_position_y = agents[state["current_position_y"]]
+        self.judges = [agents[name] for name in state["judges"]]
+        
+        self.logger.log_filename = state["log_filename"]
+        self.logger.timestamp = state["timestamp"]
+        self._resume = state
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path: str) -> 'DebateManager':
+        """
+        Rebuilds a debate from a checkpoint file
+        
+        Args:
+            checkpoint_path: Path to a .checkpoint file
+            
+        Returns:
+            DebateManager: Manager whose start_debate continues the debate
+        """
+        with open(checkpoint_path, 'r') as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {state.get('version')}")
+        
+        # The checkpoint sits next to the transcript and round log, so find
+        # them there rather than relative to the current directory
+        output_dir = os.path.dirname(checkpoint_path)
+        for key in ("log_filename", "round_log_filename"):
+            state[key] = os.path.join(output_dir, os.path.basename(state[key]))
+        
+        settings = state["settings"]
+        agents = [
+            Agent(
+                name=data["name"],
+                role_description=data["role_description"],
+                model=data["model"],
+                position=data["position"],
+                topic=state["topic"],
+                response_style=data["response_style"],
+                prompt_layout=data["prompt_layout"],
+                base_url=data["base_url"],
+                judge_output=data["judge_output"]
+            )
+            for data in state["agents"]
+        ]
+        manager = cls(
+            position_x=agents[0],
+            position_y_agents=agents[1:],
+            topic=state["topic"],
+            rounds=settings["rounds"],
+            starting_position=settings["starting_position"],
+            verbose=settings["verbose"],
+            judge_concurrency=settings["judge_concurrency"],
+            stream=settings["stream"],
+            response_cache=ResponseCache(mode=settings["cache"]) if settings["cache"] != "off" else None,
+            rolling_summary=settings["rolling_summary"],
+            pipeline_rounds=settings["pipeline_rounds"],
+            panel_evaluation=settings["panel_evaluation"],
+            trace=settings.get("trace", False),
+            logger=DebateLogger(output_dir=output_dir or ".", verbose=settings["verbose"],
+                                database=settings.get("database"))
+        )
+        manager.rotation_limit = settings["rotation_limit"]
+        manager.load_checkpoint(state)
+        return manager
+
+    def _round_prompts(self, round_num: int) -> Tuple[str, str]:
+        """Returns the (Position X, Position Y) prompts for a round"""
+        if round_num == 1:
+            x_prompt = f"This is round 1 of our debate on '{self.topic}'. Please make your opening statement."
+            y_prompt = f"This is round 1 of our debate on '{self.topic}'. Your opponent made the following opening statement. Please respond with your opening statement:"
+        else:
+            x_prompt = f"This is round {round_num} of our debate. Please continue your arguments based on the previous exchanges."
+            y_prompt = f"This is round {round_num} of our debate. Please continue your arguments based on the previous exchanges."
+        return x_prompt, y_prompt
+
+    def _position_x_turn(self, round_num: int, position_x: Agent) -> Dict:
+        """
+        Runs Position X's turn for a round
+        
+        Args:
+            round_num: Round number
+            position_x: Position X agent
+            
+        Returns:
+            dict: Position X's statement, timing and LLM call metrics, as stored in the round data
+        """
+        x_prompt, _ = self._round_prompts(round_num)
+        print(f"Position X ({position_x.name}) is speaking...")
+        with self.tracer.span("turn", "turn", round=round_num, position="X", speaker=position_x.name):
+            limited_response = self._take_turn(position_x, x_prompt)
+        self.logger.append_turn(round_num, "X", position_x.name, limited_response)
+        print(f"Position X: {limited_response[:100]}...\n")
+        return {
+            "position_x_statement": limited_response,
+            "position_x_timing": position_x.last_response_timing,
+            "position_x_llm_calls": position_x.drain_call_metrics()
+        }
+
+    def debate_round(self, round_num: int, position_x: Agent, debating_position_y: Agent,
+                     x_turn: Optional[Dict] = None) -> Dict:
         """
         Manages a single round of debate exchange
         
@@ -129,46 +467,65 @@ class DebateManager:
             round_num: Current round number
             position_x: Position X agent
             debating_position_y: Current Position Y debater
+            x_turn: Position X's turn if it was already generated (pipelined rounds)
             
         Returns:
             dict: Round results including statements from both positions
         """
         round_data = {"round": round_num}
-        self.timer.reset()
+        if x_turn is None:
+            self.timer.reset()
         
         # Store agent names in round data
         round_data["position_x_name"] = position_x.name
         round_data["position_y_name"] = debating_position_y.name
         
         # Generate debate prompts based on round number
-        if round_num == 1:
-            x_prompt = f"This is round 1 of our debate on '{self.topic}'. Please make your opening statement."
-            y_prompt = f"This is round 1 of our debate on '{self.topic}'. Your opponent made the following opening statement. Please respond with your opening statement:"
-        else:
-            x_prompt = f"This is round {round_num} of our debate. Please continue your arguments based on the previous exchanges."
-            y_prompt = f"This is round {round_num} of our debate. Please continue your arguments based on the previous exchanges."
+        _, y_prompt = self._round_prompts(round_num)
         
         # Follow the speaking order
         for position in self.speaking_order:
             if position == "X":
-                print(f"Position X ({position_x.name}) is speaking...")
-                response = position_x.send_message(x_prompt, self.debate_transcript)
-                limited_response = self.timer.enforce_limits(response)
-                round_data["position_x_statement"] = limited_response
-                print(f"Position X: {limited_response[:100]}...\n")
+                round_data.update(x_turn or self._position_x_turn(round_num, position_x))
                 
                 # Update prompt for Position Y to include X's statement
-                y_prompt += f"\n\nPosition X's statement: {limited_response}"
+                y_prompt += f"\n\nPosition X's statement: {round_data['position_x_statement']}"
                 
             else:  # position == "Y"
                 print(f"Position Y ({debating_position_y.name}) is speaking...")
-                response = debating_position_y.send_message(y_prompt, self.debate_transcript)
-                limited_response = self.timer.enforce_limits(response)
+                with self.tracer.span("turn", "turn", round=round_num, position="Y",
+                                      speaker=debating_position_y.name):
+                    limited_response = self._take_turn(debating_position_y, y_prompt)
+                self.logger.append_turn(round_num, "Y", debating_position_y.name, limited_response)
                 round_data["position_y_statement"] = limited_response
+                round_data["position_y_timing"] = debating_position_y.last_response_timing
+                round_data["position_y_llm_calls"] = debating_position_y.drain_call_metrics()
                 print(f"Position Y: {limited_response[:100]}...\n")
         
         return round_data
 
+    def _take_turn(self, speaker: Agent, prompt: str) -> str:
+        """
+        Gets a speaker's statement, streaming it to the console when enabled
+        
+        Args:
+            speaker: Agent taking the turn
+            prompt: Prompt for the turn
+            
+        Returns:
+            str: Statement after time limits are enforced
+        """
+        on_token = self.logger.log_token if self.stream else None
+        response = speaker.send_message(prompt, self.debate_transcript, on_token=on_token)
+        if self.stream:
+            self.logger.end_stream(speaker.last_response_timing)
+        return self.timer.enforce_limits(
+            response,
+            echo=not self.stream,
+            model=speaker.model,
+            reported_tokens=speaker.last_generation_info.get("eval_count")
+        )
+
     def collect_votes(self, round_num: int) -> Dict:
         """
         Collects and tallies votes from judges
@@ -183,11 +540,9 @@ class DebateManager:
         continue_votes = 0
         replace_votes = 0
  
+        evaluations = self._run_judge_evaluations(round_num)
         
-        for judge in self.judges:
-            print(f"Judge {judge.name} is evaluating...")
-            evaluation = judge.vote(self.debate_transcript, round_num)
-            
+        for judge, evaluation in zip(self.judges, evaluations):
             # Add judge name to the evaluation data
             evaluation["judge_name"] = judge.name
             
@@ -220,8 +575,78 @@ class DebateManager:
             "continue_votes": continue_votes,
             "replace_votes": replace_votes,
             "evaluations": votes,
+            "llm_calls": [call for judge in self.judges for call in judge.drain_call_metrics()]
         }
 
+    def _run_judge_evaluations(self, round_num: int) -> List[Dict]:
+        """
+        Runs every judge's evaluation of a round, concurrently when allowed
+        
+        Args:
+            round_num: Round number being evaluated
+            
+        Returns:
+            list: One evaluation per judge, in the same order as self.judges
+        """
+        for judge in self.judges:
+            print(f"Judge {judge.name} is evaluating...")
+        
+        if self.panel_evaluation:
+            return self._run_panel_evaluations(round_num)
+        return self._vote_individually(self.judges, round_num)
+
+    def _vote_individually(self, judges: List[Agent], round_num: int) -> List[Dict]:
+        """Has each judge vote separately, using up to judge_concurrency threads"""
+        def vote(judge: Agent) -> Dict:
+            with self.tracer.span("vote", "vote", round=round_num, judge=judge.name):
+                return judge.vote(self.debate_transcript, round_num)
+        
+        workers = min(self.judge_concurrency, len(judges))
+        if workers <= 1:
+            return [vote(judge) for judge in judges]
+        
+        # Judges only read the transcript, so they can evaluate in parallel;
+        # map() keeps results in judge order regardless of completion order
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="judge") as executor:
+            return list(executor.map(vote, judges))
+
+    def _run_panel_evaluations(self, round_num: int) -> List[Dict]:
+        """
+        Evaluates a round with one batched request per model shared by the judges
+        
+        Judges on the same model get identical evaluation prompts, so the first
+        judge of each group asks for the whole group's evaluations at once.
+        Judges whose evaluation is missing or invalid then vote on their own.
+        
+        Args:
+            round_num: Round number being evaluated
+            
+        Returns:
+            list: One evaluation per judge, in the same order as self.judges
+        """
+        evaluations: List[Optional[Dict]] = [None] * len(self.judges)
+        
+        groups: Dict[str, List[int]] = {}
+        for i, judge in enumerate(self.judges):
+            groups.setdefault(judge.model, []).append(i)
+        
+        for indices in groups.values():
+            if len(indices) < 2:
+                continue
+            lead = self.judges[indices[0]]
+            with self.tracer.span("panel_vote", "vote", round=round_num, judges=len(indices), model=lead.model):
+                panel = lead.panel_vote(self.debate_transcript, round_num, len(indices))
+            for i, evaluation in zip(indices, panel):
+                evaluations[i] = evaluation
+        
+        missing = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        if missing:
+            individual = self._vote_individually([self.judges[i] for i in missing], round_num)
+            for i, evaluation in zip(missing, individual):
+                evaluations[i] = evaluation
+        
+        return evaluations
+
     def rotate_agents(self) -> None:
         """
         Rotates Position Y agents based on voting results
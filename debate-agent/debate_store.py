@@ -0,0 +1,200 @@
+import os
+import json
+import sqlite3
+from typing import Any, Dict, List
+
+from debate_archive import ARCHIVE_EXTENSION, debate_filenames, read_archive
+
+# Seconds a writer waits for another process (e.g. a tournament worker) to commit
+DATABASE_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS debates (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    topic TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    position_x TEXT NOT NULL,
+    position_y_debaters TEXT NOT NULL,
+    rounds INTEGER NOT NULL,
+    rotations INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS debaters (
+    debate_id INTEGER NOT NULL REFERENCES debates(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    position TEXT NOT NULL,
+    PRIMARY KEY (debate_id, name)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    debate_id INTEGER NOT NULL REFERENCES debates(id) ON DELETE CASCADE,
+    round INTEGER NOT NULL,
+    position_x_name TEXT,
+    position_y_name TEXT,
+    position_x_statement TEXT,
+    position_y_statement TEXT,
+    continued INTEGER,
+    continue_votes INTEGER,
+    replace_votes INTEGER,
+    replaced INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (debate_id, round)
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    debate_id INTEGER NOT NULL REFERENCES debates(id) ON DELETE CASCADE,
+    round INTEGER NOT NULL,
+    judge_name TEXT NOT NULL,
+    position_y_name TEXT,
+    total_score REAL,
+    vote TEXT,
+    comments TEXT,
+    criteria_scores TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_debates_topic ON debates(topic, timestamp);
+CREATE INDEX IF NOT EXISTS idx_debates_timestamp ON debates(timestamp);
+CREATE INDEX IF NOT EXISTS idx_debaters_name ON debaters(name, debate_id);
+CREATE INDEX IF NOT EXISTS idx_rounds_replaced ON rounds(position_y_name, replaced, debate_id);
+CREATE INDEX IF NOT EXISTS idx_evaluations_judge ON evaluations(judge_name, debate_id);
+CREATE INDEX IF NOT EXISTS idx_evaluations_debate ON evaluations(debate_id, round);
+"""
+
+class DebateStore:
+    """
+    SQLite copy of saved debates: one row per debate, debater, round and evaluation
+
+    The JSON transcripts stay the viewer's source; the database adds indexes
+    on topic, timestamp, debater and judge so questions such as "debates
+    where a debater was replaced" don't need a scan over every file. WAL
+    mode lets several tournament workers write while the viewer reads.
+    """
+    def __init__(self, path: str):
+        """
+        Opens (and if needed creates) the database
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=DATABASE_TIMEOUT)
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def save_debate(self, filename: str, debate_data: Dict[str, Any]) -> None:
+        """
+        Writes a debate in one transaction, replacing an earlier copy of the same file
+
+        Args:
+            filename: Name of the debate's JSON transcript
+            debate_data: Debate data in the format written by DebateLogger.save_debate
+        """
+        transcript = debate_data.get("transcript", [])
+        debaters = {debate_data["position_x"]: "X"}
+        rounds = []
+        evaluations = []
+        # The first `rotations` rejected rounds are the ones that rotated a
+        # debater out (later rejections happen once the rotation limit is hit)
+        rotations_left = debate_data.get("rotations", 0)
+        for round_data in transcript:
+            round_num = round_data["round"]
+            position_y_name = round_data.get("position_y_name")
+            if position_y_name:
+                debaters.setdefault(position_y_name, "Y")
+            voting = round_data.get("voting_results")
+            replaced = False
+            if voting and not voting.get("continue") and rotations_left > 0:
+                replaced = True
+                rotations_left -= 1
+            rounds.append((
+                round_num,
+                round_data.get("position_x_name"),
+                position_y_name,
+                round_data.get("position_x_statement"),
+                round_data.get("position_y_statement"),
+                int(voting["continue"]) if voting else None,
+                voting.get("continue_votes") if voting else None,
+                voting.get("replace_votes") if voting else None,
+                int(replaced)
+            ))
+            for evaluation in (voting or {}).get("evaluations", []):
+                debaters.setdefault(evaluation["judge_name"], "Y")
+                evaluations.append((
+                    round_num,
+                    evaluation["judge_name"],
+                    position_y_name,
+                    evaluation.get("total_score"),
+                    evaluation.get("vote"),
+                    evaluation.get("comments"),
+                    json.dumps(evaluation.get("criteria_scores", {}))
+                ))
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM debates WHERE filename = ?", (filename,))
+            debate_id = conn.execute(
+                "INSERT INTO debates (filename, topic, timestamp, position_x, position_y_debaters, rounds, rotations) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    filename,
+                    debate_data["topic"],
+                    debate_data.get("timestamp", ""),
+                    debate_data["position_x"],
+                    json.dumps(debate_data.get("position_y_debaters", [])),
+                    debate_data.get("rounds", len(transcript)),
+                    debate_data.get("rotations", 0)
+                )
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO debaters (debate_id, name, position) VALUES (?, ?, ?)",
+                [(debate_id, name, position) for name, position in debaters.items()]
+            )
+            conn.executemany(
+                "INSERT INTO rounds (debate_id, round, position_x_name, position_y_name, position_x_statement, "
+                "position_y_statement, continued, continue_votes, replace_votes, replaced) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(debate_id,) + row for row in rounds]
+            )
+            conn.executemany(
+                "INSERT INTO evaluations (debate_id, round, judge_name, position_y_name, total_score, vote, "
+                "comments, criteria_scores) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(debate_id,) + row for row in evaluations]
+            )
+        conn.close()
+
+    def import_directory(self, output_dir: str) -> List[str]:
+        """
+        Imports the transcripts (JSON or archives) in a directory that aren't in the database yet
+
+        Args:
+            output_dir: Debate output directory
+
+        Returns:
+            list: Filenames that were imported
+        """
+        with self._connect() as conn:
+            known = {row[0] for row in conn.execute("SELECT filename FROM debates")}
+        conn.close()
+
+        # A debate archived after it was stored is the same debate under a new name
+        known_stems = {os.path.splitext(filename)[0] for filename in known}
+
+        imported = []
+        for filename in debate_filenames(os.listdir(output_dir)):
+            if os.path.splitext(filename)[0] in known_stems:
+                continue
+            path = os.path.join(output_dir, filename)
+            try:
+                if filename.endswith(ARCHIVE_EXTENSION):
+                    debate_data = read_archive(path)
+                else:
+                    with open(path, 'r') as f:
+                        debate_data = json.load(f)
+                self.save_debate(filename, debate_data)
+                imported.append(filename)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Skipping {filename}: {e}")
+        return imported
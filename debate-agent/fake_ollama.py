@@ -0,0 +1,286 @@
+from typing import Any, Dict, List, Optional
+import argparse
+import datetime
+import json
+import math
+import random
+import threading
+import time
+import http.server
+import socketserver
+
+from config import JUDGING_CRITERIA
+
+LATENCY_DISTRIBUTIONS = ["fixed", "uniform", "normal", "lognormal"]
+
+DEFAULT_DEBATE_RESPONSES = [
+    "The evidence you cite does not support your conclusion. Consider the strongest counterexample: "
+    "if your premise were true, we would expect to observe consistent outcomes, yet the record shows otherwise. "
+    "Your argument relies on an assumption you have not defended.",
+    "I disagree with the framing of your last point. The question is not whether the effect exists, "
+    "but whether it is large enough to matter. Three independent lines of reasoning suggest it is not, "
+    "and you have not addressed any of them.",
+    "Let me return to the central question. Both of us accept the basic facts; we differ on what follows. "
+    "My position follows directly from principles you have already conceded earlier in this debate.",
+]
+
+class FakeOllamaSettings:
+    """
+    Latency and content settings for the fake server
+
+    Args:
+        latency_mean: Mean total seconds per response
+        latency_jitter: Spread of the distribution (seconds; sigma for lognormal)
+        distribution: One of LATENCY_DISTRIBUTIONS
+        first_token_fraction: Share of the latency spent before the first token
+        responses: Canned debate responses, cycled through in order
+        models: Model names reported by /api/tags
+        seed: Random seed for reproducible latencies and scores
+    """
+    def __init__(self,
+                 latency_mean: float = 0.0,
+                 latency_jitter: float = 0.0,
+                 distribution: str = "fixed",
+                 first_token_fraction: float = 0.3,
+                 responses: Optional[List[str]] = None,
+                 models: Optional[List[str]] = None,
+                 seed: Optional[int] = None):
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Invalid distribution '{distribution}'. Available: {LATENCY_DISTRIBUTIONS}")
+        self.latency_mean = latency_mean
+        self.latency_jitter = latency_jitter
+        self.distribution = distribution
+        self.first_token_fraction = first_token_fraction
+        self.responses = responses or DEFAULT_DEBATE_RESPONSES
+        self.models = models or ["llama3:latest"]
+        self.random = random.Random(seed)
+
+    def sample_latency(self) -> float:
+        """Draws one response latency in seconds"""
+        mean, jitter = self.latency_mean, self.latency_jitter
+        if self.distribution == "uniform":
+            value = self.random.uniform(mean - jitter, mean + jitter)
+        elif self.distribution == "normal":
+            value = self.random.gauss(mean, jitter)
+        elif self.distribution == "lognormal":
+            # Parameterised so the distribution's mean equals latency_mean
+            if mean <= 0:
+                return 0.0
+            mu = math.log(mean) - jitter ** 2 / 2
+            value = self.random.lognormvariate(mu, jitter)
+        else:
+            value = mean
+        return max(0.0, value)
+
+class FakeOllamaHandler(http.server.BaseHTTPRequestHandler):
+    """Serves the subset of the Ollama API used by the debate agents"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            models = [{"name": m, "model": m, "size": 0, "digest": ""} for m in self.server.settings.models]
+            self.send_json({"models": models})
+        elif self.path == "/api/version":
+            self.send_json({"version": "0.0.0-fake"})
+        else:
+            self.send_json({"error": "not found"}, status=404)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json({"error": "invalid JSON"}, status=400)
+            return
+
+        if self.path == "/api/generate":
+            self.handle_generate(request)
+        elif self.path == "/api/pull":
+            self.send_json({"status": "success"})
+        else:
+            self.send_json({"error": "not found"}, status=404)
+
+    def send_json(self, data: Dict, status: int = 200) -> None:
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _response_text(self, prompt: str, response_format: Any = None) -> str:
+        """Picks a canned answer: an evaluation for judge prompts, a statement otherwise"""
+        settings = self.server.settings
+        if isinstance(response_format, dict):
+            return json.dumps(self._fill_schema(response_format))
+        if "REQUIRED EVALUATION FORMAT" in prompt:
+            lines = [f"{c.replace('_', ' ').title()}: {settings.random.randint(1, 5)}" for c in JUDGING_CRITERIA]
+            lines.append("")
+            lines.append("Comments: The challenger engaged with the main argument but left key claims unsupported.")
+            return "\n".join(lines)
+        return settings.responses[self.server.next_response_index() % len(settings.responses)]
+
+    def _fill_schema(self, schema: Dict) -> Any:
+        """Builds a value matching a (simple) JSON schema, for constrained requests"""
+        settings = self.server.settings
+        schema_type = schema.get("type")
+        if schema_type == "object":
+            return {field: self._fill_schema(sub) for field, sub in schema.get("properties", {}).items()}
+        if schema_type == "array":
+            count = schema.get("minItems", 1)
+            return [self._fill_schema(schema.get("items", {})) for _ in range(count)]
+        if schema_type == "integer":
+            return settings.random.randint(schema.get("minimum", 1), schema.get("maximum", 5))
+        return "The challenger engaged with the main argument but left key claims unsupported."
+
+    def handle_generate(self, request: Dict) -> None:
+        """Streams a canned response as NDJSON, like Ollama's /api/generate"""
+        settings = self.server.settings
+        prompt = request.get("prompt", "")
+        model = request.get("model", settings.models[0])
+        text = self._response_text(prompt, request.get("format"))
+        num_predict = (request.get("options") or {}).get("num_predict")
+
+        # Whitespace-preserving word chunks stand in for tokens
+        words = text.split(" ")
+        tokens = [word + " " for word in words[:-1]] + words[-1:]
+        if num_predict and num_predict > 0:
+            tokens = tokens[:num_predict]
+
+        latency = settings.sample_latency()
+        self.server.record_latency(latency)
+        first_token_delay = latency * settings.first_token_fraction
+        per_token_delay = (latency - first_token_delay) / max(1, len(tokens))
+        start = time.perf_counter()
+
+        created_at = datetime.datetime.now(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+        stream = request.get("stream", True)
+
+        time.sleep(first_token_delay)
+        if not stream:
+            time.sleep(per_token_delay * len(tokens))
+            self.send_json(self._final_chunk(model, created_at, prompt, tokens, start, "".join(tokens)))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(per_token_delay)
+            self._write_chunk({"model": model, "created_at": created_at, "response": token, "done": False})
+        self._write_chunk(self._final_chunk(model, created_at, prompt, tokens, start, ""))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _final_chunk(self, model: str, created_at: str, prompt: str, tokens: List[str],
+                     start: float, response: str) -> Dict:
+        total_ns = int((time.perf_counter() - start) * 1e9)
+        return {
+            "model": model,
+            "created_at": created_at,
+            "response": response,
+            "done": True,
+            "done_reason": "stop",
+            "total_duration": total_ns,
+            "load_duration": 0,
+            "prompt_eval_count": len(prompt.split()),
+            "prompt_eval_duration": int(total_ns * self.server.settings.first_token_fraction),
+            "eval_count": len(tokens),
+            "eval_duration": int(total_ns * (1 - self.server.settings.first_token_fraction)),
+        }
+
+    def _write_chunk(self, data: Dict) -> None:
+        line = json.dumps(data).encode('utf-8') + b"\n"
+        self.wfile.write(f"{len(line):x}\r\n".encode('ascii') + line + b"\r\n")
+        self.wfile.flush()
+
+class FakeOllamaServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """Threaded fake Ollama server that keeps simple request statistics"""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, settings: FakeOllamaSettings):
+        super().__init__(address, FakeOllamaHandler)
+        self.settings = settings
+        self._stats_lock = threading.Lock()
+        self._response_index = 0
+        self.request_count = 0
+        self.total_latency = 0.0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_response_index(self) -> int:
+        with self._stats_lock:
+            self._response_index += 1
+            return self._response_index - 1
+
+    def record_latency(self, latency: float) -> None:
+        with self._stats_lock:
+            self.request_count += 1
+            self.total_latency += latency
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.request_count = 0
+            self.total_latency = 0.0
+
+def start_fake_ollama(settings: Optional[FakeOllamaSettings] = None,
+                      host: str = "127.0.0.1", port: int = 0) -> FakeOllamaServer:
+    """
+    Starts a fake Ollama server on a background thread
+
+    Args:
+        settings: Latency and content settings
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        FakeOllamaServer: Running server; call shutdown() to stop it
+    """
+    server = FakeOllamaServer((host, port), settings or FakeOllamaSettings())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake Ollama server for benchmarks')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=11500, help='Port to listen on')
+    parser.add_argument('--latency-mean', type=float, default=0.5, help='Mean seconds per response')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help='Latency spread (sigma for lognormal)')
+    parser.add_argument('--distribution', choices=LATENCY_DISTRIBUTIONS, default='fixed', help='Latency distribution')
+    parser.add_argument('--model', action='append', help='Model name to report as installed (repeatable)')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    args = parser.parse_args()
+
+    settings = FakeOllamaSettings(
+        latency_mean=args.latency_mean,
+        latency_jitter=args.latency_jitter,
+        distribution=args.distribution,
+        models=args.model,
+        seed=args.seed
+    )
+    server = FakeOllamaServer((args.host, args.port), settings)
+    print(f"Fake Ollama running at {server.base_url}")
+    print("Press Ctrl+C to stop the server")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down server...")
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,15 @@ from agent import Agent
 from debate_manager import DebateManager
 import argparse
 from config_loader import load_config
+from config import (
+    DEFAULT_JUDGE_CONCURRENCY, DEFAULT_STREAM_RESPONSES, PROMPT_LAYOUTS,
+    DEFAULT_RESPONSE_CACHE_MODE, DEFAULT_ROLLING_SUMMARY, DEFAULT_PIPELINE_ROUNDS,
+    JUDGE_OUTPUT_MODES, DEFAULT_PANEL_EVALUATION, DEFAULT_DATABASE_PATH, DEFAULT_TRACE
+)
+from response_cache import ResponseCache, CACHE_MODES
+from model_registry import ensure_models_available
+from debate_logger import compact_round_log
+from debate_store import DebateStore
 import os
 import sys
 
@@ -17,6 +26,13 @@ def create_agents_from_config(config):
     """
     topic = config["topic"]
     
+    # Check every distinct model once (pulling missing ones in parallel)
+    # so the agents below don't block on repeated availability checks
+    ensure_models_available(
+        [config["position_x"].get("model", "llama3:latest")] +
+        [pos_y.get("model", "llama3:latest") for pos_y in config["position_y"]]
+    )
+    
     # Create Position X agent
     position_x_config = config["position_x"]
     position_x_agent = Agent(
@@ -105,6 +121,9 @@ When responding, maintain a respectful tone while firmly defending your position
     
     selected_topic = topics[topic_choice]
     
+    # All example agents share one model; check it once up front
+    ensure_models_available(["llama3"])
+    
     # Create Position X agent
     position_x_agent = Agent(
         name=f"{selected_topic['position_x']} Advocate",
@@ -141,10 +160,42 @@ def main():
     parser.add_argument('--topic', type=int, help='Select debate topic (1-3)')
     parser.add_argument('--rounds', type=int, help='Number of debate rounds')
     parser.add_argument('--verbose', action='store_true', help='Print full agent responses to console')
+    parser.add_argument('--stream', action='store_true', help='Stream agent responses to the console as they are generated')
+    parser.add_argument('--prompt-layout', choices=PROMPT_LAYOUTS, help='Prompt assembly mode ("stable" reuses the model\'s prompt cache)')
+    parser.add_argument('--cache', choices=CACHE_MODES, help='LLM response cache mode ("replay" serves cached responses without calling Ollama)')
+    parser.add_argument('--rolling-summary', action='store_true', help='Summarize older rounds with the LLM in the background')
+    parser.add_argument('--pipeline', action='store_true', help='Start Position X\'s next turn while judges are voting')
+    parser.add_argument('--judge-output', choices=JUDGE_OUTPUT_MODES, help='Judge answer format ("json" uses schema-constrained output)')
+    parser.add_argument('--panel-evaluation', action='store_true', help='Score each round for all judges in one batched request')
+    parser.add_argument('--trace', action='store_true', help='Write a Chrome trace of the debate (<debate>.trace) and print where the time went')
+    parser.add_argument('--compact', type=str, metavar='ROUND_LOG', help='Compact a .jsonl round log into a JSON transcript and exit')
+    parser.add_argument('--resume', type=str, metavar='CHECKPOINT', help='Continue an interrupted debate from its .checkpoint file')
+    parser.add_argument('--database', type=str, nargs='?', const=DEFAULT_DATABASE_PATH, metavar='PATH',
+                        help=f'Also store debates in a SQLite database (default path: {DEFAULT_DATABASE_PATH})')
+    parser.add_argument('--import-debates', type=str, metavar='OUTPUT_DIR', help='Import saved JSON debates into the --database and exit')
     parser.add_argument('--config', type=str, help='Path to custom configuration file')
     parser.add_argument('--use-config', action='store_true', help='Use configuration from input.json')
     args = parser.parse_args()
     
+    # Rebuild a transcript from an interrupted debate's round log
+    if args.compact:
+        debate_data = compact_round_log(args.compact)
+        print(f"Compacted {len(debate_data['transcript'])} rounds into: {os.path.splitext(args.compact)[0]}.json")
+        return
+    
+    # Load previously saved transcripts into the database
+    if args.import_debates:
+        store = DebateStore(args.database or DEFAULT_DATABASE_PATH)
+        imported = store.import_directory(args.import_debates)
+        print(f"Imported {len(imported)} debates into: {store.path}")
+        return
+    
+    # Continue an interrupted debate with the agents and settings it was started with
+    if args.resume:
+        debate_manager = DebateManager.from_checkpoint(args.resume)
+        debate_manager.start_debate()
+        return
+    
     # Determine whether to use config file or example debates
     if args.use_config or args.config:
         try:
@@ -160,6 +211,22 @@ def main():
             verbose = args.verbose or debate_settings.get("verbose", True)
             starting_position = debate_settings.get("starting_position", "X")
             rotation_limit = debate_settings.get("rotation_limit", 3)
+            judge_concurrency = debate_settings.get("judge_concurrency", DEFAULT_JUDGE_CONCURRENCY)
+            stream = args.stream or debate_settings.get("stream", DEFAULT_STREAM_RESPONSES)
+            prompt_layout = args.prompt_layout or debate_settings.get("prompt_layout")
+            if prompt_layout and prompt_layout not in PROMPT_LAYOUTS:
+                print(f"Invalid prompt_layout '{prompt_layout}'. Using default. Available layouts: {PROMPT_LAYOUTS}")
+                prompt_layout = None
+            cache_mode = args.cache or debate_settings.get("cache", DEFAULT_RESPONSE_CACHE_MODE)
+            rolling_summary = args.rolling_summary or debate_settings.get("rolling_summary", DEFAULT_ROLLING_SUMMARY)
+            pipeline_rounds = args.pipeline or debate_settings.get("pipeline_rounds", DEFAULT_PIPELINE_ROUNDS)
+            judge_output = args.judge_output or debate_settings.get("judge_output")
+            if judge_output and judge_output not in JUDGE_OUTPUT_MODES:
+                print(f"Invalid judge_output '{judge_output}'. Using default. Available modes: {JUDGE_OUTPUT_MODES}")
+                judge_output = None
+            panel_evaluation = args.panel_evaluation or debate_settings.get("panel_evaluation", DEFAULT_PANEL_EVALUATION)
+            database = args.database or debate_settings.get("database")
+            trace = args.trace or debate_settings.get("trace", DEFAULT_TRACE)
             
             print(f"Setting up debate on '{topic}' using configuration file")
             print(f"Position X: {position_x_agent.name}")
@@ -173,6 +240,16 @@ def main():
             verbose = args.verbose
             starting_position = "X"
             rotation_limit = 3
+            judge_concurrency = DEFAULT_JUDGE_CONCURRENCY
+            stream = args.stream or DEFAULT_STREAM_RESPONSES
+            prompt_layout = args.prompt_layout
+            cache_mode = args.cache or DEFAULT_RESPONSE_CACHE_MODE
+            rolling_summary = args.rolling_summary or DEFAULT_ROLLING_SUMMARY
+            pipeline_rounds = args.pipeline or DEFAULT_PIPELINE_ROUNDS
+            judge_output = args.judge_output
+            panel_evaluation = args.panel_evaluation or DEFAULT_PANEL_EVALUATION
+            database = args.database
+            trace = args.trace or DEFAULT_TRACE
             
             print(f"Setting up debate on '{topic}'")
             print(f"Position X: {position_x}")
@@ -184,11 +261,27 @@ def main():
         verbose = args.verbose
         starting_position = "X"
         rotation_limit = 3
+        judge_concurrency = DEFAULT_JUDGE_CONCURRENCY
+        stream = args.stream or DEFAULT_STREAM_RESPONSES
+        prompt_layout = args.prompt_layout
+        cache_mode = args.cache or DEFAULT_RESPONSE_CACHE_MODE
+        rolling_summary = args.rolling_summary or DEFAULT_ROLLING_SUMMARY
+        pipeline_rounds = args.pipeline or DEFAULT_PIPELINE_ROUNDS
+        judge_output = args.judge_output
+        panel_evaluation = args.panel_evaluation or DEFAULT_PANEL_EVALUATION
+        database = args.database
+        trace = args.trace or DEFAULT_TRACE
         
         print(f"Setting up debate on '{topic}'")
         print(f"Position X: {position_x}")
         print(f"Position Y: {position_y}")
     
+    # Create the response cache if enabled
+    response_cache = None
+    if cache_mode != "off":
+        response_cache = ResponseCache(mode=cache_mode)
+        print(f"Response cache: {cache_mode} ({response_cache.cache_dir})")
+    
     # Create and start the debate manager
     debate_manager = DebateManager(
         position_x=position_x_agent,
@@ -196,7 +289,17 @@ def main():
         topic=topic,
         rounds=rounds,
         starting_position=starting_position,
-        verbose=verbose
+        verbose=verbose,
+        judge_concurrency=judge_concurrency,
+        stream=stream,
+        prompt_layout=prompt_layout,
+        response_cache=response_cache,
+        rolling_summary=rolling_summary,
+        pipeline_rounds=pipeline_rounds,
+        judge_output=judge_output,
+        panel_evaluation=panel_evaluation,
+        database=database,
+        trace=trace
     )
     
     # Set rotation limit if provided in config
@@ -1,64 +1,252 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Deque, Optional, Tuple, Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+import threading
+
+from config import MEMORY_RECENT_ROUNDS, MEMORY_KEY_POINTS
+from token_counter import default_token_counter
 
 class AgentMemory:
     """
     Memory system for debate agents to maintain context across debate rounds
+
+    History is kept in bounded ring buffers, and each summary block is
+    formatted and token-counted once when it is added, so memory use and the
+    cost of building a summary stay flat however long the debate runs.
+
+    With a summarizer attached, rounds that fall out of the ring buffer are
+    compressed into a rolling abstractive summary on a background thread.
+    Summaries only ever use the latest finished result, so a slow summarizer
+    never delays a turn.
     """
-    def __init__(self):
-        self.debate_history = []  # Stores all previous rounds' arguments
-        self.key_points_made = []  # Tracks main points already covered
-        self.opponent_points = []  # Tracks opponent's key arguments
+    def __init__(self,
+                 recent_rounds: int = MEMORY_RECENT_ROUNDS,
+                 key_points: int = MEMORY_KEY_POINTS):
+        self.debate_history = deque(maxlen=recent_rounds)  # Most recent rounds' arguments
+        self.key_points_made = deque(maxlen=key_points)    # Main points already covered
+        self.opponent_points = deque(maxlen=key_points)    # Opponent's key arguments
+        self.rounds_seen = 0  # Total updates received, for round numbering
+
+        # Pre-formatted summary blocks as (text, token count)
+        self._round_blocks: Deque[Tuple[str, int]] = deque(maxlen=recent_rounds)
+        self._key_point_lines: Deque[Tuple[str, int]] = deque(maxlen=key_points)
+        self._opponent_point_lines: Deque[Tuple[str, int]] = deque(maxlen=key_points)
+        self._summary_cache: Optional[Tuple[int, str]] = None  # (max_tokens, summary)
+
+        # Optional rolling summary of rounds older than the ring buffer
+        self.summarizer: Optional[Callable[[str, List[Dict[str, Any]]], str]] = None
+        self.rolling_summary = ""
+        self._rolling_block: Optional[Tuple[str, int]] = None
+        self._pending_rounds: List[Dict[str, Any]] = []
+        self._summarizing_rounds: List[Dict[str, Any]] = []  # Rounds in the running job
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._summary_future: Optional[Future] = None
+
+    def enable_rolling_summary(self, summarizer: Callable[[str, List[Dict[str, Any]]], str],
+                               thread_name: str = "memory-summary") -> None:
+        """
+        Compress rounds evicted from the ring buffer with summarizer in the background
+
+        Args:
+            summarizer: Called as summarizer(previous_summary, rounds) and
+                returns the new rolling summary text
+            thread_name: Name prefix of the background thread
+        """
+        self.summarizer = summarizer
+        if self._executor is None:
+            # One worker keeps summaries applied in order
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name)
+
+    def _summarize_pending(self) -> None:
+        """Background job: fold all pending rounds into the rolling summary"""
+        with self._lock:
+            rounds, self._pending_rounds = self._pending_rounds, []
+            self._summarizing_rounds = rounds
+            previous = self.rolling_summary
+        if not rounds:
+            return
+        try:
+            summary = self.summarizer(previous, rounds).strip()
+        except Exception as e:
+            print(f"Error updating memory summary: {e}")
+            # Keep the rounds so the next job retries them
+            with self._lock:
+                self._pending_rounds = rounds + self._pending_rounds
+                self._summarizing_rounds = []
+            return
+        with self._lock:
+            self._summarizing_rounds = []
+            self.rolling_summary = summary
+            self._rolling_block = self._block(f"Earlier Rounds (summarized):\n{summary}\n\n") if summary else None
+            self._summary_cache = None
+
+    def wait_for_summary(self, timeout: Optional[float] = None) -> None:
+        """Blocks until the current background summary job (if any) has finished"""
+        future = self._summary_future
+        if future is not None:
+            future.result(timeout=timeout)
+
+    def close(self) -> None:
+        """
+        Finishes the running background summary and stops its thread
+
+        Rolling summaries are off afterwards; enable_rolling_summary turns
+        them back on.
+        """
+        if self._executor is None:
+            return
+        self.wait_for_summary()
+        self._executor.shutdown()
+        self._executor = None
+        self.summarizer = None
+
+    def get_state(self) -> Dict[str, Any]:
+        """
+        Returns the memory's contents as JSON-serializable data for checkpoints
+        
+        Rounds still waiting for (or inside) a background summary job are
+        saved as pending, so a restored memory summarizes them again.
+        """
+        with self._lock:
+            return {
+                "debate_history": list(self.debate_history),
+                "key_points_made": list(self.key_points_made),
+                "opponent_points": list(self.opponent_points),
+                "rounds_seen": self.rounds_seen,
+                "round_blocks": [text for text, _ in self._round_blocks],
+                "rolling_summary": self.rolling_summary,
+                "pending_rounds": self._summarizing_rounds + self._pending_rounds
+            }
+    
+    def load_state(self, state: Dict[str, Any]) -> None:
+        """
+        Restores contents saved by get_state
+        
+        Args:
+            state: Data from get_state
+        """
+        self.debate_history.clear()
+        self.debate_history.extend(state["debate_history"])
+        self.key_points_made.clear()
+        self.key_points_made.extend(state["key_points_made"])
+        self.opponent_points.clear()
+        self.opponent_points.extend(state["opponent_points"])
+        self.rounds_seen = state["rounds_seen"]
         
+        self._round_blocks.clear()
+        self._round_blocks.extend(self._block(text) for text in state["round_blocks"])
+        self._key_point_lines.clear()
+        self._key_point_lines.extend(self._block(f"- {point[:100]}...\n") for point in self.key_points_made)
+        self._opponent_point_lines.clear()
+        self._opponent_point_lines.extend(self._block(f"- {point[:100]}...\n") for point in self.opponent_points)
+        
+        with self._lock:
+            summary = state.get("rolling_summary", "")
+            self.rolling_summary = summary
+            self._rolling_block = self._block(f"Earlier Rounds (summarized):\n{summary}\n\n") if summary else None
+            self._pending_rounds = list(state.get("pending_rounds", []))
+            self._summary_cache = None
+        
+        if self.summarizer and self._pending_rounds:
+            self._summary_future = self._executor.submit(self._summarize_pending)
+
+    @staticmethod
+    def _block(text: str) -> Tuple[str, int]:
+        return text, default_token_counter.count(text)
+
     def update(self, debate_round: Dict[str, Any]) -> None:
         """
         Updates the agent's memory with information from a new debate round
-        
+
         Args:
             debate_round: Dictionary containing the round's statements and metadata
         """
+        if self.summarizer and len(self.debate_history) == self.debate_history.maxlen:
+            # The oldest round is about to be evicted; hand it to the summarizer
+            with self._lock:
+                self._pending_rounds.append(self.debate_history[0])
+            self._summary_future = self._executor.submit(self._summarize_pending)
+
         self.debate_history.append(debate_round)
-        
+        self.rounds_seen += 1
+
+        round_block = f"Round {self.rounds_seen}:\n"
+        if debate_round.get('position_x_statement'):
+            round_block += f"Position X: {debate_round['position_x_statement'][:200]}...\n"
+        if debate_round.get('position_y_statement'):
+            round_block += f"Position Y: {debate_round['position_y_statement'][:200]}...\n"
+        self._round_blocks.append(self._block(round_block + "\n"))
+
         # If the round contains a position X statement, add it to opponent points
         # This assumes agent is position Y - will be ignored for position X agents
         if debate_round.get('position_x_statement'):
-            self.opponent_points.append(debate_round['position_x_statement'])
-            
+            point = debate_round['position_x_statement']
+            self.opponent_points.append(point)
+            self._opponent_point_lines.append(self._block(f"- {point[:100]}...\n"))
+
         # If the round contains a position Y statement, add it to key points
         # This assumes agent is position Y - for position X agents, we track opponent's points
         if debate_round.get('position_y_statement'):
-            self.key_points_made.append(debate_round['position_y_statement'])
-    
+            point = debate_round['position_y_statement']
+            self.key_points_made.append(point)
+            self._key_point_lines.append(self._block(f"- {point[:100]}...\n"))
+
+        with self._lock:
+            self._summary_cache = None
+
     def get_context_summary(self, max_tokens: int = 2000) -> str:
         """
         Creates a condensed summary of the debate history for context
-        
+
+        Blocks are added in priority order (most recent rounds first, then the
+        rolling summary of earlier rounds, key points and opponent points) and
+        any block that would exceed max_tokens is left out.
+
         Args:
             max_tokens: Maximum tokens to include in summary
-            
+
         Returns:
             str: Formatted debate history summary
         """
-        # Simplified implementation - in a real system, we would use
-        # more sophisticated summarization techniques
-        summary = "Debate History Summary:\n\n"
-        
+        cached = self._summary_cache
+        if cached and cached[0] == max_tokens:
+            return cached[1]
+        rolling_block = self._rolling_block
+
+        parts: List[str] = []
+        budget = max_tokens
+
+        def add(block: Tuple[str, int]) -> bool:
+            nonlocal budget
+            text, tokens = block
+            if tokens > budget:
+                return False
+            parts.append(text)
+            budget -= tokens
+            return True
+
+        add(self._block("Debate History Summary:\n\n"))
+
         # Add the most recent rounds first (most important)
-        for i, round_data in enumerate(reversed(self.debate_history[-3:])):
-            round_num = len(self.debate_history) - i
-            summary += f"Round {round_num}:\n"
-            if round_data.get('position_x_statement'):
-                summary += f"Position X: {round_data['position_x_statement'][:200]}...\n"
-            if round_data.get('position_y_statement'):
-                summary += f"Position Y: {round_data['position_y_statement'][:200]}...\n"
-            summary += "\n"
-        
+        for block in reversed(self._round_blocks):
+            if not add(block):
+                break
+
+        if rolling_block:
+            add(rolling_block)
+
         # Add key points tracking
-        summary += "Key Points Already Made:\n"
-        for point in self.key_points_made[-5:]:
-            summary += f"- {point[:100]}...\n"
-            
-        summary += "\nOpponent's Key Points:\n"
-        for point in self.opponent_points[-5:]:
-            summary += f"- {point[:100]}...\n"
-            
+        if add(self._block("Key Points Already Made:\n")):
+            for line in self._key_point_lines:
+                add(line)
+
+        if add(self._block("\nOpponent's Key Points:\n")):
+            for line in self._opponent_point_lines:
+                add(line)
+
+        summary = "".join(parts)
+        # Don't cache if a background summary landed while we were building
+        if rolling_block is self._rolling_block:
+            self._summary_cache = (max_tokens, summary)
         return summary
@@ -0,0 +1,102 @@
+from typing import Iterable, Set
+import json
+import subprocess
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from config import OLLAMA_BASE_URL, OLLAMA_REQUEST_TIMEOUT
+
+class ModelRegistry:
+    """
+    Process-wide cache of which Ollama models are available locally.
+
+    Each distinct model is checked at most once per process, and missing
+    models are pulled in parallel instead of one agent at a time.
+    """
+    def __init__(self, base_url: str = OLLAMA_BASE_URL):
+        self.base_url = base_url.rstrip('/')
+        self._lock = threading.Lock()
+        self._installed = None  # Set of installed model names, loaded lazily
+        self._checked = set()   # Models already confirmed (or given up on)
+
+    @staticmethod
+    def _base_name(model: str) -> str:
+        """Strips the tag from a model name ("llama3:latest" -> "llama3")"""
+        return model.split(':')[0]
+
+    def _fetch_installed(self) -> Set[str]:
+        """
+        Lists installed models, preferring Ollama's HTTP tags endpoint
+        and falling back to the `ollama list` command
+
+        Returns:
+            set: Installed model names including their tags
+        """
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/api/tags", timeout=OLLAMA_REQUEST_TIMEOUT) as response:
+                data = json.loads(response.read().decode('utf-8'))
+            return {m.get('name') or m.get('model', '') for m in data.get('models', [])}
+        except Exception:
+            pass
+
+        result = subprocess.run(['ollama', 'list'], capture_output=True, text=True, check=True)
+        # Skip the header row; the first column is the model name
+        return {line.split()[0] for line in result.stdout.splitlines()[1:] if line.strip()}
+
+    def _is_installed(self, model: str) -> bool:
+        """Checks a model against the cached list, accepting a matching base name"""
+        if model in self._installed:
+            return True
+        base_model = self._base_name(model)
+        return any(self._base_name(name) == base_model for name in self._installed)
+
+    def _pull(self, model: str) -> None:
+        """Pulls a single model with the Ollama CLI"""
+        print(f"Model {model} not found. Pulling model...")
+        subprocess.run(['ollama', 'pull', model], check=True)
+        print(f"Model {model} successfully pulled.")
+
+    def ensure_available(self, models: Iterable[str]) -> None:
+        """
+        Makes sure every model is available locally, pulling missing ones in parallel
+
+        Args:
+            models: Model names, duplicates allowed
+        """
+        with self._lock:
+            pending = [m for m in dict.fromkeys(models) if m not in self._checked]
+            if not pending:
+                return
+
+            try:
+                if self._installed is None:
+                    self._installed = self._fetch_installed()
+                missing = [m for m in pending if not self._is_installed(m)]
+
+                if missing:
+                    with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                        list(executor.map(self._pull, missing))
+                    self._installed.update(missing)
+            except subprocess.CalledProcessError as e:
+                print(f"Error checking or pulling model: {e}")
+                print(f"Command output: {e.stdout}, {e.stderr}")
+                print("Please ensure Ollama is installed and running.")
+            except FileNotFoundError:
+                print("Ollama command not found. Please ensure Ollama is installed and in your PATH.")
+
+            # Failures are reported once rather than retried by every agent
+            self._checked.update(pending)
+
+    def invalidate(self) -> None:
+        """Forgets cached results so the next check queries Ollama again"""
+        with self._lock:
+            self._installed = None
+            self._checked = set()
+
+# Shared registry used by all agents in this process
+model_registry = ModelRegistry()
+
+def ensure_models_available(models: Iterable[str]) -> None:
+    """Convenience wrapper around the shared registry's ensure_available"""
+    model_registry.ensure_available(models)
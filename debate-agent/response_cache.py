@@ -0,0 +1,162 @@
+from typing import Any, Dict, List, Optional, Union
+import hashlib
+import json
+import os
+import threading
+
+from config import RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_BYTES
+
+CACHE_MODES = ["off", "record", "replay"]
+
+# Backend stats kept with each entry; the rest of Ollama's final chunk (notably
+# the "context" array of token ids) is large and never read back
+CACHED_GENERATION_FIELDS = (
+    "prompt_eval_count", "eval_count",
+    "prompt_eval_duration", "eval_duration", "load_duration", "total_duration"
+)
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of LLM responses.
+
+    Entries are keyed by model, the full prompt, temperature and options, and
+    stored one JSON file per key. When the cache grows past max_bytes the least
+    recently used entries (by file mtime, refreshed on every hit) are evicted.
+
+    Modes:
+        off:    the cache is not used
+        record: every response is written, but never read back
+        replay: hits are served without calling the model; misses are
+                generated and recorded
+    """
+    def __init__(self, cache_dir: str = RESPONSE_CACHE_DIR, mode: str = "replay",
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode '{mode}'. Available modes: {CACHE_MODES}")
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = None  # key -> entry size in bytes, loaded lazily
+        self._total_bytes = 0
+        if self.mode != "off" and not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @staticmethod
+    def make_key(model: str, prompt: Union[str, List[Any]], temperature: float,
+                 options: Optional[Dict] = None, response_format: Optional[Any] = None) -> str:
+        """
+        Builds the content address for an LLM call
+
+        Args:
+            model: Model name
+            prompt: Prompt string or list of chat messages
+            temperature: Sampling temperature
+            options: Generation options passed to Ollama
+            response_format: Output format or JSON schema, if constrained
+
+        Returns:
+            str: Hex digest identifying the call
+        """
+        if isinstance(prompt, str):
+            serialized_prompt = prompt
+        else:
+            serialized_prompt = [[m.type, m.content] for m in prompt]
+        key_data = {
+            "model": model,
+            "prompt": serialized_prompt,
+            "temperature": temperature,
+            "options": options or {}
+        }
+        if response_format is not None:
+            key_data["format"] = response_format
+        payload = json.dumps(key_data, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self) -> None:
+        """Scans the cache directory once to learn entry sizes (lock must be held)"""
+        if self._sizes is not None:
+            return
+        self._sizes = {}
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith('.json'):
+                try:
+                    self._sizes[filename[:-5]] = os.path.getsize(os.path.join(self.cache_dir, filename))
+                except OSError:
+                    pass
+        self._total_bytes = sum(self._sizes.values())
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Looks up a cached response (only in replay mode)
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            dict: Entry with "text" and "generation_info", or None on a miss
+        """
+        if self.mode != "replay":
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path)  # Mark as recently used
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, text: str, generation_info: Optional[Dict] = None) -> None:
+        """
+        Stores a response and evicts least recently used entries if over budget
+
+        Args:
+            key: Key from make_key
+            text: Generated text
+            generation_info: Backend response stats; only CACHED_GENERATION_FIELDS are kept
+        """
+        if not self.enabled:
+            return
+        stats = {field: value for field, value in (generation_info or {}).items() if field in CACHED_GENERATION_FIELDS}
+        data = json.dumps({"text": text, "generation_info": stats}).encode('utf-8')
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing response cache entry: {e}")
+            return
+
+        with self._lock:
+            self._load_index()
+            self._total_bytes += len(data) - self._sizes.get(key, 0)
+            self._sizes[key] = len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until under max_bytes (lock must be held)"""
+        def last_used(key):
+            try:
+                return os.path.getmtime(self._path(key))
+            except OSError:
+                return 0
+
+        for key in sorted(self._sizes, key=last_used):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._total_bytes -= self._sizes.pop(key)
@@ -1,12 +1,17 @@
+from typing import Optional
+
 from config import DEFAULT_TIME_LIMIT_SECONDS, TOKENS_PER_SECOND
+from token_counter import TokenCounter, default_token_counter
 
 class TimerSystem:
     """
     System to track and enforce time limits in debates
     """
-    def __init__(self, time_limit_seconds=DEFAULT_TIME_LIMIT_SECONDS):
+    def __init__(self, time_limit_seconds=DEFAULT_TIME_LIMIT_SECONDS,
+                 token_counter: Optional[TokenCounter] = None):
         self.time_limit = time_limit_seconds
         self.time_used = 0
+        self.token_counter = token_counter or default_token_counter
         
     def estimate_response_time(self, response_length: int) -> float:
         """
@@ -21,30 +26,35 @@ class TimerSystem:
         estimated_seconds = response_length / TOKENS_PER_SECOND
         return estimated_seconds
     
-    def enforce_limits(self, agent_response: str, max_tokens: int = 800) -> str:
+    def enforce_limits(self, agent_response: str, max_tokens: int = 800, echo: bool = True,
+                       model: Optional[str] = None, reported_tokens: Optional[int] = None) -> str:
         """
         Prevents excessively long responses
         
         Args:
             agent_response: The full response from the agent
             max_tokens: Maximum allowed tokens
+            echo: Print the full response (disable when it was already streamed)
+            model: Model that generated the response, used for token estimates
+            reported_tokens: Token count reported by the backend (eval_count), if any
             
         Returns:
             str: Truncated response if needed
         """
-        # Simplified token counting - in production we'd use a proper tokenizer
-        tokens = len(agent_response.split())
+        if reported_tokens is not None and model:
+            self.token_counter.calibrate(model, agent_response, reported_tokens)
+        tokens = self.token_counter.count(agent_response, model, reported=reported_tokens)
+        
+        if echo:
+            print(agent_response)  # Show full response in console
         
         if tokens > max_tokens:
             # Truncate and add note about time limit
-            words = agent_response.split()
-            truncated = " ".join(words[:max_tokens])
-            print(agent_response)  # Show full response in console
+            truncated = self.token_counter.truncate(agent_response, max_tokens, model, reported=reported_tokens)
             return truncated + "\n[Time limit reached]"
         
         # Update time used
         self.time_used += self.estimate_response_time(tokens)
-        print(agent_response)  # Show full response in console
         return agent_response
     
     def reset(self):
@@ -0,0 +1,112 @@
+from typing import Dict, Optional
+import re
+import threading
+from abc import ABC, abstractmethod
+
+from config import APPROX_TOKENS_PER_PIECE, TOKEN_CALIBRATION_SMOOTHING
+
+# Words and individual punctuation marks, roughly how BPE tokenizers split text
+_PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+class TokenCounter(ABC):
+    """
+    Interface for counting and truncating text in model tokens
+    """
+    @abstractmethod
+    def count(self, text: str, model: Optional[str] = None, reported: Optional[int] = None) -> int:
+        """
+        Counts the tokens in text
+
+        Args:
+            text: Text to count
+            model: Model that produced or will consume the text
+            reported: Token count reported by the backend, if known
+
+        Returns:
+            int: Number of tokens
+        """
+
+    @abstractmethod
+    def truncate(self, text: str, max_tokens: int, model: Optional[str] = None,
+                 reported: Optional[int] = None) -> str:
+        """
+        Cuts text down to at most max_tokens tokens
+
+        Args:
+            text: Text to truncate
+            max_tokens: Maximum tokens to keep
+            model: Model the text belongs to
+            reported: Token count of the whole text reported by the backend, if known
+
+        Returns:
+            str: Prefix of text ending on a token boundary
+        """
+
+    def calibrate(self, model: str, text: str, reported: int) -> None:
+        """
+        Lets the counter learn from a backend-reported token count
+
+        Args:
+            model: Model that produced the text
+            text: Generated text
+            reported: Token count reported by the backend (e.g. Ollama's eval_count)
+        """
+        pass
+
+class ApproximateTokenCounter(TokenCounter):
+    """
+    Fast local token estimate that prefers backend-reported counts.
+
+    Text is split into word and punctuation pieces with a single regex pass,
+    and pieces are converted to tokens with a per-model ratio that is learned
+    from the counts Ollama reports for real responses.
+    """
+    def __init__(self, default_ratio: float = APPROX_TOKENS_PER_PIECE,
+                 smoothing: float = TOKEN_CALIBRATION_SMOOTHING):
+        self.default_ratio = default_ratio
+        self.smoothing = smoothing
+        self._ratios: Dict[str, float] = {}  # model -> tokens per piece
+        self._lock = threading.Lock()
+
+    def ratio(self, model: Optional[str] = None) -> float:
+        """Returns the calibrated tokens-per-piece ratio for a model"""
+        return self._ratios.get(model, self.default_ratio)
+
+    def count(self, text: str, model: Optional[str] = None, reported: Optional[int] = None) -> int:
+        if reported is not None:
+            return reported
+        pieces = sum(1 for _ in _PIECE_PATTERN.finditer(text))
+        return round(pieces * self.ratio(model))
+
+    def truncate(self, text: str, max_tokens: int, model: Optional[str] = None,
+                 reported: Optional[int] = None) -> str:
+        matches = list(_PIECE_PATTERN.finditer(text))
+        if reported:
+            # This response's own tokens-per-piece ratio; the calibrated one is
+            # smoothed across responses and can be far off for this text
+            max_pieces = int(len(matches) * max_tokens / reported)
+        else:
+            max_pieces = int(max_tokens / self.ratio(model))
+        if max_pieces <= 0:
+            return ""
+
+        # Slice the original string at the end of the last piece that fits
+        for i, match in enumerate(matches, 1):
+            if i == max_pieces:
+                return text[:match.end()]
+        return text
+
+    def calibrate(self, model: str, text: str, reported: int) -> None:
+        pieces = sum(1 for _ in _PIECE_PATTERN.finditer(text))
+        if not model or pieces == 0 or not reported:
+            return
+        observed = reported / pieces
+        with self._lock:
+            current = self._ratios.get(model)
+            if current is None:
+                self._ratios[model] = observed
+            else:
+                self._ratios[model] = current + self.smoothing * (observed - current)
+
+# Shared counter so calibration carries across timers and agents
+default_token_counter = ApproximateTokenCounter()
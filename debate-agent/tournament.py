@@ -0,0 +1,279 @@
+from typing import Any, Dict, List, Optional
+import argparse
+import contextlib
+import copy
+import itertools
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from agent import set_llm_request_limit
+from config_loader import validate_config
+from config import (
+    DEFAULT_ROUNDS, DEFAULT_STARTING_POSITION, MAX_ROTATION_COUNT, RESPONSE_STYLES,
+    DEFAULT_JUDGE_CONCURRENCY, PROMPT_LAYOUTS, DEFAULT_RESPONSE_CACHE_MODE,
+    DEFAULT_ROLLING_SUMMARY, DEFAULT_PIPELINE_ROUNDS, JUDGE_OUTPUT_MODES,
+    DEFAULT_PANEL_EVALUATION, DEFAULT_TRACE
+)
+
+def load_grid_jobs(grid_file: str) -> List[Dict[str, Any]]:
+    """
+    Expands a grid file into one job per topic × model × response style
+
+    The grid file is JSON with a "base_config" (an inline configuration or a
+    path to one) and optional "topics", "models" and "response_styles" lists.
+    A model replaces the model of every agent in the base configuration.
+
+    Args:
+        grid_file: Path to the grid file
+
+    Returns:
+        list: Jobs with a display name and a complete configuration
+    """
+    with open(grid_file, 'r') as f:
+        grid = json.load(f)
+
+    base_config = grid["base_config"]
+    if isinstance(base_config, str):
+        base_path = os.path.join(os.path.dirname(os.path.abspath(grid_file)), base_config)
+        with open(base_path, 'r') as f:
+            base_config = json.load(f)
+
+    topics = grid.get("topics") or [base_config["topic"]]
+    models = grid.get("models") or [None]
+    styles = grid.get("response_styles") or [None]
+
+    jobs = []
+    for topic, model, style in itertools.product(topics, models, styles):
+        config = copy.deepcopy(base_config)
+        config["topic"] = topic
+        if model:
+            config["position_x"]["model"] = model
+            for pos_y in config["position_y"]:
+                pos_y["model"] = model
+        if style:
+            config.setdefault("debate_settings", {})["response_style"] = style
+
+        name = " | ".join(str(part) for part in (topic, model, style) if part)
+        jobs.append({"name": name, "model": model, "response_style": style, "config": config})
+    return jobs
+
+def load_config_jobs(config_files: List[str]) -> List[Dict[str, Any]]:
+    """Creates one job per configuration file"""
+    jobs = []
+    for config_file in config_files:
+        with open(config_file, 'r') as f:
+            config = json.load(f)
+        style = config.get("debate_settings", {}).get("response_style")
+        jobs.append({
+            "name": os.path.basename(config_file),
+            "model": config["position_x"].get("model"),
+            "response_style": style,
+            "config": config
+        })
+    return jobs
+
+def _init_worker(llm_slots) -> None:
+    """Process pool initializer: share the global LLM request cap with this worker"""
+    set_llm_request_limit(llm_slots)
+
+def run_debate_job(job: Dict[str, Any], output_dir: str, quiet: bool = True,
+                   database: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs a single debate from a job (in a worker process)
+
+    Args:
+        job: Job from load_grid_jobs or load_config_jobs
+        output_dir: Directory for the debate transcript
+        quiet: Suppress the debate's console output
+        database: SQLite database the debate is also written to
+
+    Returns:
+        dict: Outcome summary for the tournament report
+    """
+    # Imported here so each worker builds its own agents and LLM clients
+    from main import create_agents_from_config
+    from debate_logger import DebateLogger
+    from debate_manager import DebateManager
+    from response_cache import ResponseCache
+
+    start = time.perf_counter()
+    config = job["config"]
+    outcome = {"name": job["name"], "model": job.get("model"), "response_style": job.get("response_style")}
+
+    try:
+        validate_config(config)
+        settings = config.get("debate_settings", {})
+        response_style = settings.get("response_style")
+        if response_style not in RESPONSE_STYLES:
+            response_style = None
+        prompt_layout = settings.get("prompt_layout")
+        if prompt_layout not in PROMPT_LAYOUTS:
+            prompt_layout = None
+        cache_mode = settings.get("cache", DEFAULT_RESPONSE_CACHE_MODE)
+        judge_output = settings.get("judge_output")
+        if judge_output not in JUDGE_OUTPUT_MODES:
+            judge_output = None
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull if quiet else sys.stdout):
+            topic, position_x_agent, position_y_agents = create_agents_from_config(config)
+            manager = DebateManager(
+                position_x=position_x_agent,
+                position_y_agents=position_y_agents,
+                topic=topic,
+                rounds=settings.get("rounds", DEFAULT_ROUNDS),
+                starting_position=settings.get("starting_position", DEFAULT_STARTING_POSITION),
+                verbose=False,
+                response_style=response_style,
+                judge_concurrency=settings.get("judge_concurrency", DEFAULT_JUDGE_CONCURRENCY),
+                prompt_layout=prompt_layout,
+                response_cache=ResponseCache(mode=cache_mode) if cache_mode != "off" else None,
+                rolling_summary=settings.get("rolling_summary", DEFAULT_ROLLING_SUMMARY),
+                pipeline_rounds=settings.get("pipeline_rounds", DEFAULT_PIPELINE_ROUNDS),
+                judge_output=judge_output,
+                panel_evaluation=settings.get("panel_evaluation", DEFAULT_PANEL_EVALUATION),
+                trace=settings.get("trace", DEFAULT_TRACE),
+                logger=DebateLogger(output_dir=output_dir, verbose=False, database=database)
+            )
+            manager.rotation_limit = settings.get("rotation_limit", MAX_ROTATION_COUNT)
+            results = manager.start_debate()
+
+        # Average judge score from the last round that was voted on
+        final_score = None
+        for round_data in reversed(results["transcript"]):
+            evaluations = round_data.get("voting_results", {}).get("evaluations", [])
+            if evaluations:
+                final_score = round(statistics.mean(e["total_score"] for e in evaluations), 2)
+                break
+
+        outcome.update({
+            "status": "ok",
+            "topic": results["topic"],
+            "rounds": results["rounds"],
+            "rotations": results["rotations"],
+            "position_y_debaters": results["position_y_debaters"],
+            "final_score": final_score,
+            "file": manager.logger.log_filename
+        })
+    except Exception as e:
+        outcome.update({"status": "error", "error": f"{type(e).__name__}: {e}"})
+
+    outcome["duration"] = round(time.perf_counter() - start, 2)
+    return outcome
+
+def print_tournament_summary(outcomes: List[Dict[str, Any]], wall_time: float) -> None:
+    """
+    Prints per-debate results and aggregates across the tournament
+
+    Args:
+        outcomes: Results from run_debate_job
+        wall_time: Total tournament time in seconds
+    """
+    succeeded = [o for o in outcomes if o["status"] == "ok"]
+    failed = [o for o in outcomes if o["status"] != "ok"]
+
+    print("\n=== Tournament Results ===")
+    for outcome in outcomes:
+        if outcome["status"] == "ok":
+            print(f"{outcome['name']}: {outcome['rotations']} rotations, "
+                  f"final score {outcome['final_score']}, {outcome['duration']}s -> {outcome['file']}")
+        else:
+            print(f"{outcome['name']}: FAILED ({outcome['error']})")
+
+    print("\n=== Tournament Summary ===")
+    print(f"Debates: {len(outcomes)} ({len(succeeded)} succeeded, {len(failed)} failed)")
+    print(f"Wall time: {wall_time:.1f}s")
+    if wall_time > 0:
+        print(f"Throughput: {len(succeeded) * 3600 / wall_time:.1f} debates/hour")
+    if succeeded:
+        print(f"Mean rotations: {statistics.mean(o['rotations'] for o in succeeded):.2f}")
+        scores = [o["final_score"] for o in succeeded if o["final_score"] is not None]
+        if scores:
+            print(f"Mean final score: {statistics.mean(scores):.2f}")
+
+        # Break down by each grid dimension that actually varies
+        for key, label in (("model", "model"), ("response_style", "response style")):
+            groups = {}
+            for outcome in succeeded:
+                groups.setdefault(outcome.get(key) or "default", []).append(outcome)
+            if len(groups) > 1:
+                print(f"\nBy {label}:")
+                for value, group in sorted(groups.items()):
+                    print(f"  {value}: {len(group)} debates, "
+                          f"mean rotations {statistics.mean(o['rotations'] for o in group):.2f}")
+
+def run_tournament(jobs: List[Dict[str, Any]], workers: int, max_llm_requests: int,
+                   output_dir: str, quiet: bool = True, summary_file: Optional[str] = None,
+                   database: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Runs all jobs through a process pool with a global cap on LLM requests
+
+    Args:
+        jobs: Debates to run
+        workers: Number of worker processes
+        max_llm_requests: Maximum concurrent LLM requests across all workers
+        output_dir: Directory for debate transcripts
+        quiet: Suppress per-debate console output
+        summary_file: Optional path for a JSON copy of the outcomes
+        database: SQLite database every debate is also written to
+
+    Returns:
+        list: Outcomes in job order
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    llm_slots = multiprocessing.BoundedSemaphore(max_llm_requests)
+
+    print(f"Running {len(jobs)} debates with {workers} workers "
+          f"(max {max_llm_requests} concurrent LLM requests)")
+    start = time.perf_counter()
+    outcomes: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(llm_slots,)) as executor:
+        futures = {executor.submit(run_debate_job, job, output_dir, quiet, database): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            outcomes[index] = future.result()
+            print(f"[{done}/{len(jobs)}] {outcomes[index]['name']}: {outcomes[index]['status']}")
+
+    print_tournament_summary(outcomes, time.perf_counter() - start)
+
+    if summary_file:
+        with open(summary_file, 'w') as f:
+            json.dump(outcomes, f, indent=2)
+        print(f"\nTournament summary saved to: {summary_file}")
+    return outcomes
+
+def main():
+    parser = argparse.ArgumentParser(description='Run many debates in parallel')
+    parser.add_argument('configs', nargs='*', help='Configuration files, one debate each')
+    parser.add_argument('--grid', type=str, help='Grid file expanding topics × models × response styles')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--max-llm-requests', type=int, help='Global cap on concurrent LLM requests (default: workers)')
+    parser.add_argument('--output-dir', type=str, default='output', help='Directory for debate transcripts')
+    parser.add_argument('--database', type=str, help='Also store every debate in this SQLite database')
+    parser.add_argument('--summary', type=str, help='Write the tournament outcomes to this JSON file')
+    parser.add_argument('--show-debates', action='store_true', help='Show each debate\'s console output')
+    args = parser.parse_args()
+
+    jobs = load_config_jobs(args.configs)
+    if args.grid:
+        jobs += load_grid_jobs(args.grid)
+    if not jobs:
+        parser.error("provide configuration files and/or --grid")
+
+    run_tournament(
+        jobs,
+        workers=max(1, args.workers),
+        max_llm_requests=max(1, args.max_llm_requests or args.workers),
+        output_dir=args.output_dir,
+        quiet=not args.show_debates,
+        summary_file=args.summary,
+        database=args.database
+    )
+
+if __name__ == "__main__":
+    main()
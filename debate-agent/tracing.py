@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import threading
+import contextlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Trace files are written next to the debate transcript as <debate>.trace;
+# the content is Chrome trace-event JSON (chrome://tracing, ui.perfetto.dev)
+TRACE_EXTENSION = ".trace"
+
+class Tracer:
+    """
+    Records nested, timed spans from every thread of a debate run
+
+    Spans nest per thread (a thread-local stack tracks the open ones), so
+    each span also knows its self time: its duration minus that of the
+    spans directly inside it. The result exports as Chrome trace-event JSON
+    with one track per thread, which shows where concurrent work (judges,
+    pipelined turns, background summaries) overlaps the main thread.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._start = time.perf_counter_ns()
+        self._events: List[Tuple[Dict[str, Any], int, int]] = []  # (event, self ns, depth)
+        self._threads: Dict[str, int] = {}  # thread name -> tid
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _thread_id(self) -> int:
+        """Track of the current thread; threads are keyed by name, so a
+        worker pool recreated each round (e.g. judge_0, judge_1) reuses its tracks"""
+        name = threading.current_thread().name
+        with self._lock:
+            return self._threads.setdefault(name, len(self._threads) + 1)
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Times the enclosed block as one span
+
+        Args:
+            name: Span name (spans are summarized by name)
+            category: Chrome trace category, e.g. "debate", "llm" or "save"
+            **args: Details shown with the span
+
+        Yields:
+            dict: The span's args, so details known only afterwards
+                (such as token counts) can be added
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = [0]  # Nanoseconds spent in child spans
+        stack.append(frame)
+        begin = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            duration = time.perf_counter_ns() - begin
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (begin - self._start) / 1000,
+                "dur": duration / 1000,
+                "pid": 1,
+                "tid": self._thread_id(),
+                "args": args
+            }
+            with self._lock:
+                self._events.append((event, duration - frame[0], len(stack)))
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Aggregates the recorded spans by name
+
+        Returns:
+            dict: Total wall time, per-span totals (count, total, self, mean
+                and max seconds, sorted by self time) and per-thread busy time
+        """
+        with self._lock:
+            events = list(self._events)
+            threads = {tid: name for name, tid in self._threads.items()}
+        wall = max((e["ts"] + e["dur"] for e, _, _ in events), default=0.0) / 1e6
+
+        spans: Dict[str, Dict[str, Any]] = {}
+        busy: Dict[int, float] = {}
+        for event, self_ns, depth in events:
+            seconds = event["dur"] / 1e6
+            entry = spans.setdefault(event["name"], {
+                "name": event["name"], "category": event["cat"], "count": 0,
+                "total": 0.0, "self": 0.0, "max": 0.0
+            })
+            entry["count"] += 1
+            entry["total"] += seconds
+            entry["self"] += self_ns / 1e9
+            entry["max"] = max(entry["max"], seconds)
+            if depth == 0:
+                busy[event["tid"]] = busy.get(event["tid"], 0.0) + seconds
+
+        rows = []
+        for entry in sorted(spans.values(), key=lambda e: e["self"], reverse=True):
+            rows.append(dict(
+                entry,
+                total=round(entry["total"], 4),
+                self=round(entry["self"], 4),
+                mean=round(entry["total"] / entry["count"], 4),
+                max=round(entry["max"], 4),
+                self_share=round(entry["self"] / wall, 4) if wall else 0.0
+            ))
+        return {
+            "wall_time": round(wall, 4),
+            "spans": rows,
+            "threads": [
+                {"name": threads[tid], "busy": round(seconds, 4), "share": round(seconds / wall, 4) if wall else 0.0}
+                for tid, seconds in sorted(busy.items())
+            ]
+        }
+
+    def to_chrome_trace(self, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Returns the spans as a Chrome trace-event JSON object
+
+        Args:
+            metadata: Extra fields stored in otherData (e.g. the debate topic)
+
+        Returns:
+            dict: traceEvents (thread names, then spans by start time),
+                displayTimeUnit and otherData with the summary table
+        """
+        with self._lock:
+            spans = sorted((event for event, _, _ in self._events), key=lambda e: e["ts"])
+            threads = sorted((tid, name) for name, tid in self._threads.items())
+        events: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": "debate"}}
+        ]
+        for tid, name in threads:
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}})
+            events.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": tid, "args": {"sort_index": tid}})
+        events.extend(spans)
+        other_data = dict(metadata or {}, started_at=self.started_at, summary=self.summary())
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": other_data}
+
+    def save(self, path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Writes the Chrome trace to a file
+
+        Args:
+            path: Trace file path
+            metadata: Extra fields stored in otherData
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_chrome_trace(metadata), f)
+        os.replace(tmp_path, path)
+
+    def print_summary(self) -> None:
+        """Prints where the wall time went, by span and by thread"""
+        summary = self.summary()
+        print(f"\n=== Trace Summary (wall time {summary['wall_time']:.2f}s) ===")
+        print(f"{'Span':<20} {'Count':>6} {'Total s':>9} {'Self s':>9} {'Mean s':>8} {'Max s':>8} {'Self %':>7}")
+        for row in summary["spans"]:
+            print(f"{row['name']:<20} {row['count']:>6} {row['total']:>9.2f} {row['self']:>9.2f} "
+                  f"{row['mean']:>8.3f} {row['max']:>8.3f} {row['self_share']:>7.1%}")
+        print(f"\n{'Thread':<30} {'Busy s':>9} {'Busy %':>7}")
+        for thread in summary["threads"]:
+            print(f"{thread['name']:<30} {thread['busy']:>9.2f} {thread['share']:>7.1%}")
+
+class NullTracer:
+    """Tracer stand-in used when tracing is off; spans cost one generator call"""
+    enabled = False
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        yield args
+
+NULL_TRACER = NullTracer()
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# The archive format is defined once, in debate-agent/debate_archive.py (the
+# writer); the viewer reads archives with the same index and block parsers
+DEBATE_AGENT_DIR = Path(__file__).resolve().parent.parent / "debate-agent"
+if str(DEBATE_AGENT_DIR) not in sys.path:
+    sys.path.append(str(DEBATE_AGENT_DIR))
+
+from debate_archive import ARCHIVE_EXTENSION, debate_filenames, read_archive_index, read_block
+
+# Files the viewer lists and indexes
+DEBATE_EXTENSIONS = (".json", ARCHIVE_EXTENSION)
+
+class ArchiveReader:
+    """
+    Random access to a debate archive
+
+    Opening reads only the trailer and the block index; the summary and
+    each round are decompressed on demand, so a single round of a long
+    debate costs one small read.
+    """
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        try:
+            index = read_archive_index(self.file)
+        except ValueError as e:
+            self.file.close()
+            raise ValueError(f"{path}: {e}")
+        except Exception:
+            self.file.close()
+            raise
+        self._summary_block = tuple(index["summary"])
+        self._round_blocks = {number: (offset, length) for number, offset, length in index["rounds"]}
+        self.round_numbers: List[int] = [number for number, _, _ in index["rounds"]]
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def _read_block(self, location: Tuple[int, int]) -> Any:
+        return read_block(self.file, location)
+
+    def summary(self) -> Dict[str, Any]:
+        """Top-level debate fields (no transcript), final_scores and round_count"""
+        return self._read_block(self._summary_block)
+
+    def round(self, number: int) -> Dict[str, Any]:
+        """
+        Returns one transcript round
+
+        Raises:
+            KeyError: If the debate has no such round
+        """
+        return self._read_block(self._round_blocks[number])
+
+    def rounds(self, first: Optional[int] = None, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Returns the transcript rounds numbered first..last (inclusive, open ends allowed)"""
+        return [
+            self._read_block(self._round_blocks[number]) for number in self.round_numbers
+            if (first is None or number >= first) and (last is None or number <= last)
+        ]
+
+    def debate(self) -> Dict[str, Any]:
+        """Returns the whole debate in the JSON transcript format"""
+        debate_data = self.summary()
+        debate_data.pop("final_scores", None)
+        debate_data.pop("round_count", None)
+        debate_data["transcript"] = self.rounds()
+        return debate_data
+
+def scan_debate_files(output_dir: str) -> List[os.DirEntry]:
+    """
+    Lists the saved debates in an output directory, one file per debate
+
+    Args:
+        output_dir: Debate output directory
+
+    Returns:
+        list: Directory entries of the transcripts and archives to read (see
+            debate_filenames; a .jsonz kept alongside its .json is left out)
+    """
+    with os.scandir(output_dir) as it:
+        entries = {entry.name: entry for entry in it}
+    return [entries[name] for name in debate_filenames(entries)]
+
+class DebateFileScanner:
+    """
+    Incremental scan of an output directory for the viewer's indexes
+
+    Remembers each file's mtime and size, so a rescan only hands new and
+    changed files to the caller. Files are keyed by filename; with a
+    round_log_extension, running debates' round logs are tracked too, files
+    are keyed by debate name, and a debate's round log is used instead of
+    its transcript while the log exists. The caller holds its own lock and
+    decides how often to rescan.
+    """
+    def __init__(self, output_dir: str, round_log_extension: Optional[str] = None):
+        self.output_dir = output_dir
+        self.round_log_extension = round_log_extension
+        self._versions: Dict[str, Tuple[str, int, int]] = {}  # key -> (filename, mtime_ns, size)
+
+    def _entries(self) -> Dict[str, os.DirEntry]:
+        """The files to track by key (filename, or debate name with round logs)"""
+        if not os.path.isdir(self.output_dir):
+            return {}
+        if not self.round_log_extension:
+            return {entry.name: entry for entry in scan_debate_files(self.output_dir)}
+        entries = {os.path.splitext(entry.name)[0]: entry for entry in scan_debate_files(self.output_dir)}
+        with os.scandir(self.output_dir) as it:
+            for entry in it:
+                if entry.name.endswith(self.round_log_extension) and not entry.name.startswith("."):
+                    entries[entry.name[:-len(self.round_log_extension)]] = entry
+        return entries
+
+    def scan(self, on_changed: Callable[[str, os.DirEntry], None], on_removed: Callable[[str], None]) -> bool:
+        """
+        Rescans the directory
+
+        Args:
+            on_changed: Called with the key and directory entry of each new or
+                changed file
+            on_removed: Called with the key of each file that is gone (or
+                can no longer be read)
+
+        Returns:
+            bool: Whether anything changed
+        """
+        seen = set()
+        changed = False
+        for key, entry in self._entries().items():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            seen.add(key)
+            version = (entry.name, stat.st_mtime_ns, stat.st_size)
+            if self._versions.get(key) == version:
+                continue
+            self._versions[key] = version
+            on_changed(key, entry)
+            changed = True
+
+        for key in set(self._versions) - seen:
+            del self._versions[key]
+            on_removed(key)
+            changed = True
+        return changed
+
+def load_debate_file(path: str) -> Dict[str, Any]:
+    """Reads a debate from a .json transcript or an archive"""
+    if str(path).endswith(ARCHIVE_EXTENSION):
+        with ArchiveReader(path) as reader:
+            return reader.debate()
+    with open(path, "r") as f:
+        return json.load(f)
+
+def parse_archive_query(query: Dict[str, List[str]]) -> Tuple[str, Optional[int], Optional[int]]:
+    """
+    Parses which part of an archive a /debate-agent/output/*.jsonz request asks for
+
+    With no parameters the whole debate is sent in the usual JSON shape;
+    "summary=1" asks for only the top-level fields, "round=N" for one round
+    and "rounds=A-B" for a range of rounds (either end may be left out).
+
+    Args:
+        query: Parsed query string
+
+    Returns:
+        tuple: (part, first round, last round), part being "debate", "summary", "round" or "rounds"
+
+    Raises:
+        ValueError: For malformed parameters
+    """
+    if "summary" in query:
+        return "summary", None, None
+    if "round" in query:
+        try:
+            number = int(query["round"][0])
+        except ValueError:
+            raise ValueError("round must be an integer")
+        return "round", number, number
+    if "rounds" in query:
+        first, _, last = query["rounds"][0].partition("-")
+        try:
+            return "rounds", int(first) if first else None, int(last) if last else None
+        except ValueError:
+            raise ValueError("rounds must look like 1-10, 5- or -3")
+    return "debate", None, None
+
+def read_archive_part(path: str, part: str, first: Optional[int] = None, last: Optional[int] = None) -> Any:
+    """
+    Reads one part of an archive, decompressing only the blocks it needs
+
+    Args:
+        path: Archive path
+        part: "debate", "summary", "round" or "rounds" (see parse_archive_query)
+        first: The round of a "round" part, or the first of a "rounds" part
+        last: Last round of a "rounds" part
+
+    Returns:
+        The debate or summary dict, a single round for round=N, or a list of rounds
+
+    Raises:
+        KeyError: For round=N when the debate has no round N
+    """
+    with ArchiveReader(path) as reader:
+        if part == "summary":
+            return reader.summary()
+        if part == "round":
+            return reader.round(first)
+        if part == "rounds":
+            return reader.rounds(first, last)
+        return reader.debate()
@@ -0,0 +1,231 @@
+import os
+import asyncio
+from http import HTTPStatus
+from email.utils import formatdate
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse, unquote, parse_qs
+
+from routes import Response, ViewerApp, error_response
+from live_stream import ROUND_LOG_EXTENSION, LIVE_POLL_INTERVAL, RoundLogTail, stream_events
+from file_serving import LISTEN_BACKLOG
+
+# Requests processed at the same time; later requests wait for a free slot
+MAX_CONCURRENT_REQUESTS = 64
+
+# Open connections accepted at once; further connections get a 503
+MAX_CONNECTIONS = 1024
+
+# Seconds an idle keep-alive connection is kept open
+KEEP_ALIVE_TIMEOUT = 15.0
+
+# Requests served on one connection before it is closed
+MAX_REQUESTS_PER_CONNECTION = 1000
+
+# Longest accepted request line or header line
+MAX_LINE_BYTES = 8192
+MAX_HEADERS = 100
+
+class HTTPRequest:
+    """A parsed HTTP/1.x request head"""
+    def __init__(self, method: str, target: str, version: str, headers: Dict[str, str]):
+        self.method = method
+        self.version = version
+        self.headers = headers  # Lower-cased names
+        parsed = urlparse(target)
+        self.path = unquote(parsed.path)
+        self.query = parse_qs(parsed.query)
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants the connection kept open after this request"""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return "keep-alive" in connection
+        return "close" not in connection
+
+class AsyncDebateViewerServer:
+    """
+    Single-threaded asyncio server for the Debate Viewer
+
+    Serves the routes of routes.ViewerApp, like DebateViewerHandler, with
+    HTTP/1.1 keep-alive. Request handling is bounded by a semaphore, and
+    connections beyond max_connections are refused with 503 instead of
+    queuing without limit. The routes block (directory scans, compression),
+    so they run in the default thread pool, and files are sent with
+    loop.sendfile().
+    """
+    def __init__(self, output_dir: Path, static_dir: Path,
+                 max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+                 max_connections: int = MAX_CONNECTIONS, database_path: Optional[Path] = None):
+        self.app = ViewerApp(output_dir, static_dir, database_path)
+        self.max_connections = max_connections
+        self.connections = 0
+        self._request_slots = asyncio.Semaphore(max_concurrent_requests)
+
+    async def start(self, host: str = "", port: int = 8000) -> asyncio.AbstractServer:
+        """Starts listening; serve with the returned server's serve_forever()"""
+        return await asyncio.start_server(self.handle_connection, host or None, port, limit=MAX_LINE_BYTES,
+                                          backlog=LISTEN_BACKLOG)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves requests on one connection until it closes or goes idle"""
+        if self.connections >= self.max_connections:
+            await self.send_error(writer, 503, "Too many connections", keep_alive=False)
+            writer.close()
+            return
+
+        self.connections += 1
+        try:
+            for _ in range(MAX_REQUESTS_PER_CONNECTION):
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ValueError as e:
+                    await self.send_error(writer, 400, str(e), keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                if request.path.startswith("/debate-stream/") and request.path.endswith(ROUND_LOG_EXTENSION):
+                    # Long-lived streams don't hold a request slot
+                    await self.stream_debate(request, writer)
+                    break
+
+                async with self._request_slots:
+                    try:
+                        keep_alive = await self.dispatch(request, writer)
+                    except ConnectionError:
+                        raise
+                    except Exception as e:
+                        # Same answer DebateViewerHandler gives; the connection is
+                        # closed since a partly written response can't be recovered
+                        print(f"Error handling {request.method} {request.path}: {e}")
+                        await self.send_error(writer, 500, f"Server error: {str(e)}", keep_alive=False,
+                                              head_only=request.method == "HEAD")
+                        break
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass  # Client went away
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+        """
+        Reads one request head, or returns None when the client closed the connection
+
+        Raises:
+            ValueError: If the request is malformed
+        """
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+            raise ValueError("Bad request line")
+        method, target, version = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise ValueError("Too many headers")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        # GET and HEAD have no meaningful body; drain one if sent
+        length = int(headers.get("content-length", "0") or 0)
+        if length:
+            await reader.readexactly(length)
+        return HTTPRequest(method, target, version, headers)
+
+    async def dispatch(self, request: HTTPRequest, writer: asyncio.StreamWriter) -> bool:
+        """
+        Answers a request through ViewerApp.handle, run in a worker thread
+
+        Returns:
+            bool: Whether the connection can be kept open
+        """
+        response = await asyncio.to_thread(self.app.handle, request.method, request.path,
+                                           request.query, request.headers)
+        await self.send_response(writer, response, request.keep_alive, request.method == "HEAD")
+        return request.keep_alive
+
+    async def stream_debate(self, request: HTTPRequest, writer: asyncio.StreamWriter) -> None:
+        """Streams a running debate's round log as Server-Sent Events (see DebateViewerHandler.stream_debate)"""
+        file_path = self.app.output_dir / os.path.basename(request.path)
+        try:
+            offset = int(request.headers.get("last-event-id", "0"))
+        except ValueError:
+            offset = 0
+
+        try:
+            tail = RoundLogTail(file_path, offset)
+        except FileNotFoundError:
+            await self.send_head(writer, 204, {}, 0, keep_alive=False)
+            return
+
+        await self.send_head(writer, 200, {
+            "Content-type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "Access-Control-Allow-Origin": "*",
+        }, None, keep_alive=False)
+
+        try:
+            for data in stream_events(tail, str(file_path)):
+                if data is None:
+                    await asyncio.sleep(LIVE_POLL_INTERVAL)
+                else:
+                    writer.write(data)
+                    await writer.drain()
+        finally:
+            tail.close()
+
+    async def send_head(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str],
+                        content_length: Optional[int], keep_alive: bool) -> None:
+        """Writes the status line and headers"""
+        lines = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            "Server: DebateViewer-asyncio",
+            f"Date: {formatdate(usegmt=True)}",
+        ]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        if content_length is not None:
+            lines.append(f"Content-Length: {content_length}")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def send_response(self, writer: asyncio.StreamWriter, response: Response,
+                            keep_alive: bool, head_only: bool = False) -> None:
+        """Writes a route's Response; HEAD requests get only the status line and headers"""
+        await self.send_head(writer, response.status, response.headers, response.content_length, keep_alive)
+        if head_only or response.content_length is None:
+            await writer.drain()
+            return
+        if response.file_path is None:
+            writer.write(response.body)
+            await writer.drain()
+            return
+        await writer.drain()
+        with open(response.file_path, "rb") as f:
+            # Zero-copy where the transport supports it (plain TCP on Unix)
+            await asyncio.get_running_loop().sendfile(writer.transport, f, 0, response.file_size)
+
+    async def send_error(self, writer: asyncio.StreamWriter, status: int, message: str, keep_alive: bool,
+                         head_only: bool = False) -> None:
+        """Sends a short plain-text error response"""
+        await self.send_response(writer, error_response(status, message), keep_alive, head_only)
+
+async def serve(port: int, output_dir: Path, static_dir: Path,
+                max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+                database_path: Optional[Path] = None) -> None:
+    """Runs the asyncio viewer server until cancelled"""
+    app = AsyncDebateViewerServer(output_dir, static_dir, max_concurrent_requests, database_path=database_path)
+    server = await app.start("", port)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,163 @@
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Database written by debate-agent's DebateLogger (main.py --database)
+DATABASE_FILENAME = "debates.db"
+
+# Rows returned per /db/* page when no limit is given
+DEFAULT_QUERY_LIMIT = 100
+
+# Views served under /db/<view>
+DATABASE_VIEWS = ["debates", "evaluations"]
+
+DEBATE_COLUMNS = "d.filename, d.topic, d.timestamp, d.position_x, d.position_y_debaters, d.rounds, d.rotations"
+
+class DebateDatabase:
+    """
+    Read-only queries over the SQLite debate database
+
+    Every filter maps to an index of the schema in debate-agent's
+    debate_store: topic and timestamp on debates, debater names on debaters,
+    replaced Position Y debaters on rounds and judges on evaluations.
+    A connection is opened per query, so the object can be shared between
+    server threads.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def exists(self) -> bool:
+        return self.path.is_file()
+
+    def _query(self, sql: str, params: List[Any]) -> List[sqlite3.Row]:
+        conn = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def find_debates(self, topic: Optional[str] = None, debater: Optional[str] = None,
+                     judge: Optional[str] = None, replaced: Optional[str] = None,
+                     since: Optional[str] = None, until: Optional[str] = None,
+                     offset: int = 0, limit: int = DEFAULT_QUERY_LIMIT) -> Dict[str, Any]:
+        """
+        Returns the debates matching every given filter, latest first
+
+        Args:
+            topic: Exact debate topic
+            debater: Took part in the debate (either position or as a judge)
+            judge: Judged at least one round
+            replaced: Position Y debater who was voted out and rotated
+            since: Earliest timestamp (YYYYmmdd_HHMMSS, inclusive)
+            until: Latest timestamp (inclusive)
+            offset: Rows to skip
+            limit: Maximum rows to return
+
+        Returns:
+            dict: Paging parameters and the matching debates in /list-debates format
+        """
+        conditions, params = [], []
+        if topic is not None:
+            conditions.append("d.topic = ?")
+            params.append(topic)
+        if since is not None:
+            conditions.append("d.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("d.timestamp <= ?")
+            params.append(until)
+        if debater is not None:
+            conditions.append("d.id IN (SELECT debate_id FROM debaters WHERE name = ?)")
+            params.append(debater)
+        if judge is not None:
+            conditions.append("d.id IN (SELECT debate_id FROM evaluations WHERE judge_name = ?)")
+            params.append(judge)
+        if replaced is not None:
+            conditions.append("d.id IN (SELECT debate_id FROM rounds WHERE position_y_name = ? AND replaced = 1)")
+            params.append(replaced)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._query(
+            f"SELECT {DEBATE_COLUMNS} FROM debates d {where} ORDER BY d.timestamp DESC, d.id DESC LIMIT ? OFFSET ?",
+            params + [limit, max(0, offset)]
+        )
+        debates = []
+        for row in rows:
+            debate = dict(row)
+            debate["position_y_debaters"] = json.loads(debate["position_y_debaters"])
+            debates.append(debate)
+        return {"offset": max(0, offset), "limit": limit, "debates": debates}
+
+    def find_evaluations(self, judge: Optional[str] = None, debater: Optional[str] = None,
+                         filename: Optional[str] = None, offset: int = 0,
+                         limit: int = DEFAULT_QUERY_LIMIT) -> Dict[str, Any]:
+        """
+        Returns judge evaluations, latest debates first
+
+        Args:
+            judge: Only evaluations by this judge
+            debater: Only evaluations of this Position Y debater
+            filename: Only evaluations from this debate file
+            offset: Rows to skip
+            limit: Maximum rows to return
+
+        Returns:
+            dict: Paging parameters and the evaluations with their debate and round
+        """
+        conditions, params = [], []
+        if judge is not None:
+            conditions.append("e.judge_name = ?")
+            params.append(judge)
+        if debater is not None:
+            conditions.append("e.position_y_name = ?")
+            params.append(debater)
+        if filename is not None:
+            conditions.append("d.filename = ?")
+            params.append(filename)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._query(
+            "SELECT d.filename, d.topic, d.timestamp, e.round, e.judge_name, e.position_y_name, e.total_score, "
+            "e.vote, e.comments, e.criteria_scores FROM evaluations e JOIN debates d ON d.id = e.debate_id "
+            f"{where} ORDER BY d.timestamp DESC, e.debate_id DESC, e.round LIMIT ? OFFSET ?",
+            params + [limit, max(0, offset)]
+        )
+        evaluations = []
+        for row in rows:
+            evaluation = dict(row)
+            evaluation["criteria_scores"] = json.loads(evaluation["criteria_scores"] or "{}")
+            evaluations.append(evaluation)
+        return {"offset": max(0, offset), "limit": limit, "evaluations": evaluations}
+
+    def query(self, view: str, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """
+        Runs a /db/<view> request for the server
+
+        Args:
+            view: "debates" or "evaluations"
+            query: Parsed query string
+
+        Raises:
+            LookupError: For an unknown view or if the database doesn't exist
+            ValueError: For a non-integer offset or limit
+        """
+        if view not in DATABASE_VIEWS:
+            raise LookupError(f"Invalid database view '{view}'. Available views: {DATABASE_VIEWS}")
+        if not self.exists():
+            raise LookupError(f"No debate database at {self.path} (run debates with --database)")
+
+        def param(name: str) -> Optional[str]:
+            return query.get(name, [None])[0]
+
+        try:
+            offset = int(param("offset") or 0)
+            limit = int(param("limit") or DEFAULT_QUERY_LIMIT)
+        except ValueError:
+            raise ValueError("offset and limit must be integers")
+
+        if view == "debates":
+            return self.find_debates(param("topic"), param("debater"), param("judge"), param("replaced"),
+                                     param("since"), param("until"), offset, limit)
+        return self.find_evaluations(param("judge"), param("debater"), param("filename"), offset, limit)
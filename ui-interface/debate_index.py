@@ -0,0 +1,152 @@
+import os
+import re
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from archive_reader import ArchiveReader, ARCHIVE_EXTENSION, DebateFileScanner
+
+# Fields /list-debates can sort on
+SORT_FIELDS = ["timestamp", "topic", "rounds", "rotations", "final_score", "filename"]
+
+# Debates returned per /list-debates page when no limit is given
+DEFAULT_PAGE_SIZE = 100
+
+# Minimum seconds between directory rescans, so bursts of requests share one scan
+REFRESH_INTERVAL = 1.0
+
+TIMESTAMP_PATTERN = re.compile(r"(\d{8}_\d{6})")
+
+class DebateIndex:
+    """
+    In-memory metadata index of the debate files in an output directory
+
+    Each file is parsed once and its summary kept together with the file's
+    mtime and size; a rescan only re-reads files whose stat changed, so
+    listing thousands of debates costs one directory scan.
+    """
+    def __init__(self, output_dir: str, refresh_interval: float = REFRESH_INTERVAL):
+        self.output_dir = str(output_dir)
+        self.refresh_interval = refresh_interval
+        self.version = 0  # Incremented whenever an entry changes
+        self._scanner = DebateFileScanner(self.output_dir)
+        self._entries: Dict[str, Optional[Dict[str, Any]]] = {}  # filename -> summary
+        self._sorted: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def summarize(filename: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extracts the listing metadata from a debate transcript
+
+        Args:
+            filename: Name of the debate file
+            data: Parsed debate JSON, or an archive summary (which carries
+                final_scores and round_count instead of the transcript)
+
+        Returns:
+            dict: Topic, timestamp, counts, debaters and the last round's scores
+        """
+        timestamp = data.get("timestamp")
+        if not timestamp:
+            match = TIMESTAMP_PATTERN.search(filename)
+            timestamp = match.group(1) if match else ""
+
+        # Scores from the last round the judges voted on
+        final_scores = data.get("final_scores", {})
+        for round_data in reversed(data.get("transcript", [])):
+            evaluations = round_data.get("voting_results", {}).get("evaluations", [])
+            if evaluations:
+                final_scores = {e["judge_name"]: e["total_score"] for e in evaluations}
+                break
+
+        return {
+            "filename": filename,
+            "topic": data.get("topic", ""),
+            "timestamp": timestamp,
+            "rounds": data.get("rounds", data.get("round_count", len(data.get("transcript", [])))),
+            "rotations": data.get("rotations", 0),
+            "position_x": data.get("position_x", ""),
+            "position_y_debaters": data.get("position_y_debaters", []),
+            "final_scores": final_scores,
+            "final_score": round(sum(final_scores.values()) / len(final_scores), 2) if final_scores else None
+        }
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Rescans the output directory, re-reading only new or changed files
+
+        Args:
+            force: Rescan even if the last scan was within refresh_interval
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = now
+
+            def on_changed(name: str, entry: os.DirEntry) -> None:
+                self._entries[name] = self._load(entry.path, name)
+
+            if self._scanner.scan(on_changed, lambda name: self._entries.pop(name, None)):
+                self._changed()
+
+    def _changed(self) -> None:
+        """Invalidates derived views (lock must be held)"""
+        self.version += 1
+        self._sorted = {}
+
+    def _load(self, path: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Parses one debate file; files still being written (or invalid) are skipped"""
+        try:
+            if filename.endswith(ARCHIVE_EXTENSION):
+                # Only the summary block is decompressed
+                with ArchiveReader(path) as reader:
+                    return self.summarize(filename, reader.summary())
+            with open(path, "r") as f:
+                data = json.load(f)
+            return self.summarize(filename, data)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def list_debates(self, sort: str = "timestamp", descending: bool = True,
+                     offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Returns one page of debate metadata
+
+        Args:
+            sort: One of SORT_FIELDS
+            descending: Sort order
+            offset: Index of the first debate to return
+            limit: Maximum number of debates to return (None for all)
+
+        Returns:
+            dict: Total count, paging parameters and the page of debates
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Invalid sort field '{sort}'. Available fields: {SORT_FIELDS}")
+        self.refresh()
+
+        with self._lock:
+            ordered = self._sorted.get((sort, descending))
+            if ordered is None:
+                debates = [meta for meta in self._entries.values() if meta]
+                # Missing values (e.g. no final score) sort last in either order
+                present = [d for d in debates if d[sort] is not None]
+                missing = [d for d in debates if d[sort] is None]
+                present.sort(key=lambda d: (d[sort], d["filename"]), reverse=descending)
+                ordered = present + missing
+                self._sorted[(sort, descending)] = ordered
+
+        offset = max(0, offset)
+        page = ordered[offset:offset + limit] if limit is not None else ordered[offset:]
+        return {
+            "total": len(ordered),
+            "offset": offset,
+            "limit": limit,
+            "sort": sort,
+            "order": "desc" if descending else "asc",
+            "debates": page
+        }
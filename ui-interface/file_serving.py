@@ -0,0 +1,134 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional, Tuple
+
+# Files smaller than this are sent uncompressed (gzip framing isn't worth it)
+GZIP_MIN_SIZE = 1024
+
+# Total size of compressed variants kept in memory
+GZIP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Connections the listening socket queues before accept() (both servers);
+# socketserver's default of 5 makes bursts of new connections wait out SYN
+# retransmits, which shows up as ~1 s tail latency
+LISTEN_BACKLOG = 128
+
+# Chrome traces written next to transcripts by debate-agent (main.py --trace);
+# they are JSON and served like the transcripts
+TRACE_EXTENSION = ".trace"
+
+def file_etag(stat: os.stat_result, variant: Optional[str] = None) -> str:
+    """
+    Builds a strong ETag from a file's mtime and size
+
+    Each content encoding (or part of an archive) is a different
+    representation, so it gets its own tag.
+    """
+    tag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    if variant:
+        tag += f"-{variant}"
+    return f'"{tag}"'
+
+def last_modified(stat: os.stat_result) -> str:
+    """Formats a file's mtime for the Last-Modified header"""
+    return formatdate(stat.st_mtime, usegmt=True)
+
+def is_not_modified(if_none_match: Optional[str], if_modified_since: Optional[str],
+                    etag: str, stat: os.stat_result) -> bool:
+    """
+    Evaluates conditional request headers against the current file
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2).
+
+    Args:
+        if_none_match: If-None-Match header value, if any
+        if_modified_since: If-Modified-Since header value, if any
+        etag: Current ETag of the representation
+        stat: Current file stat
+
+    Returns:
+        bool: True if the client's copy is current and a 304 can be sent
+    """
+    if if_none_match:
+        tags = [t.strip() for t in if_none_match.split(",")]
+        # Weak comparison: a W/ prefix doesn't matter for GET
+        return "*" in tags or etag in (t[2:] if t.startswith("W/") else t for t in tags)
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since is None:
+            return False
+        return int(stat.st_mtime) <= since.timestamp()
+    return False
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Returns True if an Accept-Encoding header allows gzip (and doesn't give it q=0)"""
+    if not accept_encoding:
+        return False
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    # An explicit gzip entry overrides the wildcard
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+class GzipVariantCache:
+    """
+    Compressed copies of files, kept in memory and keyed by path, mtime and size
+
+    A file is compressed once per version; when it changes on disk the stale
+    variant is replaced on the next request. Least recently used variants are
+    dropped once the cache exceeds max_bytes.
+    """
+    def __init__(self, max_bytes: int = GZIP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._variants: "OrderedDict[str, Tuple[int, int, bytes]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat: os.stat_result) -> bytes:
+        """
+        Returns the gzip-compressed contents of path, compressing it if needed
+
+        Args:
+            path: File path
+            stat: Current stat of the file (identifies the version)
+
+        Returns:
+            bytes: Compressed file contents
+        """
+        key = str(path)
+        with self._lock:
+            cached = self._variants.get(key)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._variants.move_to_end(key)
+                return cached[2]
+
+        # Compress outside the lock so other files can be served meanwhile
+        with open(path, "rb") as f:
+            data = gzip.compress(f.read(), compresslevel=6)
+
+        with self._lock:
+            previous = self._variants.pop(key, None)
+            if previous:
+                self._total_bytes -= len(previous[2])
+            if len(data) <= self.max_bytes:
+                self._variants[key] = (stat.st_mtime_ns, stat.st_size, data)
+                self._total_bytes += len(data)
+                while self._total_bytes > self.max_bytes:
+                    _, (_, _, evicted) = self._variants.popitem(last=False)
+                    self._total_bytes -= len(evicted)
+        return data
@@ -0,0 +1,148 @@
+import os
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Round logs of debates in progress (written by debate-agent's DebateLogger)
+ROUND_LOG_EXTENSION = ".jsonl"
+
+# Seconds between checks for new records while a debate is quiet
+LIVE_POLL_INTERVAL = 0.5
+
+# Seconds of silence before a keep-alive comment is sent to the client
+LIVE_KEEPALIVE_INTERVAL = 15.0
+
+# Seconds a round log can go unwritten before its debate counts as interrupted
+# (killed or crashed); a running debate appends a record after every turn
+LIVE_IDLE_TIMEOUT = 600.0
+
+def list_live_debates(output_dir: str) -> List[Dict[str, Any]]:
+    """
+    Lists debates that are still running
+
+    A debate is running while its round log exists and has been written
+    within LIVE_IDLE_TIMEOUT; logs left behind by killed runs are skipped.
+    Only the first record of each log is read.
+
+    Args:
+        output_dir: Debate output directory
+
+    Returns:
+        list: Filename, topic, Position X and timestamp of each live debate, latest first
+    """
+    debates = []
+    if not os.path.isdir(output_dir):
+        return debates
+    now = time.time()
+    for filename in os.listdir(output_dir):
+        if not filename.endswith(ROUND_LOG_EXTENSION):
+            continue
+        path = os.path.join(output_dir, filename)
+        try:
+            if now - os.path.getmtime(path) >= LIVE_IDLE_TIMEOUT:
+                continue
+            with open(path, "r") as f:
+                start = json.loads(f.readline())
+        except (OSError, ValueError):
+            continue
+        debates.append({
+            "filename": filename,
+            "topic": start.get("topic", ""),
+            "position_x": start.get("position_x", ""),
+            "timestamp": start.get("timestamp", "")
+        })
+    debates.sort(key=lambda d: d["timestamp"], reverse=True)
+    return debates
+
+def format_event(record: Dict[str, Any], event_id: int) -> bytes:
+    """
+    Encodes a round log record as a Server-Sent Event
+
+    The event name is the record type and the id is the byte offset just
+    after the record, so a reconnecting client's Last-Event-ID says where
+    to continue.
+    """
+    return f"id: {event_id}\nevent: {record.get('type', 'message')}\ndata: {json.dumps(record)}\n\n".encode("utf-8")
+
+class RoundLogTail:
+    """
+    Incremental reader of a round log that is still being appended to
+
+    The file stays open, so records can still be read after the debate
+    finishes and DebateLogger removes the log.
+    """
+    def __init__(self, path: str, offset: int = 0):
+        self.file = open(path, "rb")
+        self.file.seek(offset)
+        self.offset = offset
+        self._partial = b""
+
+    def read_records(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Returns the complete records appended since the last call
+
+        Returns:
+            list: (offset after the record, record) pairs
+        """
+        data = self.file.read()
+        if not data:
+            return []
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()  # Incomplete last line, if any
+        records = []
+        for line in lines:
+            self.offset += len(line) + 1
+            try:
+                records.append((self.offset, json.loads(line)))
+            except ValueError:
+                continue
+        return records
+
+    def idle_seconds(self) -> float:
+        """Seconds since the round log was last written"""
+        return time.time() - os.fstat(self.file.fileno()).st_mtime
+
+    def close(self) -> None:
+        self.file.close()
+
+def stream_events(tail: RoundLogTail, path: str) -> Iterator[Optional[bytes]]:
+    """
+    Turns a round log into Server-Sent Event data for either server
+
+    Every record already in the log is sent first, then new ones as they
+    are appended. The stream ends after the debate's "end" record, with a
+    synthetic "end" once the log is removed (the debate was saved), or with
+    an "interrupted" event once the log has gone LIVE_IDLE_TIMEOUT without
+    a write (the run was killed).
+
+    Args:
+        tail: Reader positioned where the client wants to start
+        path: Round log path, checked to see whether the debate was saved
+
+    Yields:
+        bytes to send, or None when the caller should wait LIVE_POLL_INTERVAL
+    """
+    last_sent = time.monotonic()
+    while True:
+        records = tail.read_records()
+        if records:
+            yield b"".join(format_event(record, event_id) for event_id, record in records)
+            if any(record.get("type") == "end" for _, record in records):
+                return
+            last_sent = time.monotonic()
+            continue
+        if not os.path.exists(path):
+            # The debate was saved; send what was appended just before
+            records = tail.read_records()
+            data = b"".join(format_event(record, event_id) for event_id, record in records)
+            if not any(record.get("type") == "end" for _, record in records):
+                data += format_event({"type": "end"}, tail.offset)
+            yield data
+            return
+        if tail.idle_seconds() >= LIVE_IDLE_TIMEOUT:
+            yield format_event({"type": "interrupted"}, tail.offset)
+            return
+        if time.monotonic() - last_sent >= LIVE_KEEPALIVE_INTERVAL:
+            yield b": keep-alive\n\n"
+            last_sent = time.monotonic()
+        yield None
@@ -0,0 +1,269 @@
+import os
+import json
+import heapq
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from archive_reader import DebateFileScanner, load_debate_file
+from live_stream import ROUND_LOG_EXTENSION
+
+# Minimum seconds between directory rescans
+REFRESH_INTERVAL = 2.0
+
+# Upper bounds (seconds) of the call duration and time-to-first-token histograms
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Latest calls per model and host used for the recent throughput gauge
+RECENT_CALLS = 20
+
+# Content type of the Prometheus text exposition format
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def transcript_llm_calls(debate_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yields the LLM call metrics recorded in a debate (turns, votes and late summaries)"""
+    for round_data in debate_data.get("transcript", []):
+        yield from round_data.get("position_x_llm_calls", [])
+        yield from round_data.get("position_y_llm_calls", [])
+        yield from (round_data.get("voting_results") or {}).get("llm_calls", [])
+    yield from debate_data.get("llm_calls", [])
+
+def round_log_llm_calls(path: str) -> Iterator[Dict[str, Any]]:
+    """Yields the LLM call metrics in a running debate's round log"""
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # Partially written last line
+            kind = record.get("type")
+            if kind == "round":
+                yield from record["data"].get("position_x_llm_calls", [])
+                yield from record["data"].get("position_y_llm_calls", [])
+            elif kind == "votes":
+                yield from record["voting_results"].get("llm_calls", [])
+            elif kind == "end":
+                yield from record.get("llm_calls", [])
+
+def _number(value: Any) -> Optional[float]:
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+class _Totals:
+    """Counters, histograms and recent throughput samples for a set of LLM calls"""
+    def __init__(self):
+        self.calls: Dict[Tuple[str, str, str, str], int] = {}                  # (model, host, kind, cached)
+        self.tokens: Dict[Tuple[str, str, str], List[float]] = {}              # -> [prompt, completion]
+        self.backend_seconds: Dict[Tuple[str, str], List[float]] = {}          # -> [prompt eval, eval, load]
+        self.durations: Dict[Tuple[str, str, str], List[float]] = {}           # -> bucket counts + [count, sum]
+        self.first_token: Dict[Tuple[str, str], List[float]] = {}
+        self.recent: Dict[Tuple[str, str], List[Tuple[float, float, float]]] = {}  # -> (timestamp, tokens, seconds)
+        self.last_call: Dict[Tuple[str, str], float] = {}
+
+    @staticmethod
+    def _observe(histograms: Dict, key: Tuple, value: float) -> None:
+        histogram = histograms.setdefault(key, [0] * (len(DURATION_BUCKETS) + 2))
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                histogram[i] += 1
+        histogram[-2] += 1
+        histogram[-1] += value
+
+    def add_call(self, call: Dict[str, Any]) -> None:
+        """Counts one call record (as written by the debate agents)"""
+        model = str(call.get("model", "unknown"))
+        host = str(call.get("host", "unknown"))
+        kind = str(call.get("kind", "unknown"))
+        cached = bool(call.get("cached"))
+        key = (model, host, kind, "true" if cached else "false")
+        self.calls[key] = self.calls.get(key, 0) + 1
+        timestamp = _number(call.get("timestamp"))
+        if timestamp is not None:
+            self.last_call[model, host] = max(self.last_call.get((model, host), 0.0), timestamp)
+        if cached:
+            return  # Replayed responses say nothing about the backend
+
+        tokens = self.tokens.setdefault((model, host, kind), [0, 0])
+        tokens[0] += _number(call.get("prompt_tokens")) or 0
+        tokens[1] += _number(call.get("completion_tokens")) or 0
+        seconds = self.backend_seconds.setdefault((model, host), [0.0, 0.0, 0.0])
+        for i, field in enumerate(("prompt_eval_duration", "eval_duration", "load_duration")):
+            seconds[i] += _number(call.get(field)) or 0.0
+
+        wall_time = _number(call.get("wall_time"))
+        if wall_time is not None:
+            self._observe(self.durations, (model, host, kind), wall_time)
+        first_token = _number(call.get("time_to_first_token"))
+        if first_token is not None:
+            self._observe(self.first_token, (model, host), first_token)
+
+        completion_tokens = _number(call.get("completion_tokens"))
+        eval_duration = _number(call.get("eval_duration"))
+        if timestamp is not None and completion_tokens and eval_duration:
+            samples = self.recent.setdefault((model, host), [])
+            samples.append((timestamp, completion_tokens, eval_duration))
+            if len(samples) > RECENT_CALLS:
+                samples[:] = heapq.nlargest(RECENT_CALLS, samples)
+
+    def merge(self, other: "_Totals") -> None:
+        """Adds another set of totals into this one"""
+        for key, count in other.calls.items():
+            self.calls[key] = self.calls.get(key, 0) + count
+        for target, source in ((self.tokens, other.tokens), (self.backend_seconds, other.backend_seconds),
+                               (self.durations, other.durations), (self.first_token, other.first_token)):
+            for key, values in source.items():
+                totals = target.setdefault(key, [0] * len(values))
+                for i, value in enumerate(values):
+                    totals[i] += value
+        for key, samples in other.recent.items():
+            self.recent[key] = heapq.nlargest(RECENT_CALLS, self.recent.get(key, []) + samples)
+        for key, timestamp in other.last_call.items():
+            self.last_call[key] = max(self.last_call.get(key, 0.0), timestamp)
+
+def _labels(**labels: str) -> str:
+    """Formats a label set, escaping values as the exposition format requires"""
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class LLMMetrics:
+    """
+    Prometheus metrics for the LLM calls recorded in debate transcripts
+
+    Debate agents store one metrics record per LLM call in the transcript
+    (wall time, token counts and backend durations). This aggregates them,
+    including running debates' round logs, into counters and histograms by
+    model, host and kind of call, plus a gauge of recent generation speed
+    that shows a slow or overloaded model host. Like DebateIndex, each file
+    is re-read only when its mtime or size changes and its totals are
+    cached, so a scrape only merges per-debate totals.
+    """
+    def __init__(self, output_dir: str, refresh_interval: float = REFRESH_INTERVAL):
+        self.output_dir = str(output_dir)
+        self.refresh_interval = refresh_interval
+        self._scanner = DebateFileScanner(self.output_dir, ROUND_LOG_EXTENSION)
+        self._files: Dict[str, _Totals] = {}  # debate stem -> totals
+        self._removed = _Totals()  # Calls of debates whose files have since been deleted
+        self._last_refresh = 0.0
+        self._text: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Reads new and changed transcripts and round logs
+
+        Each debate is counted from one file: its round log while that
+        exists (the debate is running, or compaction never happened), else
+        its transcript or archive. When a debate's files are all deleted its
+        totals are kept, so the counters never go down.
+
+        Args:
+            force: Rescan even if the last scan was within refresh_interval
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = now
+
+            def on_changed(stem: str, entry: os.DirEntry) -> None:
+                self._files[stem] = self._read_file(entry.path, os.path.splitext(entry.name)[1])
+
+            def on_removed(stem: str) -> None:
+                self._removed.merge(self._files.pop(stem))
+
+            if self._scanner.scan(on_changed, on_removed):
+                self._text = None
+
+    @staticmethod
+    def _read_file(path: str, extension: str) -> _Totals:
+        """Totals of the calls recorded in one transcript or round log"""
+        totals = _Totals()
+        try:
+            if extension == ROUND_LOG_EXTENSION:
+                calls = list(round_log_llm_calls(path))
+            else:
+                calls = list(transcript_llm_calls(load_debate_file(path)))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return totals  # Still being written or not a debate
+        for call in calls:
+            if isinstance(call, dict):
+                totals.add_call(call)
+        return totals
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format
+
+        Returns:
+            str: Metrics text (see METRICS_CONTENT_TYPE)
+        """
+        self.refresh()
+        with self._lock:
+            if self._text is None:
+                totals = _Totals()
+                totals.merge(self._removed)
+                for file_totals in self._files.values():
+                    totals.merge(file_totals)
+                self._text = self._format(totals, len(self._files))
+            return self._text
+
+    @staticmethod
+    def _format(totals: _Totals, files: int) -> str:
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, histograms: Dict, label_names: Tuple[str, ...]) -> None:
+            for key, values in sorted(histograms.items()):
+                labels = dict(zip(label_names, key))
+                for bound, count in zip(DURATION_BUCKETS, values):
+                    lines.append(f"{name}_bucket{_labels(**labels, le=repr(bound))} {count}")
+                lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {values[-2]}")
+                lines.append(f"{name}_sum{_labels(**labels)} {_format_value(round(values[-1], 4))}")
+                lines.append(f"{name}_count{_labels(**labels)} {values[-2]}")
+
+        metric("debate_llm_transcripts", "gauge", "Debates (transcripts, archives or round logs) currently in the output directory")
+        lines.append(f"debate_llm_transcripts {files}")
+
+        metric("debate_llm_calls_total", "counter", "LLM calls, including responses replayed from the cache")
+        for (model, host, kind, cached), count in sorted(totals.calls.items()):
+            lines.append(f"debate_llm_calls_total{_labels(model=model, host=host, kind=kind, cached=cached)} {count}")
+
+        for index, name, help_text in ((0, "debate_llm_prompt_tokens_total", "Prompt tokens evaluated by the backend"),
+                                       (1, "debate_llm_completion_tokens_total", "Tokens generated by the backend")):
+            metric(name, "counter", help_text)
+            for (model, host, kind), values in sorted(totals.tokens.items()):
+                lines.append(f"{name}{_labels(model=model, host=host, kind=kind)} {_format_value(values[index])}")
+
+        for index, name, help_text in (
+                (0, "debate_llm_prompt_eval_seconds_total", "Backend time spent evaluating prompts"),
+                (1, "debate_llm_eval_seconds_total", "Backend time spent generating tokens"),
+                (2, "debate_llm_load_seconds_total", "Backend time spent loading models")):
+            metric(name, "counter", help_text)
+            for (model, host), values in sorted(totals.backend_seconds.items()):
+                lines.append(f"{name}{_labels(model=model, host=host)} {_format_value(round(values[index], 4))}")
+
+        metric("debate_llm_call_duration_seconds", "histogram", "Wall time of LLM calls made to the backend")
+        histogram("debate_llm_call_duration_seconds", totals.durations, ("model", "host", "kind"))
+
+        metric("debate_llm_time_to_first_token_seconds", "histogram", "Time to the first streamed token")
+        histogram("debate_llm_time_to_first_token_seconds", totals.first_token, ("model", "host"))
+
+        metric("debate_llm_recent_tokens_per_second", "gauge",
+               f"Generation speed over the last {RECENT_CALLS} calls per model and host")
+        for (model, host), samples in sorted(totals.recent.items()):
+            seconds = sum(s[2] for s in samples)
+            if seconds > 0:
+                rate = round(sum(s[1] for s in samples) / seconds, 2)
+                lines.append(f"debate_llm_recent_tokens_per_second{_labels(model=model, host=host)} {_format_value(rate)}")
+
+        metric("debate_llm_last_call_timestamp_seconds", "gauge", "Unix time of the latest recorded call")
+        for (model, host), timestamp in sorted(totals.last_call.items()):
+            lines.append(f"debate_llm_last_call_timestamp_seconds{_labels(model=model, host=host)} {_format_value(timestamp)}")
+
+        return "\n".join(lines) + "\n"
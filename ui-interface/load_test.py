@@ -0,0 +1,230 @@
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+
+def write_sample_debates(output_dir: str, count: int, rounds: int = 6) -> List[str]:
+    """
+    Fills output_dir with synthetic debate transcripts in the saved format
+
+    Returns:
+        list: The filenames written
+    """
+    statement = ("This is a representative debate statement that makes an argument, cites evidence "
+                 "and responds to the opponent's previous points in some detail. ") * 8
+    filenames = []
+    for i in range(count):
+        transcript = []
+        for round_num in range(1, rounds + 1):
+            round_data = {
+                "round": round_num,
+                "position_x_name": "Load Test Advocate",
+                "position_y_name": "Load Test Challenger 1",
+                "position_x_statement": statement,
+                "position_y_statement": statement
+            }
+            if round_num < rounds:
+                round_data["voting_results"] = {
+                    "continue": True,
+                    "continue_votes": 3,
+                    "replace_votes": 0,
+                    "evaluations": [
+                        {
+                            "judge_name": f"Load Test Challenger {j}",
+                            "total_score": 3.6,
+                            "vote": "CONTINUE",
+                            "comments": "Solid rebuttal with specific evidence.",
+                            "criteria_scores": {"logical_reasoning": 4, "evidence_quality": 3}
+                        }
+                        for j in range(2, 5)
+                    ]
+                }
+            transcript.append(round_data)
+
+        timestamp = f"2025{(i // 86400) % 12 + 1:02d}01_{(i // 3600) % 24:02d}{(i // 60) % 60:02d}{i % 60:02d}"
+        filename = f"debate_Load_test_topic_{i}_{timestamp}.json"
+        with open(os.path.join(output_dir, filename), "w") as f:
+            json.dump({
+                "topic": f"Load test topic {i}",
+                "position_x": "Load Test Advocate",
+                "position_y_debaters": ["Load Test Challenger 1"],
+                "rounds": rounds,
+                "rotations": 0,
+                "transcript": transcript,
+                "timestamp": timestamp
+            }, f, indent=2)
+        filenames.append(filename)
+    return filenames
+
+def start_server(mode: str, port: int, output_dir: str) -> subprocess.Popen:
+    """Starts server.py in a subprocess and waits until it accepts connections"""
+    command = [sys.executable, SERVER_SCRIPT, "--port", str(port), "--output-dir", output_dir]
+    if mode == "async":
+        command.append("--async")
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError(f"{mode} server did not start on port {port}")
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class Connection:
+    """One client connection, reused while the server keeps it alive"""
+    def __init__(self, port: int):
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, path: str, headers: Dict[str, str]) -> int:
+        """Sends a GET and reads the full response; returns the status code"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        head = f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{self.port}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        self.writer.write((head + "\r\n").encode("latin-1"))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed")
+        version, status = status_line.decode("latin-1").split()[:2]
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            await self.reader.readexactly(int(response_headers["content-length"]))
+        else:
+            await self.reader.read()  # Body runs to the end of the connection
+
+        if version == "HTTP/1.0" or response_headers.get("connection", "").lower() == "close" \
+                or "content-length" not in response_headers:
+            self.close()
+        return int(status)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+async def run_load(port: int, paths: List[str], concurrency: int, duration: float,
+                   headers: Dict[str, str]) -> Tuple[List[float], int, float]:
+    """
+    Runs concurrency clients issuing requests back to back for duration seconds
+
+    Returns:
+        tuple: (latencies in seconds, error count, elapsed seconds)
+    """
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def client(worker: int) -> None:
+        nonlocal errors
+        connection = Connection(port)
+        i = worker
+        while time.monotonic() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                status = await connection.request(path, headers)
+                if status >= 400:
+                    errors += 1
+                else:
+                    latencies.append(time.perf_counter() - start)
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                errors += 1
+                connection.close()
+        connection.close()
+
+    start = time.monotonic()
+    await asyncio.gather(*(client(w) for w in range(concurrency)))
+    return latencies, errors, time.monotonic() - start
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the threaded and asyncio viewer servers')
+    parser.add_argument('--modes', default='threaded,async', help='Comma-separated server modes to test')
+    parser.add_argument('--concurrency', type=int, default=50, help='Concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per mode')
+    parser.add_argument('--debates', type=int, default=1000, help='Synthetic debates in the output directory')
+    parser.add_argument('--gzip', action='store_true', help='Send Accept-Encoding: gzip')
+    parser.add_argument('--json', type=str, help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp(prefix="debate_load_test_")
+    results = []
+    try:
+        filenames = write_sample_debates(output_dir, args.debates)
+        # The viewer's traffic: the listing, debate files and the page itself
+        paths = ["/list-debates?limit=100", "/viewer.html"]
+        paths += [f"/debate-agent/output/{name}" for name in filenames[:20]]
+        headers = {"Accept-Encoding": "gzip"} if args.gzip else {}
+
+        for mode in args.modes.split(","):
+            port = free_port()
+            process = start_server(mode, port, output_dir)
+            try:
+                # Warm the debate index and caches before measuring
+                asyncio.run(run_load(port, paths, 1, 1.0, headers))
+                latencies, errors, elapsed = asyncio.run(
+                    run_load(port, paths, args.concurrency, args.duration, headers)
+                )
+            finally:
+                process.terminate()
+                process.wait()
+            results.append({
+                "mode": mode,
+                "requests": len(latencies),
+                "errors": errors,
+                "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(latencies, 0.50) * 1000,
+                "p99_ms": percentile(latencies, 0.99) * 1000,
+                "mean_ms": statistics.mean(latencies) * 1000 if latencies else 0.0
+            })
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    header = f"{'mode':>9} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50(ms)':>9} {'p99(ms)':>9} {'mean(ms)':>9}"
+    print(f"{args.concurrency} clients, {args.duration:.0f}s per mode, {args.debates} debates"
+          f"{', gzip' if args.gzip else ''}")
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['mode']:>9} {row['requests']:>9} {row['errors']:>7} {row['requests_per_second']:>9.1f} "
+              f"{row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['mean_ms']:>9.2f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+import os
+import json
+import gzip
+import mimetypes
+import posixpath
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from debate_index import DebateIndex, DEFAULT_PAGE_SIZE
+from debate_database import DebateDatabase, DATABASE_FILENAME
+from search_index import SearchIndex, DEFAULT_SEARCH_LIMIT
+from llm_metrics import LLMMetrics, METRICS_CONTENT_TYPE
+from archive_reader import ARCHIVE_EXTENSION, parse_archive_query, read_archive_part
+from live_stream import list_live_debates
+from file_serving import (
+    GzipVariantCache, GZIP_MIN_SIZE, TRACE_EXTENSION, accepts_gzip, file_etag, is_not_modified, last_modified
+)
+
+try:
+    from score_analytics import ScoreAnalytics
+except ImportError:  # NumPy isn't installed; /analytics/* answers 501
+    ScoreAnalytics = None
+
+# URL prefix under which the debate output directory is served
+OUTPUT_PREFIX = "/debate-agent/output/"
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type",
+}
+
+class Response:
+    """
+    A route's answer, written out by either server
+
+    The content is either body, or the file at file_path sent whole (with
+    sendfile) whose size is file_size. 304 responses have neither.
+    """
+    def __init__(self, status: int, headers: Optional[Dict[str, str]] = None, body: bytes = b"",
+                 file_path: Optional[Path] = None, file_size: int = 0):
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+        self.file_path = file_path
+        self.file_size = file_size
+
+    @property
+    def content_length(self) -> Optional[int]:
+        """Content-Length to send, or None for responses without content"""
+        if self.status in (204, 304):
+            return None
+        return self.file_size if self.file_path else len(self.body)
+
+def json_response(data: Any) -> Response:
+    """A 200 JSON response with the viewer's CORS headers"""
+    return Response(200, {"Content-type": "application/json", **CORS_HEADERS}, json.dumps(data).encode("utf-8"))
+
+def error_response(status: int, message: str) -> Response:
+    """A short plain-text error response"""
+    return Response(status, {"Content-type": "text/plain; charset=utf-8"},
+                    f"{status} {message}\n".encode("utf-8", "replace"))
+
+def _cache_headers(etag: str, stat: os.stat_result) -> Dict[str, str]:
+    """Validators for a file; clients must revalidate before reuse"""
+    return {
+        "ETag": etag,
+        "Last-Modified": last_modified(stat),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+
+class ViewerApp:
+    """
+    The Debate Viewer's routes, shared by the threaded and asyncio servers
+
+    Holds the output directory's indexes, database, analytics, metrics and
+    gzip cache, and answers each request with a Response; the servers only
+    parse requests and write responses. Handlers block (directory scans,
+    SQLite, compression), so the asyncio server calls handle() in a thread.
+    Live debate streams are long-lived and stay in the servers (see
+    live_stream.stream_events).
+    """
+    def __init__(self, output_dir: Path, static_dir: Path, database_path: Optional[Path] = None):
+        self.output_dir = Path(output_dir)
+        self.static_dir = Path(static_dir)
+        self.debate_index = DebateIndex(self.output_dir)
+        self.search_index = SearchIndex(self.output_dir)
+        self.debate_database = DebateDatabase(database_path or self.output_dir / DATABASE_FILENAME)
+        self.score_analytics = ScoreAnalytics(self.output_dir) if ScoreAnalytics else None
+        self.llm_metrics = LLMMetrics(self.output_dir)
+        self.gzip_cache = GzipVariantCache()
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], headers: Mapping[str, str]) -> Response:
+        """
+        Answers one request
+
+        Args:
+            method: Request method; only GET and HEAD are supported (HEAD
+                gets the GET response, the server leaves out the body)
+            path: Unquoted URL path
+            query: Parsed query string
+            headers: Request headers with lower-cased names
+
+        Returns:
+            Response: The answer; unexpected errors become a 500
+        """
+        if method not in ("GET", "HEAD"):
+            return error_response(501, f"Unsupported method ({method})")
+        try:
+            return self.route(path, query, headers)
+        except Exception as e:
+            print(f"Error handling {method} {path}: {e}")
+            return error_response(500, f"Server error: {str(e)}")
+
+    def route(self, path: str, query: Dict[str, List[str]], headers: Mapping[str, str]) -> Response:
+        """Dispatches a request to its handler"""
+        if path == "/list-debates":
+            return self.list_debates(query)
+        if path == "/live-debates":
+            return json_response(list_live_debates(str(self.output_dir)))
+        if path == "/search":
+            return self.search(query)
+        if path.startswith("/db/"):
+            return self.database_query(path[len("/db/"):], query)
+        if path.startswith("/analytics/"):
+            return self.analytics(path[len("/analytics/"):], query)
+        if path == "/metrics":
+            return self.metrics()
+        if path.startswith(OUTPUT_PREFIX) and path.endswith((".json", TRACE_EXTENSION)):
+            # Debate JSON files and their traces
+            return self.file(self.output_dir / os.path.basename(path), path, headers,
+                             "application/json", CORS_HEADERS)
+        if path.startswith(OUTPUT_PREFIX) and path.endswith(ARCHIVE_EXTENSION):
+            return self.archive(path, query, headers)
+        return self.static(path, headers)
+
+    def list_debates(self, query: Dict[str, List[str]]) -> Response:
+        """
+        One page of debate metadata
+
+        Query parameters: sort (see debate_index.SORT_FIELDS), order
+        ("asc" or "desc"), offset and limit (0 for no limit).
+        """
+        try:
+            sort = query.get("sort", ["timestamp"])[0]
+            descending = query.get("order", ["desc"])[0] != "asc"
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(DEFAULT_PAGE_SIZE)])[0])
+        except ValueError:
+            return error_response(400, "offset and limit must be integers")
+        try:
+            # limit=0 returns every debate
+            page = self.debate_index.list_debates(sort, descending, offset, limit if limit > 0 else None)
+        except ValueError as e:
+            return error_response(400, str(e))
+        return json_response(page)
+
+    def search(self, query: Dict[str, List[str]]) -> Response:
+        """
+        Full-text search over statements and judge comments
+
+        Query parameters: q, field (see search_index.SEARCH_FIELDS, or
+        "statement"), filename, offset and limit.
+        """
+        text = query.get("q", [""])[0]
+        if not text.strip():
+            return error_response(400, "Missing search query (q)")
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(DEFAULT_SEARCH_LIMIT)])[0])
+        except ValueError:
+            return error_response(400, "offset and limit must be integers")
+        try:
+            result = self.search_index.search(
+                text, query.get("field", [None])[0], query.get("filename", [None])[0], offset, limit
+            )
+        except ValueError as e:
+            return error_response(400, str(e))
+        return json_response(result)
+
+    def database_query(self, view: str, query: Dict[str, List[str]]) -> Response:
+        """
+        An indexed query against the SQLite debate database
+
+        /db/debates filters on topic, debater, judge, replaced (a Position Y
+        debater who was voted out), since and until; /db/evaluations on
+        judge, debater and filename. Both take offset and limit.
+        """
+        try:
+            result = self.debate_database.query(view, query)
+        except LookupError as e:
+            return error_response(404, str(e))
+        except ValueError as e:
+            return error_response(400, str(e))
+        return json_response(result)
+
+    def analytics(self, view: str, query: Dict[str, List[str]]) -> Response:
+        """
+        Cross-debate score analytics
+
+        Views: judges, agreement, rotations and trajectories (the latter takes
+        optional debater and judge parameters), see score_analytics.
+        """
+        if self.score_analytics is None:
+            return error_response(501, "Analytics require NumPy (pip install numpy)")
+        try:
+            result = self.score_analytics.view(view, query)
+        except ValueError as e:
+            return error_response(404, str(e))
+        return json_response(result)
+
+    def metrics(self) -> Response:
+        """
+        A Prometheus scrape of the LLM call metrics in the debate transcripts
+
+        Call counts, token counts, backend durations and latency histograms
+        by model, host and kind of call, see llm_metrics.
+        """
+        return Response(200, {"Content-type": METRICS_CONTENT_TYPE}, self.llm_metrics.render().encode("utf-8"))
+
+    def static(self, path: str, headers: Mapping[str, str]) -> Response:
+        """A file from the viewer directory"""
+        relative = posixpath.normpath(path).lstrip("/")
+        if relative.startswith("..") or "\\" in relative:
+            return error_response(404, "File not found")
+        file_path = self.static_dir / relative
+        if file_path.is_dir():
+            file_path = file_path / "index.html"
+        content_type = mimetypes.guess_type(str(file_path))[0] or "application/octet-stream"
+        return self.file(file_path, path, headers, content_type)
+
+    def file(self, file_path: Path, path: str, headers: Mapping[str, str], content_type: str,
+             extra_headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        A whole file, with validators and gzip
+
+        Responses carry ETag and Last-Modified so unchanged files are answered
+        with 304. Clients accepting gzip get a compressed copy of text and
+        JSON files that is cached until the file changes; others get the file
+        through sendfile() without copying it into Python.
+        """
+        try:
+            stat = os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            return error_response(404, f"File not found: {path}")
+
+        compressible = content_type == "application/json" or content_type.startswith("text/")
+        use_gzip = compressible and stat.st_size >= GZIP_MIN_SIZE and accepts_gzip(headers.get("accept-encoding"))
+        etag = file_etag(stat, "gzip" if use_gzip else None)
+        response_headers = {**_cache_headers(etag, stat), **(extra_headers or {})}
+        if is_not_modified(headers.get("if-none-match"), headers.get("if-modified-since"), etag, stat):
+            return Response(304, response_headers)
+
+        response_headers["Content-type"] = content_type
+        if use_gzip:
+            response_headers["Content-Encoding"] = "gzip"
+            return Response(200, response_headers, self.gzip_cache.get(file_path, stat))
+        return Response(200, response_headers, file_path=file_path, file_size=stat.st_size)
+
+    def archive(self, path: str, query: Dict[str, List[str]], headers: Mapping[str, str]) -> Response:
+        """
+        A debate archive, or one part of it, as JSON
+
+        Without parameters the client gets the same JSON as for a .json
+        transcript. summary=1, round=N and rounds=A-B decompress only the
+        summary or the requested rounds (see archive_reader).
+        """
+        file_path = self.output_dir / os.path.basename(path)
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return error_response(404, f"File not found: {path}")
+        try:
+            part, first, last = parse_archive_query(query)
+        except ValueError as e:
+            return error_response(400, str(e))
+
+        # Parts are compressed on the fly, so every gzip variant is its own representation
+        use_gzip = accepts_gzip(headers.get("accept-encoding"))
+        etag = file_etag(stat, f"{part}-{first}-{last}" + ("-gzip" if use_gzip else ""))
+        response_headers = {**_cache_headers(etag, stat), **CORS_HEADERS}
+        if is_not_modified(headers.get("if-none-match"), headers.get("if-modified-since"), etag, stat):
+            return Response(304, response_headers)
+
+        try:
+            content = json.dumps(read_archive_part(file_path, part, first, last)).encode("utf-8")
+        except KeyError:
+            return error_response(404, f"Round {first} not found in {path}")
+        response_headers["Content-type"] = "application/json"
+        if use_gzip and len(content) >= GZIP_MIN_SIZE:
+            content = gzip.compress(content, compresslevel=1)
+            response_headers["Content-Encoding"] = "gzip"
+        return Response(200, response_headers, content)
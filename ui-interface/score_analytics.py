@@ -0,0 +1,352 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from archive_reader import DebateFileScanner, load_debate_file
+
+# Minimum seconds between directory rescans
+REFRESH_INTERVAL = 2.0
+
+# Views served under /analytics/<view>
+ANALYTICS_VIEWS = ["judges", "agreement", "rotations", "trajectories"]
+
+class ScoreAnalytics:
+    """
+    Columnar judge-score store over every debate in an output directory
+
+    Each evaluation is one row of flat NumPy columns (debate, round, judge,
+    evaluated debater, total score, vote) plus a criteria matrix with one
+    column per criterion, i.e. the sparse form of a
+    debate × round × judge × criterion score tensor (see score_tensor).
+    Files are parsed once per mtime/size; only new or changed debates are
+    read on refresh, and the columns are re-concatenated from per-debate
+    blocks. All aggregates are computed with vectorized NumPy operations.
+    """
+    def __init__(self, output_dir: str, refresh_interval: float = REFRESH_INTERVAL):
+        self.output_dir = str(output_dir)
+        self.refresh_interval = refresh_interval
+        self.names: List[str] = []       # Judge and debater names by id
+        self.criteria: List[str] = []     # Criterion names by column
+        self._name_ids: Dict[str, int] = {}
+        self._criterion_ids: Dict[str, int] = {}
+        self._scanner = DebateFileScanner(self.output_dir)
+        self._blocks: Dict[str, Dict[str, Any]] = {}   # filename -> per-debate columns
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    def _name_id(self, name: str) -> int:
+        if name not in self._name_ids:
+            self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return self._name_ids[name]
+
+    def _criterion_id(self, name: str) -> int:
+        if name not in self._criterion_ids:
+            self._criterion_ids[name] = len(self.criteria)
+            self.criteria.append(name)
+        return self._criterion_ids[name]
+
+    def _parse(self, path: str) -> Optional[Dict[str, Any]]:
+        """Turns one debate file into a block of evaluation and round rows"""
+        try:
+            data = load_debate_file(path)
+            transcript = data["transcript"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        rows = {"round": [], "judge": [], "debater": [], "score": [], "vote": [], "criteria": []}
+        rounds = {"round": [], "debater": [], "continue": [], "replaced": []}
+        # Same rule as DebateStore.save_debate: only the first `rotations`
+        # rejected rounds rotated a debater out (later ones hit the limit)
+        rotations_left = data.get("rotations", 0)
+        for round_data in transcript:
+            voting = round_data.get("voting_results")
+            if not voting:
+                continue
+            debater = self._name_id(round_data.get("position_y_name", ""))
+            replaced = not voting.get("continue") and rotations_left > 0
+            if replaced:
+                rotations_left -= 1
+            rounds["round"].append(round_data["round"])
+            rounds["debater"].append(debater)
+            rounds["continue"].append(bool(voting.get("continue")))
+            rounds["replaced"].append(replaced)
+            for evaluation in voting.get("evaluations", []):
+                rows["round"].append(round_data["round"])
+                rows["judge"].append(self._name_id(evaluation["judge_name"]))
+                rows["debater"].append(debater)
+                rows["score"].append(evaluation["total_score"])
+                rows["vote"].append(evaluation.get("vote") == "CONTINUE")
+                rows["criteria"].append({
+                    self._criterion_id(name): value
+                    for name, value in evaluation.get("criteria_scores", {}).items()
+                })
+
+        return {
+            "rounds_total": data.get("rounds", len(transcript)),
+            "rotations": data.get("rotations", 0),
+            "rows": rows,
+            "round_rows": rounds
+        }
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Picks up new, changed and deleted debate files
+
+        Args:
+            force: Rescan even if the last scan was within refresh_interval
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = now
+
+            def on_changed(name: str, entry: os.DirEntry) -> None:
+                block = self._parse(entry.path)
+                if block:
+                    self._blocks[name] = block
+                else:
+                    self._blocks.pop(name, None)
+
+            if self._scanner.scan(on_changed, lambda name: self._blocks.pop(name, None)):
+                self._columns = None
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        Returns the columnar store, rebuilding it from the blocks if files changed
+
+        Evaluation columns: debate, round, judge, debater, score, vote, criteria
+        (evaluations × criteria, NaN where a criterion wasn't scored).
+        Round columns (one row per voted round): round_debate, round_number,
+        round_debater, round_continue, round_replaced (the debater was rotated
+        out). Debate columns: debate_rounds,
+        debate_rotations, debate_files.
+        """
+        self.refresh()
+        with self._lock:
+            if self._columns is not None:
+                return self._columns
+
+            files = sorted(self._blocks)
+            blocks = [self._blocks[name] for name in files]
+            eval_counts = np.array([len(b["rows"]["score"]) for b in blocks], dtype=np.int64)
+            round_counts = np.array([len(b["round_rows"]["round"]) for b in blocks], dtype=np.int64)
+            debate_ids = np.arange(len(blocks), dtype=np.int32)
+
+            def concat(key: str, field: str, dtype) -> np.ndarray:
+                parts = [np.asarray(b[key][field], dtype=dtype) for b in blocks]
+                return np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+
+            criteria = np.full((int(eval_counts.sum()), len(self.criteria)), np.nan, dtype=np.float32)
+            row = 0
+            for block in blocks:
+                for scores in block["rows"]["criteria"]:
+                    if scores:
+                        criteria[row, list(scores.keys())] = list(scores.values())
+                    row += 1
+
+            self._columns = {
+                "debate": np.repeat(debate_ids, eval_counts),
+                "round": concat("rows", "round", np.int32),
+                "judge": concat("rows", "judge", np.int32),
+                "debater": concat("rows", "debater", np.int32),
+                "score": concat("rows", "score", np.float32),
+                "vote": concat("rows", "vote", bool),
+                "criteria": criteria,
+                "round_debate": np.repeat(debate_ids, round_counts),
+                "round_number": concat("round_rows", "round", np.int32),
+                "round_debater": concat("round_rows", "debater", np.int32),
+                "round_continue": concat("round_rows", "continue", bool),
+                "round_replaced": concat("round_rows", "replaced", bool),
+                "debate_rounds": np.array([b["rounds_total"] for b in blocks], dtype=np.int32),
+                "debate_rotations": np.array([b["rotations"] for b in blocks], dtype=np.int32),
+                "debate_files": np.array(files, dtype=object),
+            }
+            return self._columns
+
+    def score_tensor(self) -> np.ndarray:
+        """
+        Materializes the dense debate × round × judge × criterion tensor
+
+        Returns:
+            ndarray: float32 array, NaN where a judge didn't score that round
+        """
+        c = self.columns()
+        shape = (len(c["debate_files"]), int(c["round"].max(initial=0)) + 1, len(self.names), len(self.criteria))
+        tensor = np.full(shape, np.nan, dtype=np.float32)
+        tensor[c["debate"], c["round"], c["judge"]] = c["criteria"]
+        return tensor
+
+    def judge_stats(self) -> Dict[str, Any]:
+        """Per-judge evaluation counts, mean/std total score, continue rate and criterion means"""
+        c = self.columns()
+        n = len(self.names)
+        counts = np.bincount(c["judge"], minlength=n)
+        sums = np.bincount(c["judge"], weights=c["score"], minlength=n)
+        squares = np.bincount(c["judge"], weights=c["score"].astype(np.float64) ** 2, minlength=n)
+        continues = np.bincount(c["judge"], weights=c["vote"], minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = sums / counts
+            stds = np.sqrt(np.maximum(squares / counts - means ** 2, 0))
+            continue_rates = continues / counts
+
+            # Criterion means ignore unscored (NaN) cells
+            scored = ~np.isnan(c["criteria"])
+            criterion_sums = np.zeros((n, len(self.criteria)))
+            criterion_counts = np.zeros((n, len(self.criteria)))
+            np.add.at(criterion_sums, c["judge"], np.where(scored, c["criteria"], 0))
+            np.add.at(criterion_counts, c["judge"], scored)
+            criterion_means = criterion_sums / criterion_counts
+
+        judges = []
+        for j in np.flatnonzero(counts):
+            judges.append({
+                "judge": self.names[j],
+                "evaluations": int(counts[j]),
+                "mean_score": _number(means[j]),
+                "score_std": _number(stds[j]),
+                "continue_rate": _number(continue_rates[j]),
+                "criteria_means": {
+                    name: _number(criterion_means[j, k]) for k, name in enumerate(self.criteria)
+                }
+            })
+        judges.sort(key=lambda j: -j["evaluations"])
+        return {"judges": judges}
+
+    def agreement(self) -> Dict[str, Any]:
+        """
+        Inter-judge agreement over rounds that two or more judges scored
+
+        Returns the overall unanimity rate and mean within-round score spread,
+        plus pairwise vote agreement and RMS score difference for every pair
+        of judges that evaluated a round together.
+        """
+        c = self.columns()
+        n_judges = len(self.names)
+        # One group per (debate, round)
+        group_keys, groups = np.unique(
+            c["debate"].astype(np.int64) * (int(c["round"].max(initial=0)) + 1) + c["round"], return_inverse=True
+        )
+        n_groups = len(group_keys)
+
+        present = np.zeros((n_groups, n_judges))
+        votes = np.zeros((n_groups, n_judges))
+        scores = np.zeros((n_groups, n_judges))
+        present[groups, c["judge"]] = 1
+        votes[groups, c["judge"]] = c["vote"]
+        scores[groups, c["judge"]] = c["score"]
+
+        panel_sizes = present.sum(axis=1)
+        multi = panel_sizes >= 2
+        continue_counts = votes.sum(axis=1)
+        unanimous = (continue_counts == 0) | (continue_counts == panel_sizes)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            group_means = scores.sum(axis=1) / panel_sizes
+            spread = np.sqrt(((scores - group_means[:, None]) ** 2 * present).sum(axis=1) / panel_sizes)
+
+            # Pairwise statistics as matrix products over the group × judge matrices
+            both = present.T @ present
+            same_vote = votes.T @ votes + (present - votes).T @ (present - votes)
+            vote_agreement = same_vote / both
+            squared = scores ** 2
+            squared_diff = squared.T @ present + present.T @ squared - 2 * scores.T @ scores
+            rms_difference = np.sqrt(np.maximum(squared_diff, 0) / both)
+
+        pairs = []
+        for a, b in zip(*np.triu_indices(n_judges, k=1)):
+            if both[a, b] > 0:
+                pairs.append({
+                    "judges": [self.names[a], self.names[b]],
+                    "shared_rounds": int(both[a, b]),
+                    "vote_agreement": _number(vote_agreement[a, b]),
+                    "rms_score_difference": _number(rms_difference[a, b])
+                })
+        pairs.sort(key=lambda p: -p["shared_rounds"])
+        return {
+            "rounds": int(multi.sum()),
+            "unanimous_vote_rate": _number(unanimous[multi].mean()) if multi.any() else None,
+            "mean_score_spread": _number(spread[multi].mean()) if multi.any() else None,
+            "pairs": pairs
+        }
+
+    def rotation_rates(self) -> Dict[str, Any]:
+        """Rotations per voted round across debates, and how often each debater was voted out"""
+        c = self.columns()
+        n = len(self.names)
+        voted_rounds = np.maximum(c["debate_rounds"] - 1, 1)
+        faced = np.bincount(c["round_debater"], minlength=n)
+        replaced = np.bincount(c["round_debater"], weights=c["round_replaced"], minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            replace_rates = replaced / faced
+
+        debaters = [
+            {"debater": self.names[d], "rounds_judged": int(faced[d]), "times_replaced": int(replaced[d]),
+             "replace_rate": _number(replace_rates[d])}
+            for d in np.flatnonzero(faced)
+        ]
+        debaters.sort(key=lambda d: -d["rounds_judged"])
+        return {
+            "debates": int(len(c["debate_files"])),
+            "mean_rotations": _number(c["debate_rotations"].mean()) if len(c["debate_files"]) else None,
+            "rotations_per_voted_round": _number((c["debate_rotations"] / voted_rounds).mean())
+                                         if len(c["debate_files"]) else None,
+            "debaters": debaters
+        }
+
+    def trajectories(self, debater: Optional[str] = None, judge: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Mean total score by round number, optionally for one debater or one judge
+
+        Args:
+            debater: Only rounds where this Position Y debater was evaluated
+            judge: Only evaluations by this judge
+        """
+        c = self.columns()
+        mask = np.ones(len(c["score"]), dtype=bool)
+        if debater is not None:
+            mask &= c["debater"] == self._name_ids.get(debater, -1)
+        if judge is not None:
+            mask &= c["judge"] == self._name_ids.get(judge, -1)
+
+        rounds = c["round"][mask]
+        counts = np.bincount(rounds)
+        sums = np.bincount(rounds, weights=c["score"][mask])
+        return {
+            "debater": debater,
+            "judge": judge,
+            "rounds": [
+                {"round": int(r), "evaluations": int(counts[r]), "mean_score": _number(sums[r] / counts[r])}
+                for r in np.flatnonzero(counts)
+            ]
+        }
+
+    def view(self, name: str, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """
+        Computes one of ANALYTICS_VIEWS for the server
+
+        Args:
+            name: View name
+            query: Parsed query string (trajectories accept debater and judge)
+
+        Raises:
+            ValueError: If the view doesn't exist
+        """
+        if name == "judges":
+            return self.judge_stats()
+        if name == "agreement":
+            return self.agreement()
+        if name == "rotations":
+            return self.rotation_rates()
+        if name == "trajectories":
+            return self.trajectories(query.get("debater", [None])[0], query.get("judge", [None])[0])
+        raise ValueError(f"Invalid analytics view '{name}'. Available views: {ANALYTICS_VIEWS}")
+
+def _number(value) -> Optional[float]:
+    """Rounds a NumPy scalar for JSON, mapping NaN to None"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 4)
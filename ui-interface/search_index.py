@@ -0,0 +1,223 @@
+import os
+import re
+import math
+import html
+import heapq
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from archive_reader import DebateFileScanner, load_debate_file
+
+# Minimum seconds between directory rescans
+REFRESH_INTERVAL = 2.0
+
+# Hits returned per /search page when no limit is given
+DEFAULT_SEARCH_LIMIT = 20
+
+# Characters of context shown around the first match in a hit's snippet
+SNIPPET_CONTEXT = 120
+
+# BM25 parameters (term frequency saturation and length normalization)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Which parts of a debate can be searched; "statement" covers both positions
+SEARCH_FIELDS = ["position_x_statement", "position_y_statement", "comment"]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in is it its of on or "
+    "so that the their there they this to was we were will with you your".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercases text and splits it into index terms (stopwords removed)"""
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+def highlight(text: str, terms: List[str], context: int = SNIPPET_CONTEXT) -> str:
+    """
+    Builds an HTML snippet around the first matching term with every match in <mark>
+
+    The text is HTML-escaped, so the snippet can be inserted as markup.
+
+    Args:
+        text: Full document text
+        terms: Query terms (already tokenized)
+        context: Characters kept on either side of the first match
+
+    Returns:
+        str: Escaped snippet with <mark> around matching words
+    """
+    wanted = set(terms)
+    matches = [m for m in TOKEN_PATTERN.finditer(text.lower()) if m.group() in wanted]
+    if not matches:
+        return html.escape(text[:2 * context]) + ("…" if len(text) > 2 * context else "")
+
+    start = max(0, matches[0].start() - context)
+    end = min(len(text), matches[0].end() + context)
+    parts = ["…" if start > 0 else ""]
+    position = start
+    for match in matches:
+        if match.start() < start or match.end() > end:
+            continue
+        parts.append(html.escape(text[position:match.start()]))
+        parts.append(f"<mark>{html.escape(text[match.start():match.end()])}</mark>")
+        position = match.end()
+    parts.append(html.escape(text[position:end]))
+    parts.append("…" if end < len(text) else "")
+    return "".join(parts)
+
+class SearchIndex:
+    """
+    Inverted index over debate statements and judge comments, ranked with BM25
+
+    Every Position X statement, Position Y statement and judge comment is a
+    document. Postings map each term to the documents containing it and the
+    term's count there. Like DebateIndex, files are re-read only when their
+    mtime or size changes; a changed or deleted file's documents are removed
+    from the postings before the new ones are added, so the index stays
+    current without rebuilding it.
+    """
+    def __init__(self, output_dir: str, refresh_interval: float = REFRESH_INTERVAL):
+        self.output_dir = str(output_dir)
+        self.refresh_interval = refresh_interval
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._documents: Dict[int, Dict[str, Any]] = {}
+        self._scanner = DebateFileScanner(self.output_dir)
+        self._files: Dict[str, List[int]] = {}  # filename -> doc ids
+        self._next_id = 0
+        self._total_length = 0
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def document_count(self) -> int:
+        return len(self._documents)
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Indexes new and changed debate files and drops deleted ones
+
+        Args:
+            force: Rescan even if the last scan was within refresh_interval
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = now
+
+            def on_changed(name: str, entry: os.DirEntry) -> None:
+                self._remove_documents(self._files.pop(name, []))
+                self._files[name] = self._index_file(entry.path, name)
+
+            self._scanner.scan(on_changed, lambda name: self._remove_documents(self._files.pop(name)))
+
+    def _index_file(self, path: str, filename: str) -> List[int]:
+        """Adds one debate's statements and comments to the index (lock must be held)"""
+        try:
+            data = load_debate_file(path)
+            transcript = data["transcript"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []  # Still being written or not a debate
+
+        base = {"filename": filename, "topic": data.get("topic", "")}
+        doc_ids = []
+        for round_data in transcript:
+            documents = []
+            for position in ("x", "y"):
+                text = round_data.get(f"position_{position}_statement")
+                if text:
+                    documents.append((f"position_{position}_statement",
+                                      round_data.get(f"position_{position}_name", ""), text))
+            for evaluation in (round_data.get("voting_results") or {}).get("evaluations", []):
+                if evaluation.get("comments"):
+                    documents.append(("comment", evaluation.get("judge_name", ""), evaluation["comments"]))
+
+            for field, speaker, text in documents:
+                counts = Counter(tokenize(text))
+                doc_id = self._next_id
+                self._next_id += 1
+                length = sum(counts.values())
+                self._documents[doc_id] = dict(base, round=round_data.get("round"), field=field,
+                                               speaker=speaker, text=text, length=length, terms=list(counts))
+                self._total_length += length
+                for term, count in counts.items():
+                    self._postings.setdefault(term, {})[doc_id] = count
+                doc_ids.append(doc_id)
+        return doc_ids
+
+    def _remove_documents(self, doc_ids: List[int]) -> None:
+        """Removes documents and their postings (lock must be held)"""
+        for doc_id in doc_ids:
+            document = self._documents.pop(doc_id)
+            self._total_length -= document["length"]
+            for term in document["terms"]:
+                postings = self._postings[term]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, query: str, field: Optional[str] = None, filename: Optional[str] = None,
+               offset: int = 0, limit: int = DEFAULT_SEARCH_LIMIT) -> Dict[str, Any]:
+        """
+        Ranks documents matching any query term with BM25
+
+        Args:
+            query: Free-text query
+            field: Only search one of SEARCH_FIELDS, or "statement" for both positions
+            filename: Only search one debate file
+            offset: Hits to skip
+            limit: Maximum hits to return
+
+        Returns:
+            dict: Total hit count and the page of hits, each with its debate,
+                round, field, speaker, score and a highlighted HTML snippet
+        """
+        if field is not None and field not in SEARCH_FIELDS + ["statement"]:
+            raise ValueError(f"Invalid field '{field}'. Available fields: {SEARCH_FIELDS + ['statement']}")
+        self.refresh()
+        terms = list(dict.fromkeys(tokenize(query)))
+
+        with self._lock:
+            scores: Dict[int, float] = {}
+            n = len(self._documents)
+            average_length = self._total_length / n if n else 0
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, count in postings.items():
+                    length_norm = 1 - BM25_B + BM25_B * self._documents[doc_id]["length"] / average_length
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (BM25_K1 + 1) / (count + BM25_K1 * length_norm)
+
+            def matches_filters(doc_id: int) -> bool:
+                document = self._documents[doc_id]
+                if filename is not None and document["filename"] != filename:
+                    return False
+                if field == "statement":
+                    return document["field"] != "comment"
+                return field is None or document["field"] == field
+
+            matching = [d for d in scores if matches_filters(d)]
+            offset = max(0, offset)
+            # Only the requested page needs ordering, not every match
+            ranked = heapq.nlargest(offset + limit, matching, key=scores.__getitem__)
+            hits = []
+            for doc_id in ranked[offset:]:
+                document = self._documents[doc_id]
+                hits.append({
+                    "filename": document["filename"],
+                    "topic": document["topic"],
+                    "round": document["round"],
+                    "field": document["field"],
+                    "speaker": document["speaker"],
+                    "score": round(scores[doc_id], 4),
+                    "snippet": highlight(document["text"], terms)
+                })
+
+        return {"query": query, "terms": terms, "total": len(matching), "offset": offset, "limit": limit, "hits": hits}
@@ -1,119 +1,167 @@
 import os
-import json
+import time
+import asyncio
+import argparse
 import http.server
 import socketserver
-from urllib.parse import urlparse, unquote
+from urllib.parse import urlparse, unquote, parse_qs
 from pathlib import Path
 
-class DebateViewerHandler(http.server.SimpleHTTPRequestHandler):
-    """Custom HTTP handler for the Debate Viewer application"""
+from routes import ViewerApp
+from live_stream import ROUND_LOG_EXTENSION, LIVE_POLL_INTERVAL, RoundLogTail, stream_events
+from file_serving import LISTEN_BACKLOG
+
+# Debate transcripts written by debate-agent
+OUTPUT_DIR = Path(__file__).resolve().parent.parent / "debate-agent" / "output"
+
+# viewer.html and the other static files
+VIEWER_DIR = Path(__file__).resolve().parent
+
+# SQLite database for /db/* queries (default: debates.db in OUTPUT_DIR)
+DATABASE_PATH = None
+
+class DebateViewerHandler(http.server.BaseHTTPRequestHandler):
+    """Custom HTTP handler for the Debate Viewer application (routes live in routes.ViewerApp)"""
     
     def do_GET(self):
         """Handle GET requests"""
+        self.handle_request()
+    
+    def do_HEAD(self):
+        """Handle HEAD requests (headers only, e.g. to check a debate for changes)"""
+        self.handle_request(head_only=True)
+    
+    def handle_request(self, head_only=False):
+        """Answer a request through the server's ViewerApp and write its response"""
         # Parse the URL path
         parsed_url = urlparse(self.path)
         path = unquote(parsed_url.path)
         
-        if path == "/list-debates":
-            self.handle_list_debates()
-        elif path.startswith("/debate-agent/output/") and path.endswith(".json"):
-            # Handle direct requests for debate JSON files
-            self.serve_debate_file(path)
+        if not head_only and path.startswith("/debate-stream/") and path.endswith(ROUND_LOG_EXTENSION):
+            self.stream_debate(path)
+            return
+        
+        headers = {name.lower(): value for name, value in self.headers.items()}
+        response = self.server.app.handle(self.command, path, parse_qs(parsed_url.query), headers)
+        self.send_viewer_response(response, head_only)
+    
+    def send_viewer_response(self, response, head_only=False):
+        """Write a route's Response; HEAD requests get only the status line and headers"""
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        if response.content_length is not None:
+            self.send_header("Content-Length", str(response.content_length))
+        self.end_headers()
+        
+        if head_only or response.content_length is None:
+            return
+        if response.file_path is None:
+            self.wfile.write(response.body)
         else:
-            # Default to serving static files
-            return http.server.SimpleHTTPRequestHandler.do_GET(self)
+            # Zero-copy transfer from the page cache to the socket
+            with open(response.file_path, 'rb') as f:
+                self.connection.sendfile(f, count=response.file_size)
     
-    def handle_list_debates(self):
-        """Handle request to list debate files"""
+    def stream_debate(self, path):
+        """
+        Stream a running debate's round log as Server-Sent Events
+        
+        Every record already in the log is sent first, then new turns, rounds,
+        votes and rotations as they are appended, until the debate ends or is
+        found interrupted (see live_stream.stream_events). A reconnecting
+        client's Last-Event-ID (a byte offset) skips the records it already has.
+        """
+        file_path = self.server.app.output_dir / os.path.basename(path)
         try:
-            # Define the path to the output directory
-            output_dir = Path.cwd().parent / "debate-agent" / "output"
-            # output_dir = os.path.join(os.path.dirname(os.getcwd()), "debate-agent", "output")
-
-            # Check if directory exists
-            if not os.path.exists(output_dir):
-                self.send_json_response([])
-                return
-            
-            # Get all JSON files in the directory
-            files = [f for f in os.listdir(output_dir) if f.endswith('.json')]
-            
-            # Return the list of files
-            self.send_json_response(files)
-            
-        except Exception as e:
-            print(f"Error listing debates: {e}")
-            self.send_error(500, f"Server error: {str(e)}")
-    
-    def serve_debate_file(self, path):
-        """Serve a debate JSON file from the output directory"""
+            offset = int(self.headers.get("Last-Event-ID", "0"))
+        except ValueError:
+            offset = 0
+        
         try:
-            # Extract the filename from the path
-            filename = os.path.basename(path)
-            
-            # Construct the actual file path relative to project root
-            base_dir = Path.cwd().parent
-            file_path = base_dir / "debate-agent" / "output" / filename
-            
-            if not os.path.exists(file_path):
-                self.send_error(404, f"File not found: {path}")
-                return
-            
-            # Read and serve the file
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.send_header("Content-Length", str(len(content)))
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
-            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            tail = RoundLogTail(file_path, offset)
+        except FileNotFoundError:
+            # 204 tells EventSource not to reconnect: the debate has finished
+            self.send_response(204)
             self.end_headers()
-            
-            # Write the file content
-            self.wfile.write(content)
-            
-        except Exception as e:
-            print(f"Error serving debate file: {e}")
-            self.send_error(500, f"Server error: {str(e)}")
-    
-    def send_json_response(self, data):
-        """Send JSON response with appropriate headers"""
-        response_data = json.dumps(data).encode('utf-8')
+            return
         
         self.send_response(200)
-        self.send_header("Content-type", "application/json")
-        self.send_header("Content-Length", str(len(response_data)))
+        self.send_header("Content-type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
         self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
         
-        # Write the response data after sending all headers
-        self.wfile.write(response_data)
+        try:
+            for data in stream_events(tail, str(file_path)):
+                if data is None:
+                    time.sleep(LIVE_POLL_INTERVAL)
+                else:
+                    self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Viewer closed the stream
+        finally:
+            tail.close()
 
-def run_server(port=8000):
-    """Run the HTTP server"""
-    # Force the server to serve the current directory
-    os.chdir(os.path.dirname(os.path.abspath(__file__)))
-    
+def create_threaded_server(port=8000):
+    """Create the thread-per-connection server with the viewer's routes (see routes.ViewerApp)"""
     # Use ThreadingTCPServer to handle multiple requests
     class ThreadedHTTPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
         allow_reuse_address = True
+        daemon_threads = True
+        request_queue_size = LISTEN_BACKLOG
     
-    # Create and start the server
     server = ThreadedHTTPServer(("", port), DebateViewerHandler)
+    server.app = ViewerApp(OUTPUT_DIR, VIEWER_DIR, DATABASE_PATH)
+    return server
+
+def run_server(port=8000, use_async=False, max_concurrent_requests=None):
+    """
+    Run the HTTP server
     
-    print(f"Server running at http://localhost:{port}/")
+    Args:
+        port: Port to listen on
+        use_async: Serve with the asyncio server (keep-alive, bounded concurrency)
+            instead of one thread per connection
+        max_concurrent_requests: Request limit for the asyncio server
+    """
+    print(f"Server running at http://localhost:{port}/ ({'asyncio' if use_async else 'threaded'})")
     print(f"Open http://localhost:{port}/viewer.html to view debates")
     print("Press Ctrl+C to stop the server")
     
+    if use_async:
+        from async_server import serve, MAX_CONCURRENT_REQUESTS
+        try:
+            asyncio.run(serve(port, OUTPUT_DIR, VIEWER_DIR, max_concurrent_requests or MAX_CONCURRENT_REQUESTS,
+                              DATABASE_PATH))
+        except KeyboardInterrupt:
+            print("\nShutting down server...")
+        return
+    
+    # Create and start the server
+    server = create_threaded_server(port)
+    
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down server...")
         server.shutdown()
 
+def main():
+    global OUTPUT_DIR, DATABASE_PATH
+    parser = argparse.ArgumentParser(description='Debate Viewer server')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='Use the asyncio server')
+    parser.add_argument('--max-concurrent-requests', type=int, help='Requests handled at once by the asyncio server')
+    parser.add_argument('--output-dir', type=str, help='Debate output directory (default: ../debate-agent/output)')
+    parser.add_argument('--database', type=str, help='SQLite debate database for /db/* queries (default: <output-dir>/debates.db)')
+    args = parser.parse_args()
+    
+    if args.output_dir:
+        OUTPUT_DIR = Path(args.output_dir).resolve()
+    if args.database:
+        DATABASE_PATH = Path(args.database).resolve()
+    run_server(args.port, args.use_async, args.max_concurrent_requests)
+
 if __name__ == "__main__":
-    run_server()
+    main()